@@ -48,7 +48,7 @@ class Token(BaseModel):
     user: UserResponse
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
     db_user = get_user(db, email=user_data.email)
@@ -75,7 +75,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login and get access token"""
     user = authenticate_user(db, form_data.username, form_data.password)
     if not user:
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, or_, and_, cast, Float
+from typing import List, Optional
 import logging
+import json
+import base64
+import binascii
 from datetime import datetime, timedelta
 
 from ...db.database import get_db
@@ -15,8 +19,38 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Text search configuration; must match the summaries_search_vector() database function
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=12, FragmentDelimiter= ... "
+
+def _encode_search_cursor(rank: float, summary_id: str) -> str:
+    payload = json.dumps({"rank": rank, "id": summary_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+def _decode_search_cursor(cursor: str):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(payload["rank"]), str(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def format_dashboard_summaries(summaries: List[Summary]) -> List[dict]:
+    """Format summaries for the dashboard list"""
+    formatted_summaries = []
+    for summary in summaries:
+        formatted_summaries.append({
+            "id": summary.id,
+            "title": summary.title,
+            "status": summary.status,
+            "created_at": summary.created_at.strftime("%B %d, %Y"),
+            "source_type": summary.source_type,
+            "duration_minutes": round(summary.duration_seconds / 60) if summary.duration_seconds else None,
+            "minutes_charged": summary.minutes_charged
+        })
+    return formatted_summaries
+
 @router.get("/summaries")
-async def get_user_summaries(
+def get_user_summaries(
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db),
@@ -37,22 +71,74 @@ async def get_user_summaries(
         return []
     
     # Format the response
-    formatted_summaries = []
-    for summary in summaries:
-        formatted_summaries.append({
-            "id": summary.id,
-            "title": summary.title,
-            "status": summary.status,
-            "created_at": summary.created_at.strftime("%B %d, %Y"),
-            "source_type": summary.source_type,
-            "duration_minutes": round(summary.duration_seconds / 60) if summary.duration_seconds else None,
-            "minutes_charged": summary.minutes_charged
+    return format_dashboard_summaries(summaries)
+
+@router.get("/search")
+def search_summaries(
+    q: str = Query(..., min_length=1, description="Search terms (supports quotes, OR and -exclusions)"),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Search the user's summaries and transcripts, best matches first
+    """
+    logger.info(f"Searching summaries for user: {current_user.email}")
+    
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # ts_rank_cd returns real; compare and return it as double precision so the
+    # rank stored in the cursor round-trips exactly and ties aren't skipped
+    rank = cast(func.ts_rank_cd(Summary.search_vector, query), Float(53))
+    
+    # Find the page of matching ids first (served by the GIN index), ordered
+    # by rank with the id as a tie-breaker so the keyset cursor is stable
+    page = db.query(Summary.id.label("id"), rank.label("rank")).filter(
+        Summary.user_id == current_user.id,
+        Summary.search_vector.op("@@")(query)
+    )
+    if cursor:
+        cursor_rank, cursor_id = _decode_search_cursor(cursor)
+        cursor_rank = cast(cursor_rank, Float(53))
+        page = page.filter(or_(
+            rank < cursor_rank,
+            and_(rank == cursor_rank, Summary.id > cursor_id)
+        ))
+    page = page.order_by(rank.desc(), Summary.id).limit(limit + 1).subquery()
+    
+    # Snippets are only built for the rows on this page
+    rows = db.query(
+        Summary.id,
+        Summary.title,
+        Summary.status,
+        Summary.created_at,
+        page.c.rank,
+        func.ts_headline(SEARCH_CONFIG, func.coalesce(Summary.summary_text, ""), query, HEADLINE_OPTIONS).label("summary_snippet"),
+        func.ts_headline(SEARCH_CONFIG, func.coalesce(Summary.transcription, ""), query, HEADLINE_OPTIONS).label("transcript_snippet")
+    ).join(page, page.c.id == Summary.id).order_by(page.c.rank.desc(), Summary.id).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    results = []
+    for row in rows:
+        results.append({
+            "id": row.id,
+            "title": row.title,
+            "status": row.status,
+            "created_at": row.created_at.strftime("%B %d, %Y") if row.created_at else None,
+            "rank": row.rank,
+            "summary_snippet": row.summary_snippet,
+            "transcript_snippet": row.transcript_snippet
         })
     
-    return formatted_summaries
+    return {
+        "results": results,
+        "next_cursor": _encode_search_cursor(rows[-1].rank, rows[-1].id) if has_more else None
+    }
 
 @router.get("/usage")
-async def get_user_usage(
+def get_user_usage(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
 import tempfile
 import os
 import logging
+import asyncio
 # Removing pydub import since it's not compatible with Python 3.13
 # from pydub import AudioSegment
-from typing import Optional
+from typing import Optional, Dict, Any, Tuple
 import shutil
 
-from ...db.database import get_db
+from ...db.database import get_db, job_session, pool_stats
 from ...models.user import User
 from ...models.summary import Summary
 from ...services.s3_service import S3Service
-from ...services.openai_service import OpenAIService
+from ...services.openai_service import AsyncOpenAIService
+from ...services.media_probe import media_probe
+from ...services.transcription_progress import TranscriptionProgress, get_progress
+from ...services.segment_store import SegmentStore, TranscriptAlignment
+from ...services.job_queue import job_queue, summary_failure
+from ...services.admission_control import admission_controller
 # Enable authentication
 from ...core.auth import get_current_user
+from ...core.admission import require_admission
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,62 +31,90 @@ router = APIRouter()
 
 # Initialize services
 s3_service = S3Service()
-openai_service = OpenAIService()
+openai_service = AsyncOpenAIService()
 
 # Helper to process audio/video files
-def process_media_file(file_path, summary_id, db):
+async def process_media_file(file_path, summary_id):
     """
-    Process uploaded media file, store results in database
+    Process uploaded media file, store results in database.
+
+    Each database step uses its own short-lived session, so no connection is
+    held while the file is transcribed and summarized. Errors propagate to the
+    job queue, which retries the job and marks the summary failed once its
+    attempts are used up.
     """
     try:
-        # Get summary from database
-        summary = db.query(Summary).filter(Summary.id == summary_id).first()
-        if not summary:
-            logger.error(f"Summary not found: {summary_id}")
-            return
+        duration = await asyncio.to_thread(media_probe.get_duration, file_path)
         
-        # Update status
-        summary.status = "processing"
-        db.commit()
+        with job_session() as db:
+            # Get summary from database
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            if not summary:
+                logger.error(f"Summary not found: {summary_id}")
+                return
+            
+            # Update status and record media duration for billing
+            summary.status = "processing"
+            if duration:
+                summary.duration_seconds = duration
+                summary.minutes_charged = duration / 60
+            db.commit()
         
         # Transcribe file
-        transcription_result = openai_service.transcribe_audio(file_path)
+        progress = TranscriptionProgress(summary_id)
+        transcription_result = await openai_service.transcribe_audio(file_path, progress)
         transcription_text = transcription_result["text"]
         
-        # Generate summary
-        summary_response = openai_service.generate_summary(transcription_text)
+        # Generate summary, publishing sections to the record as they stream in
+        summary_response = await openai_service.generate_summary(transcription_text, on_update=progress.summary_updated)
         parsed_summary = openai_service.parse_summary_response(summary_response)
+        segments = transcription_result.get("segments")
         
-        # Update summary in database
-        summary.transcription = transcription_text
-        summary.summary_text = parsed_summary["summary"]
-        summary.key_points = parsed_summary["key_points"]
-        summary.action_items = parsed_summary["action_items"]
-        summary.notable_quotes = parsed_summary.get("notable_quotes", [])
-        summary.status = "completed"
-        
-        # Commit changes
-        db.commit()
+        with job_session() as db:
+            # Update summary in database
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            summary.transcription = transcription_text
+            summary.transcript_segments = segments.to_bytes() if segments else None
+            summary.summary_text = parsed_summary["summary"]
+            summary.key_points = parsed_summary["key_points"]
+            summary.action_items = parsed_summary["action_items"]
+            summary.notable_quotes = parsed_summary.get("notable_quotes", [])
+            summary.partial_summary = None
+            summary.status = "completed"
+            
+            # Commit changes
+            db.commit()
         
         logger.info(f"Successfully processed summary {summary_id}")
         
     except Exception as e:
         logger.error(f"Error processing media file: {str(e)}")
-        
-        # Update summary with error
-        summary = db.query(Summary).filter(Summary.id == summary_id).first()
-        if summary:
-            summary.status = "failed"
-            summary.error_message = str(e)
-            db.commit()
+        raise
     finally:
         # Clean up temp file
         if os.path.exists(file_path):
             os.remove(file_path)
 
+async def run_media_file_job(job: Dict[str, Any]) -> Optional[str]:
+    """
+    Job queue handler: fetch the stored media from S3 and process it
+
+    Returns:
+        The summary's error message if processing failed
+    """
+    payload = job["payload"]
+    temp_dir = tempfile.mkdtemp()
+    try:
+        temp_file_path = os.path.join(temp_dir, os.path.basename(payload.get("filename") or payload["s3_key"]))
+        await asyncio.to_thread(s3_service.download_file, payload["s3_key"], temp_file_path)
+        await process_media_file(temp_file_path, job["summary_id"])
+        with job_session() as db:
+            return summary_failure(db, job["summary_id"])
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
 @router.post("/upload", response_model=dict)
-async def upload_file(
-    background_tasks: BackgroundTasks,
+def upload_file(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     db: Session = Depends(get_db),
@@ -87,7 +122,8 @@ async def upload_file(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Upload and process an audio/video file
+    Upload and process an audio/video file. Rejected with 429/503 and a
+    Retry-After while the processing queue is full.
     """
     try:
         # Validate file extension
@@ -100,6 +136,9 @@ async def upload_file(
                 detail=f"File extension {file_extension} not allowed. Allowed extensions: {allowed_extensions}"
             )
         
+        # Shed load before accepting the file
+        require_admission(db, current_user)
+        
         # Create a new summary record
         new_summary = Summary(
             user_id=current_user.id,
@@ -113,48 +152,150 @@ async def upload_file(
         db.commit()
         db.refresh(new_summary)
         
-        # Save file to S3
-        s3_key = s3_service.upload_file(file.file, file.filename, current_user.id)
-        
-        # Update summary with S3 key
-        new_summary.s3_file_key = s3_key
-        db.commit()
-        
-        # Create temp file
+        # Spool the upload to disk so its duration can be probed for scheduling
         temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file.filename)
-        
-        # Reset file pointer and save to temp file
-        file.file.seek(0)
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        try:
+            temp_file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+            with open(temp_file_path, "wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+            duration = media_probe.get_duration(temp_file_path)
+            
+            # Save file to S3
+            with open(temp_file_path, "rb") as upload:
+                s3_key = s3_service.upload_file(upload, file.filename, current_user.id)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
         
-        # Process file in background
-        background_tasks.add_task(
-            process_media_file,
-            temp_file_path,
+        # Update summary with S3 key and queue it for a worker, which
+        # processes the stored copy
+        new_summary.s3_file_key = s3_key
+        job_queue.enqueue(
+            db,
             new_summary.id,
-            db
+            "media_file",
+            {"s3_key": s3_key, "filename": file.filename},
+            user_id=current_user.id,
+            duration_seconds=duration or None
         )
+        db.commit()
         
         return {
             "message": "File uploaded successfully, processing started",
-            "summary_id": new_summary.id
+            "summary_id": new_summary.id,
+            "queue_eta_seconds": admission_controller.eta_seconds(db, duration or None)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/retry/{summary_id}", response_model=dict)
+def retry_processing(
+    summary_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retry a failed summary from its stored media. Segments that were already
+    transcribed are reused, so work resumes at the first missing segment.
+    """
+    summary = db.query(Summary).filter(Summary.id == summary_id).first()
+    
+    if not summary:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    
+    # Check if the summary belongs to the current user
+    if summary.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this summary")
+    
+    if summary.status != "failed":
+        raise HTTPException(status_code=409, detail=f"Only failed summaries can be retried (status: {summary.status})")
+    
+    if not summary.s3_file_key:
+        raise HTTPException(status_code=400, detail="No stored media to retry from")
+    
+    require_admission(db, current_user)
+    
+    summary.status = "pending"
+    summary.error_message = None
+    # Drop anything left from the failed attempt
+    summary.partial_summary = None
+    summary.summary_text = None
+    summary.key_points = None
+    summary.action_items = None
+    summary.notable_quotes = None
+    job_queue.enqueue(
+        db,
+        summary.id,
+        "media_file",
+        {"s3_key": summary.s3_file_key, "filename": summary.original_filename},
+        user_id=summary.user_id,
+        duration_seconds=summary.duration_seconds
+    )
+    db.commit()
+    
+    return {
+        "message": "Processing restarted",
+        "summary_id": summary.id,
+        "queue_eta_seconds": admission_controller.eta_seconds(db, summary.duration_seconds)
+    }
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get transcription and summary cache hit/miss counters
+    """
+    return {
+        "transcription": openai_service.transcription_cache.stats(),
+        "summary": openai_service.summary_cache.stats()
+    }
+
+@router.get("/rate-limits/stats")
+async def get_rate_limit_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get OpenAI rate limiter wait and throttle counters
+    """
+    return openai_service.rate_limits.stats()
+
+@router.get("/db-pool/stats")
+async def get_db_pool_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get connection pool checkout wait times and saturation for the API and worker pools
+    """
+    return pool_stats()
+
+@router.get("/queue/stats")
+def get_queue_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get job counts and the estimated processing backlog used for admission control
+    """
+    return {
+        "jobs": job_queue.stats(db),
+        "backlog": admission_controller.backlog(db)
+    }
+
 @router.get("/status/{summary_id}")
-async def get_status(
+def get_status(
     summary_id: str,
     db: Session = Depends(get_db),
     # Use real user authentication
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get processing status for a summary
+    Get processing status for a summary, including percent complete, an ETA
+    and the partial transcript while transcription is running, or its place
+    in the queue while it waits for a worker
     """
     summary = db.query(Summary).filter(Summary.id == summary_id).first()
     
@@ -165,16 +306,25 @@ async def get_status(
     if summary.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this summary")
     
+    # A summary sharing another's in-flight processing reports that one's progress
+    tracked = summary
+    if summary.source_summary_id and summary.status in ("pending", "processing"):
+        tracked = db.query(Summary).filter(Summary.id == summary.source_summary_id).first() or summary
+    
     return {
         "summary_id": summary.id,
         "status": summary.status,
         "title": summary.title,
         "created_at": summary.created_at,
-        "error_message": summary.error_message
+        "error_message": summary.error_message,
+        # Segment progress and the transcript so far
+        **get_progress(db, tracked),
+        # Position in the fair-share order while queued
+        **job_queue.queue_position(db, tracked.id)
     }
 
 @router.get("/result/{summary_id}")
-async def get_result(
+def get_result(
     summary_id: str,
     db: Session = Depends(get_db),
     # Use real user authentication
@@ -210,4 +360,68 @@ async def get_result(
         "summary": summary.summary_text,
         "key_points": summary.key_points,
         "action_items": summary.action_items
-    } 
\ No newline at end of file
+    } 
+
+def _load_segment_store(summary_id: str, db: Session, current_user: User) -> Tuple[Summary, SegmentStore]:
+    """Load a summary owned by the current user and its timestamped segments"""
+    summary = db.query(Summary).filter(Summary.id == summary_id).first()
+    
+    if not summary:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    
+    # Check if the summary belongs to the current user
+    if summary.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this summary")
+    
+    if not summary.transcript_segments:
+        raise HTTPException(status_code=404, detail="No timestamped segments for this summary")
+    
+    return summary, SegmentStore.from_bytes(summary.transcript_segments)
+
+@router.get("/transcript/{summary_id}/range")
+def get_transcript_range(
+    summary_id: str,
+    start: float = Query(..., ge=0, description="Range start in seconds"),
+    end: float = Query(..., ge=0, description="Range end in seconds"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the transcript text spoken between two times. char_start and
+    char_end are offsets into the summary's transcription.
+    """
+    summary, store = _load_segment_store(summary_id, db, current_user)
+    segment_start, segment_end = store.span_for_time(start, end)
+    
+    transcript = summary.transcription or store.text
+    alignment = TranscriptAlignment(store.text, transcript)
+    char_start = alignment.to_transcript(segment_start)
+    char_end = max(char_start, alignment.to_transcript(segment_end))
+    
+    return {
+        "summary_id": summary_id,
+        "start": start,
+        "end": end,
+        "char_start": char_start,
+        "char_end": char_end,
+        "text": transcript[char_start:char_end].strip()
+    }
+
+@router.get("/transcript/{summary_id}/time")
+def get_transcript_time(
+    summary_id: str,
+    offset: int = Query(..., ge=0, description="Character offset into the summary's transcription"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the media time at a character offset of the transcription
+    """
+    summary, store = _load_segment_store(summary_id, db, current_user)
+    alignment = TranscriptAlignment(store.text, summary.transcription or store.text)
+    
+    return {
+        "summary_id": summary_id,
+        "offset": offset,
+        "time": store.time_at_offset(alignment.to_segments(offset))
+    }
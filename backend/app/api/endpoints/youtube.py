@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import tempfile
 import os
@@ -7,8 +7,11 @@ import yt_dlp
 import subprocess
 import time
 import random
+import asyncio
 from pydantic import BaseModel, HttpUrl
+from sqlalchemy.sql import func
 import uuid
+from typing import Dict, Any, Optional
 
 # Add pytube as a fallback
 try:
@@ -17,13 +20,19 @@ try:
 except ImportError:
     PYTUBE_AVAILABLE = False
 
-from ...db.database import get_db
+from ...db.database import get_db, job_session
 from ...models.user import User
 from ...models.summary import Summary
 from ...services.s3_service import S3Service
-from ...services.openai_service import OpenAIService
+from ...services.openai_service import AsyncOpenAIService
+from ...services.media_probe import media_probe
+from ...services.transcription_progress import TranscriptionProgress
+from ...services.job_queue import job_queue, summary_failure, PermanentJobError
+from ...services.youtube_dedup import youtube_dedup, canonical_video_id
+from ...services.admission_control import admission_controller
 # Enable authentication
 from ...core.auth import get_current_user
+from ...core.admission import require_admission
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,7 +42,7 @@ router = APIRouter()
 
 # Initialize services
 s3_service = S3Service()
-openai_service = OpenAIService()
+openai_service = AsyncOpenAIService()
 
 # Request models
 class YouTubeRequest(BaseModel):
@@ -77,7 +86,8 @@ def download_with_pytube(url, output_dir):
         mp3_file = os.path.join(output_dir, f"{uuid.uuid4()}.mp3")
         try:
             # Check if ffmpeg is available
-            subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+            if not media_probe.ffmpeg_available:
+                raise FileNotFoundError("ffmpeg")
             
             # Convert to MP3
             cmd = [
@@ -271,95 +281,114 @@ def download_youtube_audio(url, output_path):
     
     if "HTTP Error 403: Forbidden" in error_str:
         raise ValueError("YouTube has blocked this download. This may be due to content restrictions or YouTube's anti-bot measures. Please try a different video or try again later.")
+    # Retrying can't fix these; the job fails straight away
     elif "Private video" in error_str:
-        raise ValueError("This video is private. Please ensure the video is publicly accessible.")
+        raise PermanentJobError("This video is private. Please ensure the video is publicly accessible.")
     elif "Video unavailable" in error_str:
-        raise ValueError("This video is unavailable. It may have been removed or region-restricted.")
+        raise PermanentJobError("This video is unavailable. It may have been removed or region-restricted.")
     elif "This video is available for Premium users only" in error_str or "paywall" in error_str.lower():
-        raise ValueError("This video is available for YouTube Premium users only and cannot be processed.")
+        raise PermanentJobError("This video is available for YouTube Premium users only and cannot be processed.")
     else:
         raise ValueError(f"Failed to download YouTube video: {error_str}")
 
 # Helper to process YouTube video
-def process_youtube_video(url, summary_id, db):
+async def process_youtube_video(url, summary_id):
     """
-    Process YouTube video, store results in database
+    Process YouTube video, store results in database.
+
+    Each database step uses its own short-lived session, so no connection is
+    held while the video is downloaded, transcribed and summarized. Errors
+    propagate to the job queue, which retries the job unless the error is a
+    PermanentJobError. The result (or final error) is shared with summaries
+    of the same video that attached while this one was in flight.
     """
     temp_dir = None
     
     try:
-        # Get summary from database
-        summary = db.query(Summary).filter(Summary.id == summary_id).first()
-        if not summary:
-            logger.error(f"Summary not found: {summary_id}")
-            return
-        
-        # Update status
-        summary.status = "processing"
-        db.commit()
+        with job_session() as db:
+            # Get summary from database
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            if not summary:
+                logger.error(f"Summary not found: {summary_id}")
+                return
+            user_id = summary.user_id
+            
+            # Update status
+            summary.status = "processing"
+            youtube_dedup.share_status(db, summary)
+            db.commit()
         
         # Create temp directory
         temp_dir = tempfile.mkdtemp()
         output_path = os.path.join(temp_dir, f"youtube_audio.%(ext)s")
         
         # Download YouTube audio
-        video_info = download_youtube_audio(url, output_path)
+        video_info = await asyncio.to_thread(download_youtube_audio, url, output_path)
         
         # Extract info from the result
         downloaded_file = video_info['file_path']
         video_title = video_info['title']
-        video_duration = video_info['duration']
+        video_duration = video_info['duration'] or await asyncio.to_thread(media_probe.get_duration, downloaded_file)
         
-        # Update summary with video metadata
-        summary.title = summary.title or video_title
-        summary.duration_seconds = video_duration
-        summary.minutes_charged = video_duration / 60 if video_duration else 0
-        db.commit()
+        with job_session() as db:
+            # Update summary with video metadata
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            summary.title = summary.title or video_title
+            summary.duration_seconds = video_duration
+            summary.minutes_charged = video_duration / 60 if video_duration else 0
+            db.commit()
         
         # Upload to S3
         with open(downloaded_file, 'rb') as file:
-            s3_key = s3_service.upload_file(
+            s3_key = await asyncio.to_thread(
+                s3_service.upload_file,
                 file, 
                 f"{video_title}.mp3", 
-                summary.user_id
+                user_id
             )
         
-        # Update summary with S3 key
-        summary.s3_file_key = s3_key
-        db.commit()
+        with job_session() as db:
+            # Update summary with S3 key
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            summary.s3_file_key = s3_key
+            db.commit()
         
         # Transcribe file
         logger.info(f"Transcribing audio file: {downloaded_file}")
-        transcription_result = openai_service.transcribe_audio(downloaded_file)
+        progress = TranscriptionProgress(summary_id)
+        transcription_result = await openai_service.transcribe_audio(downloaded_file, progress)
         transcription_text = transcription_result["text"]
         
-        # Generate summary
+        # Generate summary, publishing sections to the record as they stream in
         logger.info("Generating summary from transcription")
-        summary_response = openai_service.generate_summary(transcription_text)
+        summary_response = await openai_service.generate_summary(transcription_text, on_update=progress.summary_updated)
         parsed_summary = openai_service.parse_summary_response(summary_response)
+        segments = transcription_result.get("segments")
         
-        # Update summary in database
-        summary.transcription = transcription_text
-        summary.summary_text = parsed_summary["summary"]
-        summary.key_points = parsed_summary["key_points"]
-        summary.action_items = parsed_summary["action_items"]
-        summary.notable_quotes = parsed_summary.get("notable_quotes", [])
-        summary.status = "completed"
-        
-        # Commit changes
-        db.commit()
+        with job_session() as db:
+            # Update summary in database
+            summary = db.query(Summary).filter(Summary.id == summary_id).first()
+            summary.transcription = transcription_text
+            summary.transcript_segments = segments.to_bytes() if segments else None
+            summary.summary_text = parsed_summary["summary"]
+            summary.key_points = parsed_summary["key_points"]
+            summary.action_items = parsed_summary["action_items"]
+            summary.notable_quotes = parsed_summary.get("notable_quotes", [])
+            summary.partial_summary = None
+            summary.status = "completed"
+            summary.completed_at = func.now()
+            
+            # Complete summaries that were waiting on this video
+            youtube_dedup.share_result(db, summary)
+            
+            # Commit changes
+            db.commit()
         
         logger.info(f"Successfully processed YouTube video {summary_id}")
         
     except Exception as e:
         logger.error(f"Error processing YouTube video: {str(e)}")
-        
-        # Update summary with error
-        summary = db.query(Summary).filter(Summary.id == summary_id).first()
-        if summary:
-            summary.status = "failed"
-            summary.error_message = str(e)
-            db.commit()
+        raise
     finally:
         # Clean up temp directory
         if temp_dir and os.path.exists(temp_dir):
@@ -369,16 +398,29 @@ def process_youtube_video(url, summary_id, db):
             except Exception as cleanup_error:
                 logger.warning(f"Failed to clean up temp directory: {cleanup_error}")
 
+async def run_youtube_job(job: Dict[str, Any]) -> Optional[str]:
+    """
+    Job queue handler: download and process a YouTube video
+
+    Returns:
+        The summary's error message if processing failed
+    """
+    await process_youtube_video(job["payload"]["url"], job["summary_id"])
+    with job_session() as db:
+        return summary_failure(db, job["summary_id"])
+
 @router.post("/process")
-async def process_youtube(
+def process_youtube(
     request: YouTubeRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     # Use real user authentication
     current_user: User = Depends(get_current_user)
 ):
     """
-    Process a YouTube video URL
+    Process a YouTube video URL. A video that is already being processed, or
+    was processed recently, is not processed again: the new summary shares
+    that result. New work is rejected with 429/503 and a Retry-After while
+    the processing queue is full.
     """
     try:
         # Create a new summary record
@@ -387,26 +429,36 @@ async def process_youtube(
             title=request.title or "YouTube Video",
             source_type="youtube",
             source_url=str(request.url),
+            video_id=canonical_video_id(str(request.url)),
             status="pending"
         )
         
         db.add(new_summary)
+        db.flush()
+        
+        shared = youtube_dedup.attach(db, new_summary)
+        if shared is None:
+            # Only new work counts against the queue; the session rolls back if it's rejected
+            require_admission(db, current_user)
+            # Queue the video for a worker in the same transaction; its duration
+            # isn't known until it is downloaded, so it is scheduled at the default cost
+            job_queue.enqueue(db, new_summary.id, "youtube", {"url": str(request.url)}, user_id=current_user.id)
         db.commit()
         db.refresh(new_summary)
         
-        # Process YouTube video in background
-        background_tasks.add_task(
-            process_youtube_video,
-            str(request.url),
-            new_summary.id,
-            db
-        )
-        
+        messages = {
+            None: "YouTube video processing started",
+            "attached": "YouTube video is already being processed, sharing its result",
+            "reused": "YouTube video was processed recently, result reused"
+        }
         return {
-            "message": "YouTube video processing started",
-            "summary_id": new_summary.id
+            "message": messages[shared],
+            "summary_id": new_summary.id,
+            "queue_eta_seconds": 0.0 if shared == "reused" else admission_controller.eta_seconds(db)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing YouTube video: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -0,0 +1,15 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+from ..services.admission_control import admission_controller
+
+def require_admission(db: Session, user: User) -> None:
+    """Reject new processing work with 429/503 and a Retry-After while the queue is over its limits"""
+    decision = admission_controller.admit(db, user.id, user.subscription_tier)
+    if not decision["admitted"]:
+        raise HTTPException(
+            status_code=decision["status_code"],
+            detail=decision["reason"],
+            headers={"Retry-After": str(decision["retry_after"])}
+        )
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import uuid
+from ..db.database import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim order for queued jobs, and lease expiry scans for running ones
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        Index("ix_jobs_status_lease_expires_at", "status", "lease_expires_at"),
+    )
+
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    summary_id = Column(String, ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)  # Owner, for fair scheduling
+    kind = Column(String, nullable=False)  # "media_file", "youtube"
+    payload = Column(JSON, nullable=True)  # Arguments for the job handler (S3 key, URL, ...)
+    duration_seconds = Column(Float, nullable=True)  # Probed media duration, if known when queued
+
+    # Queue state
+    status = Column(String, default="queued", nullable=False)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0, nullable=False)  # Number of times the job was claimed
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Not claimable before this time
+
+    # Lease held by the worker running the job; an expired lease makes the job claimable again
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    summary = relationship("Summary", backref="jobs")
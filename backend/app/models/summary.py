@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from ..db.database import Base
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (
+        Index("ix_summaries_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -13,6 +17,9 @@ class Summary(Base):
     source_type = Column(String, nullable=False)  # "file_upload", "youtube", etc.
     original_filename = Column(String, nullable=True)
     source_url = Column(String, nullable=True)
+    video_id = Column(String, nullable=True, index=True)  # Canonical YouTube video ID, for sharing results
+    # In-flight summary of the same video whose result this one waits for
+    source_summary_id = Column(String, ForeignKey("summaries.id", ondelete="SET NULL"), nullable=True, index=True)
     s3_file_key = Column(String, nullable=True)
     duration_seconds = Column(Float, nullable=True)
     minutes_charged = Column(Float, nullable=True)
@@ -20,6 +27,8 @@ class Summary(Base):
     # Processing status
     status = Column(String, default="pending")  # pending, processing, completed, failed
     error_message = Column(String, nullable=True)
+    segments_total = Column(Integer, nullable=True)  # Number of planned transcription segments
+    processing_started_at = Column(DateTime(timezone=True), nullable=True)
     
     # Content
     transcription = Column(Text, nullable=True)
@@ -28,6 +37,13 @@ class Summary(Base):
     action_items = Column(JSON, nullable=True)  # Store as JSON array
     notable_quotes = Column(JSON, nullable=True)  # Store as JSON array of notable quotes
     speaker_labels = Column(JSON, nullable=True)  # Store as JSON object mapping speaker ids to text
+    transcript_segments = Column(LargeBinary, nullable=True)  # Timestamped segments as a SegmentStore blob
+    partial_summary = Column(JSON, nullable=True)  # Sections streamed so far while summarizing; cleared when processing ends
+    
+    # Full-text search document over title, summary, key points and transcription.
+    # Maintained by a database trigger on write (see the add_summary_search migration).
+    # Deferred: it is only used inside search queries and is about as large as the text.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, UniqueConstraint, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import uuid
+from ..db.database import Base
+
+class TranscriptChunk(Base):
+    __tablename__ = "transcript_chunks"
+    __table_args__ = (
+        UniqueConstraint("summary_id", "segment_index", name="uq_transcript_chunks_summary_segment"),
+    )
+    
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    summary_id = Column(String, ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False, index=True)
+    segment_index = Column(Integer, nullable=False)  # Zero-based position in the planned segments
+    start_seconds = Column(Float, nullable=True)  # Position in the original media
+    end_seconds = Column(Float, nullable=True)
+    text = Column(Text, nullable=True)
+    segments = Column(JSON, nullable=True)  # Timestamped segments, if the API returned them
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    summary = relationship("Summary", backref="transcript_chunks")
@@ -0,0 +1,184 @@
+import os
+import math
+import time
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.job import Job
+from .job_scheduler import fair_scheduler
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """
+    Admission control for new processing work, based on the backlog in the
+    jobs table.
+
+    Work is measured in seconds of processing: each job costs its media
+    duration (the scheduler's default when unknown) times the processing
+    ratio, the wall time recent jobs took per second of media. The backlog
+    is the work of queued jobs plus what remains of running ones, and it
+    drains across the worker slots, which gives the queue ETA.
+
+    New work is rejected with 503 while the whole backlog is above its limits
+    (too many queued jobs, or an ETA beyond ADMISSION_MAX_BACKLOG_SECONDS),
+    and with 429 when one user has too many jobs waiting. Both come with a
+    Retry-After for when the backlog should be back under the limit.
+    """
+
+    def __init__(self):
+        """Initialize admission limits using environment variables"""
+        self.enabled = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+        self.max_queued_jobs = int(os.getenv("ADMISSION_MAX_QUEUED_JOBS", "1000"))
+        self.max_backlog_seconds = float(os.getenv("ADMISSION_MAX_BACKLOG_SECONDS", "3600"))
+        self.max_user_queued_jobs = int(os.getenv("ADMISSION_MAX_USER_QUEUED_JOBS", "10"))
+        # Worker slots across all nodes; at least the jobs currently running
+        self.worker_slots = int(os.getenv("ADMISSION_WORKER_SLOTS", os.getenv("JOB_WORKER_CONCURRENCY", "4")))
+        # Processing time per second of media until recent jobs give a measurement
+        self.default_processing_ratio = float(os.getenv("ADMISSION_DEFAULT_PROCESSING_RATIO", "0.3"))
+        self.ratio_window_seconds = int(os.getenv("ADMISSION_RATIO_WINDOW_SECONDS", "3600"))
+        self.min_retry_after = int(os.getenv("ADMISSION_MIN_RETRY_AFTER_SECONDS", "5"))
+        self.max_retry_after = int(os.getenv("ADMISSION_MAX_RETRY_AFTER_SECONDS", "3600"))
+        self.cache_seconds = float(os.getenv("ADMISSION_CACHE_SECONDS", "2"))
+        self._snapshot = None
+        self._snapshot_expire = 0.0
+        self._lock = threading.Lock()
+
+    def backlog(self, db: Session) -> Dict[str, Any]:
+        """
+        Queued and in-flight work, cached briefly since every submission and
+        readiness probe reads it
+
+        Returns:
+            Dict with queued, running, processing_ratio, worker_slots,
+            backlog_seconds (processing time left across all jobs) and
+            eta_seconds (time for the worker slots to get through it)
+        """
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() < self._snapshot_expire:
+                return self._snapshot
+
+        ratio = self._processing_ratio(db)
+        work = func.coalesce(Job.duration_seconds, fair_scheduler.default_duration_seconds) * ratio
+        elapsed = func.extract("epoch", func.now() - func.coalesce(Job.locked_at, func.now()))
+        queued_count, queued_work = db.query(
+            func.count(Job.id),
+            func.coalesce(func.sum(work), 0)
+        ).filter(Job.status == "queued").one()
+        running_count, running_work = db.query(
+            func.count(Job.id),
+            func.coalesce(func.sum(func.greatest(work - elapsed, 0)), 0)
+        ).filter(Job.status == "running").one()
+
+        slots = max(self.worker_slots, running_count, 1)
+        backlog_seconds = float(queued_work) + float(running_work)
+        snapshot = {
+            "queued": queued_count,
+            "running": running_count,
+            "processing_ratio": round(ratio, 3),
+            "worker_slots": slots,
+            "backlog_seconds": round(backlog_seconds, 1),
+            "eta_seconds": round(backlog_seconds / slots, 1)
+        }
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._snapshot_expire = time.monotonic() + self.cache_seconds
+        return snapshot
+
+    def _processing_ratio(self, db: Session) -> float:
+        """Wall time per second of media over jobs completed within the ratio window"""
+        ratio = db.query(
+            func.avg(func.extract("epoch", Job.finished_at - Job.locked_at) / Job.duration_seconds)
+        ).filter(
+            Job.status == "completed",
+            Job.duration_seconds > 0,
+            Job.locked_at.isnot(None),
+            Job.finished_at >= func.now() - timedelta(seconds=self.ratio_window_seconds)
+        ).scalar()
+        return float(ratio) if ratio else self.default_processing_ratio
+
+    def eta_seconds(self, db: Session, duration_seconds: Optional[float] = None) -> float:
+        """Estimated time until a job submitted now is finished: the queue wait plus its own processing"""
+        snapshot = self.backlog(db)
+        own = fair_scheduler.cost(duration_seconds) * snapshot["processing_ratio"]
+        return round(snapshot["eta_seconds"] + own, 1)
+
+    def overload(self, db: Session) -> Optional[Dict[str, Any]]:
+        """
+        Why the service as a whole can't take more work, or None
+
+        Returns:
+            {"reason", "retry_after"} while the backlog is above its limits
+        """
+        snapshot = self.backlog(db)
+        waits = []
+        if snapshot["queued"] >= self.max_queued_jobs:
+            # Jobs drain one per average job time per slot
+            per_job = snapshot["backlog_seconds"] / max(snapshot["queued"] + snapshot["running"], 1)
+            excess = snapshot["queued"] - self.max_queued_jobs + 1
+            waits.append(excess * per_job / snapshot["worker_slots"])
+        if snapshot["eta_seconds"] >= self.max_backlog_seconds:
+            waits.append(snapshot["eta_seconds"] - self.max_backlog_seconds)
+        if not waits:
+            return None
+        return {
+            "reason": f"Processing backlog is full (about {math.ceil(snapshot['eta_seconds'] / 60)} minutes of queued work)",
+            "retry_after": self._clamp(max(waits))
+        }
+
+    def admit(self, db: Session, user_id: str, tier: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Decide whether to accept new work from a user
+
+        Returns:
+            Dict with admitted, and for a rejection status_code (429 for the
+            user's own limit, 503 for the service backlog), reason and
+            retry_after (seconds)
+        """
+        if not self.enabled:
+            return {"admitted": True}
+
+        overload = self.overload(db)
+        if overload is not None:
+            logger.warning(f"Rejecting work from {user_id}: {overload['reason']}")
+            return {"admitted": False, "status_code": 503, **overload}
+
+        user_queued = db.query(func.count(Job.id)).filter(
+            Job.user_id == user_id,
+            Job.status == "queued"
+        ).scalar()
+        if user_queued >= self.max_user_queued_jobs:
+            # The user's jobs start at most max_running at a time
+            snapshot = self.backlog(db)
+            per_job = fair_scheduler.cost(None) * snapshot["processing_ratio"]
+            excess = user_queued - self.max_user_queued_jobs + 1
+            return {
+                "admitted": False,
+                "status_code": 429,
+                "reason": f"Too many jobs waiting ({user_queued}); wait for some to finish",
+                "retry_after": self._clamp(excess * per_job / max(fair_scheduler.max_running(tier), 1))
+            }
+        return {"admitted": True}
+
+    def readiness(self, db: Session) -> Dict[str, Any]:
+        """Readiness for a load balancer: not ready while the backlog is over its limits"""
+        overload = self.overload(db) if self.enabled else None
+        return {
+            "ready": overload is None,
+            "retry_after": overload["retry_after"] if overload else None,
+            **self.backlog(db)
+        }
+
+    def _clamp(self, seconds: float) -> int:
+        return int(min(max(math.ceil(seconds), self.min_retry_after), self.max_retry_after))
+
+# Shared instance so submissions and readiness probes share the cached backlog
+admission_controller = AdmissionController()
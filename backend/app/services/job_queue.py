@@ -0,0 +1,493 @@
+import os
+import logging
+from datetime import timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, or_, func, case, cast, text
+from sqlalchemy.orm import Session
+
+from ..db.database import WorkerSessionLocal
+from ..models.job import Job
+from ..models.summary import Summary
+from ..models.user import User
+from .job_scheduler import fair_scheduler
+from .youtube_dedup import youtube_dedup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for a failure that retrying can't fix; the job fails without using its remaining attempts"""
+
+class JobQueue:
+    """
+    Durable processing queue stored in the jobs table.
+
+    Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+    worker processes on any number of nodes can poll the same table without
+    handing out a job twice. A claimed job holds a lease that its worker
+    renews with heartbeats. If the worker dies, the lease expires and the job
+    becomes claimable again (a visibility timeout), up to max_attempts claims.
+
+    Due jobs are handed out by the fair scheduler: weighted fair queuing across
+    users by subscription tier, per-user caps on running jobs, and a boost for
+    short jobs. Jobs whose lease expired are reclaimed before anything else.
+
+    Enqueueing uses the caller's session so the job commits together with its
+    summary; every other call opens its own short-lived session.
+    """
+
+    def __init__(self):
+        """Initialize queue settings using environment variables"""
+        self.lease_seconds = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.retry_delay_seconds = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
+        # Queued jobs considered per user on each claim
+        self.claim_candidates_per_user = int(os.getenv("JOB_CLAIM_CANDIDATES_PER_USER", "3"))
+
+    def enqueue(
+        self,
+        db: Session,
+        summary_id: str,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        duration_seconds: Optional[float] = None
+    ) -> Job:
+        """
+        Add a job in the caller's transaction; it becomes visible to workers when the caller commits
+
+        Args:
+            user_id: Owner of the summary, for fair scheduling across users
+            duration_seconds: Probed media duration, if known, so short jobs can be boosted
+        """
+        job = Job(
+            summary_id=summary_id,
+            user_id=user_id,
+            kind=kind,
+            payload=payload or {},
+            duration_seconds=duration_seconds,
+            status="queued",
+            attempts=0,
+            max_attempts=self.max_attempts
+        )
+        db.add(job)
+        return job
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next runnable job: a running job whose lease has expired, or
+        else the due queued job chosen by the fair scheduler
+
+        Returns:
+            {"id", "summary_id", "kind", "payload", "attempts"}, or None if
+            there is nothing to run
+        """
+        db = WorkerSessionLocal()
+        try:
+            self._fail_exhausted(db)
+
+            now = func.now()
+            # Interrupted jobs were already scheduled once, so they resume first
+            job = db.query(Job).filter(
+                Job.status == "running",
+                Job.lease_expires_at < now,
+                Job.attempts < Job.max_attempts
+            ).order_by(Job.lease_expires_at).with_for_update(skip_locked=True).limit(1).first()
+
+            if job is None:
+                job = self._claim_fair(db)
+
+            if job is None:
+                db.commit()
+                return None
+
+            if job.status == "running":
+                logger.warning(f"Reclaiming job {job.id} from {job.locked_by} after its lease expired")
+            job.status = "running"
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.heartbeat_at = now
+            job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            claimed = {
+                "id": job.id,
+                "summary_id": job.summary_id,
+                "kind": job.kind,
+                "payload": job.payload or {},
+                "attempts": job.attempts
+            }
+            db.commit()
+
+            logger.info(f"Worker {worker_id} claimed {claimed['kind']} job {claimed['id']} (attempt {claimed['attempts']})")
+            return claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _claim_fair(self, db: Session) -> Optional[Job]:
+        """Lock the due queued job with the earliest fair-share turn whose owner is below their cap"""
+        candidates = self._due_candidates(db)
+        if not candidates:
+            return None
+
+        user_ids = {job["user_id"] for job in candidates if job["user_id"]}
+        tiers = self._tiers(db, user_ids)
+        service, running = self._usage(db, user_ids)
+
+        for candidate in fair_scheduler.order(candidates, tiers, service, running):
+            user_id = candidate["user_id"]
+            if user_id:
+                # Serialize claims per user (until commit) so concurrent workers can't overshoot the cap
+                locked = db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+                    {"key": f"jobs:{user_id}"}
+                ).scalar()
+                if not locked:
+                    continue
+                running_now = db.query(func.count(Job.id)).filter(
+                    Job.user_id == user_id,
+                    Job.status == "running"
+                ).scalar()
+                if running_now >= fair_scheduler.max_running(tiers.get(user_id)):
+                    continue
+
+            job = db.query(Job).filter(
+                Job.id == candidate["id"],
+                Job.status == "queued"
+            ).with_for_update(skip_locked=True).first()
+            if job is not None:
+                return job
+        return None
+
+    def _due_candidates(self, db: Session) -> List[Dict[str, Any]]:
+        """The first few due queued jobs of each user, in the scheduler's per-user order"""
+        rank = func.row_number().over(
+            partition_by=Job.user_id,
+            order_by=(self._boosted_run_at(), Job.created_at)
+        ).label("rank")
+        due = db.query(
+            Job.id,
+            Job.user_id,
+            Job.duration_seconds,
+            func.extract("epoch", Job.run_at).label("run_at"),
+            rank
+        ).filter(Job.status == "queued", Job.run_at <= func.now()).subquery()
+
+        rows = db.query(due).filter(due.c.rank <= self.claim_candidates_per_user).order_by(due.c.rank).all()
+        return [self._schedulable(row) for row in rows]
+
+    @staticmethod
+    def _is_short():
+        return and_(Job.duration_seconds > 0, Job.duration_seconds <= fair_scheduler.short_job_seconds)
+
+    @classmethod
+    def _boosted_run_at(cls):
+        """run_at with short jobs moved ahead, the scheduler's order within one user"""
+        return case(
+            (cls._is_short(), Job.run_at - timedelta(seconds=fair_scheduler.short_job_boost_seconds)),
+            else_=Job.run_at
+        )
+
+    @staticmethod
+    def _schedulable(row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "user_id": row.user_id,
+            "duration_seconds": row.duration_seconds,
+            "run_at": float(row.run_at)
+        }
+
+    @staticmethod
+    def _tiers(db: Session, user_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        return dict(db.query(User.id, User.subscription_tier).filter(User.id.in_(user_ids)).all())
+
+    @staticmethod
+    def _usage(db: Session, user_ids: Iterable[str]) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Recent service (media seconds started within the fair share window) and running job count by user"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}, {}
+
+        window_start = func.now() - timedelta(seconds=fair_scheduler.fair_share_window_seconds)
+        cost = func.coalesce(Job.duration_seconds, fair_scheduler.default_duration_seconds)
+        rows = db.query(
+            Job.user_id,
+            func.coalesce(func.sum(cost), 0),
+            func.count(Job.id).filter(Job.status == "running")
+        ).filter(
+            Job.user_id.in_(user_ids),
+            or_(Job.status == "running", Job.locked_at >= window_start)
+        ).group_by(Job.user_id).all()
+
+        service = {user_id: float(seconds) for user_id, seconds, _ in rows}
+        running = {user_id: count for user_id, _, count in rows}
+        return service, running
+
+    def queue_position(self, db: Session, summary_id: str) -> Dict[str, Optional[int]]:
+        """
+        Where a summary's queued job stands in the order the scheduler would
+        hand out queued jobs, ignoring running caps; position is None unless
+        it is waiting.
+
+        Fair queuing finish times only grow within one user's jobs, so that
+        order is every queued job sorted by (finish time, sort key, user).
+        Only the job's own user is ordered here; the jobs of other users
+        ahead of it are counted in the database.
+        """
+        job = db.query(Job.id, Job.user_id, Job.status).filter(
+            Job.summary_id == summary_id
+        ).order_by(Job.created_at.desc()).first()
+        if job is None or job.status != "queued":
+            return {"queue_position": None, "queue_length": None}
+
+        user_ids = [job.user_id] if job.user_id else []
+        tiers = self._tiers(db, user_ids)
+        service, _ = self._usage(db, user_ids)
+        rows = db.query(
+            Job.id,
+            Job.user_id,
+            Job.duration_seconds,
+            func.extract("epoch", Job.run_at).label("run_at")
+        ).filter(
+            Job.status == "queued",
+            Job.user_id.is_not_distinct_from(job.user_id)
+        ).order_by(Job.created_at, Job.id).all()
+        ordered = fair_scheduler.order([self._schedulable(row) for row in rows], tiers, service, respect_caps=False)
+
+        index = next((i for i, queued in enumerate(ordered) if queued["id"] == job.id), None)
+        if index is None:
+            # Claimed in the meantime
+            return {"queue_position": None, "queue_length": None}
+        cost = sum(fair_scheduler.cost(queued["duration_seconds"]) for queued in ordered[:index + 1])
+        finish = (service.get(job.user_id, 0.0) + cost) / fair_scheduler.weight(tiers.get(job.user_id))
+        ahead = self._jobs_ahead(db, job.user_id, finish, fair_scheduler.sort_key(ordered[index]))
+
+        queue_length = db.query(func.count(Job.id)).filter(Job.status == "queued").scalar()
+        return {"queue_position": index + ahead + 1, "queue_length": queue_length}
+
+    def _jobs_ahead(self, db: Session, user_id: Optional[str], finish: float, sort_key: float) -> int:
+        """Queued jobs of other users that the scheduler would order before a job with this finish time and sort key"""
+        window_start = func.now() - timedelta(seconds=fair_scheduler.fair_share_window_seconds)
+        usage = db.query(
+            Job.user_id.label("user_id"),
+            func.sum(func.coalesce(Job.duration_seconds, fair_scheduler.default_duration_seconds)).label("service")
+        ).filter(
+            Job.user_id.isnot(None),
+            or_(Job.status == "running", Job.locked_at >= window_start)
+        ).group_by(Job.user_id).subquery()
+
+        # Same arithmetic as FairScheduler.cost and sort_key, so equal finish times compare equal
+        cost = func.coalesce(func.nullif(Job.duration_seconds, 0), fair_scheduler.default_duration_seconds)
+        boost = case((self._is_short(), fair_scheduler.short_job_boost_seconds), else_=0.0)
+        queued = db.query(
+            Job.user_id.label("user_id"),
+            (cast(func.extract("epoch", Job.run_at), Float(53)) - boost).label("sort_key"),
+            func.sum(cost).over(
+                partition_by=Job.user_id,
+                order_by=(self._boosted_run_at(), Job.created_at, Job.id),
+                rows=(None, 0)
+            ).label("cumulative_cost")
+        ).filter(
+            Job.status == "queued",
+            Job.user_id.is_distinct_from(user_id)
+        ).subquery()
+
+        tier = func.lower(func.coalesce(User.subscription_tier, "free"))
+        weight = case(
+            *[(tier == name, fair_scheduler.weight(name)) for name in fair_scheduler.tier_weights],
+            else_=fair_scheduler.weight(None)
+        )
+        job_finish = (func.coalesce(usage.c.service, 0.0) + queued.c.cumulative_cost) / weight
+
+        # Heap ties go to the earlier sort key, then the lower user id
+        before = or_(
+            job_finish < finish,
+            and_(job_finish == finish, or_(
+                queued.c.sort_key < sort_key,
+                and_(queued.c.sort_key == sort_key, func.coalesce(queued.c.user_id, "") < (user_id or ""))
+            ))
+        )
+        return db.query(func.count()).select_from(queued).outerjoin(
+            usage, usage.c.user_id == queued.c.user_id
+        ).outerjoin(
+            User, User.id == queued.c.user_id
+        ).filter(before).scalar()
+
+    def _fail_exhausted(self, db: Session) -> None:
+        """Give up on jobs whose lease expired on their last allowed attempt"""
+        now = func.now()
+        jobs = db.query(Job).filter(
+            Job.status == "running",
+            Job.lease_expires_at < now,
+            Job.attempts >= Job.max_attempts
+        ).with_for_update(skip_locked=True).all()
+
+        for job in jobs:
+            logger.error(f"Job {job.id} lost its worker on all {job.attempts} attempts; marking it failed")
+            self._finish(db, job, "failed", f"Processing was interrupted {job.attempts} times")
+
+    def _finish(self, db: Session, job: Job, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.last_error = error
+        job.locked_by = None
+        job.lease_expires_at = None
+        job.finished_at = func.now()
+
+        if status == "failed":
+            # Don't leave the summary stuck in processing
+            summary = db.query(Summary).filter(Summary.id == job.summary_id).first()
+            if summary and summary.status not in ("completed", "failed"):
+                summary.status = "failed"
+                summary.error_message = error
+                summary.partial_summary = None
+                youtube_dedup.share_failure(db, summary)
+
+    @staticmethod
+    def _requeue_summary(db: Session, job: Job) -> None:
+        """Show a summary whose job will be retried as waiting again, rather than stuck in processing"""
+        summary = db.query(Summary).filter(Summary.id == job.summary_id).first()
+        if summary and summary.status == "processing":
+            summary.status = "pending"
+            summary.partial_summary = None
+            youtube_dedup.share_status(db, summary)
+
+    def _owned_job(self, db: Session, job_id: str, worker_id: str) -> Optional[Job]:
+        return db.query(Job).filter(
+            Job.id == job_id,
+            Job.locked_by == worker_id,
+            Job.status == "running"
+        ).with_for_update().first()
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend the lease on a running job
+
+        Returns:
+            False if the worker no longer holds the lease (it expired and the
+            job was reclaimed), in which case the worker should stop the job
+        """
+        db = WorkerSessionLocal()
+        try:
+            now = func.now()
+            updated = db.query(Job).filter(
+                Job.id == job_id,
+                Job.locked_by == worker_id,
+                Job.status == "running"
+            ).update({
+                Job.heartbeat_at: now,
+                Job.lease_expires_at: now + timedelta(seconds=self.lease_seconds)
+            }, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None) -> None:
+        """Record that the job ran to the end; `error` is the summary's failure, if it failed"""
+        db = WorkerSessionLocal()
+        try:
+            job = self._owned_job(db, job_id, worker_id)
+            if job is None:
+                logger.warning(f"Job {job_id} is no longer held by {worker_id}; not recording its result")
+                db.rollback()
+                return
+            self._finish(db, job, "failed" if error else "completed", error)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a job that raised before finishing. It is queued again after a
+        backoff while it has attempts left.
+
+        Returns:
+            True if the job will be retried
+        """
+        db = WorkerSessionLocal()
+        try:
+            job = self._owned_job(db, job_id, worker_id)
+            if job is None:
+                db.rollback()
+                return False
+
+            if retry and job.attempts < job.max_attempts:
+                delay = self.retry_delay_seconds * job.attempts
+                logger.warning(f"Job {job_id} failed on attempt {job.attempts}, retrying in {delay}s: {error}")
+                job.status = "queued"
+                job.last_error = error
+                job.locked_by = None
+                job.lease_expires_at = None
+                job.run_at = func.now() + timedelta(seconds=delay)
+                self._requeue_summary(db, job)
+                retried = True
+            else:
+                logger.error(f"Job {job_id} failed: {error}")
+                self._finish(db, job, "failed", error)
+                retried = False
+            db.commit()
+            return retried
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def release(self, job_id: str, worker_id: str) -> None:
+        """Hand a running job back to the queue (e.g. on shutdown) without counting the attempt"""
+        db = WorkerSessionLocal()
+        try:
+            job = self._owned_job(db, job_id, worker_id)
+            if job is None:
+                db.rollback()
+                return
+            job.status = "queued"
+            job.attempts = max(job.attempts - 1, 0)
+            job.locked_by = None
+            job.lease_expires_at = None
+            job.run_at = func.now()
+            db.commit()
+            logger.info(f"Released job {job_id} back to the queue")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Job counts by status and the age of the oldest due job"""
+        counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        oldest = db.query(func.min(Job.run_at)).filter(Job.status == "queued", Job.run_at <= func.now()).scalar()
+        age = db.query(func.extract("epoch", func.now() - oldest)).scalar() if oldest else None
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "completed": counts.get("completed", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_queued_seconds": round(float(age), 1) if age is not None else None
+        }
+
+def summary_failure(db: Session, summary_id: str) -> Optional[str]:
+    """Error message of a summary that finished as failed, for recording the job result"""
+    summary = db.query(Summary).filter(Summary.id == summary_id).first()
+    if summary is None:
+        return "Summary not found"
+    if summary.status == "failed":
+        return summary.error_message or "Processing failed"
+    return None
+
+# Shared instance used by the API to enqueue and by workers to claim
+job_queue = JobQueue()
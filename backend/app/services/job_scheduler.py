@@ -0,0 +1,136 @@
+import os
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parse_tier_setting(value: str, defaults: Dict[str, float]) -> Dict[str, float]:
+    """Parse a "free:1,basic:2,pro:4" setting, keeping defaults for tiers it doesn't mention"""
+    settings = dict(defaults)
+    for item in value.split(","):
+        tier, _, amount = item.partition(":")
+        if tier.strip() and amount.strip():
+            try:
+                settings[tier.strip().lower()] = float(amount)
+            except ValueError:
+                logger.warning(f"Ignoring invalid tier setting: {item}")
+    return settings
+
+class FairScheduler:
+    """
+    Weighted fair queuing of jobs across users.
+
+    Each user has a share weight and a cap on running jobs from their
+    subscription tier. A user's service is the media duration of their
+    running jobs plus the jobs they started within the fair share window.
+    The next job goes to the user with the earliest virtual finish time,
+    (service + cost of their next job) / weight. Users with a higher tier,
+    users who have had less processing recently, and short jobs therefore go
+    first, while nobody is starved.
+
+    Within one user's jobs, short jobs are boosted by treating them as if
+    they had been queued JOB_SHORT_JOB_BOOST_SECONDS earlier. Durations come
+    from probing the media; jobs with an unknown duration cost the default.
+
+    Jobs are plain dicts with "id", "user_id", "duration_seconds" and
+    "run_at" (epoch seconds), so the same ordering is used to pick the next
+    claim and to report queue positions.
+    """
+
+    def __init__(self):
+        """Initialize scheduling settings using environment variables"""
+        self.tier_weights = parse_tier_setting(
+            os.getenv("JOB_TIER_WEIGHTS", ""),
+            {"free": 1.0, "basic": 2.0, "pro": 4.0}
+        )
+        self.tier_max_running = parse_tier_setting(
+            os.getenv("JOB_TIER_MAX_RUNNING", ""),
+            {"free": 1, "basic": 2, "pro": 4}
+        )
+        self.short_job_seconds = float(os.getenv("JOB_SHORT_JOB_SECONDS", "900"))
+        self.short_job_boost_seconds = float(os.getenv("JOB_SHORT_JOB_BOOST_SECONDS", "1800"))
+        self.default_duration_seconds = float(os.getenv("JOB_DEFAULT_DURATION_SECONDS", "1800"))
+        self.fair_share_window_seconds = float(os.getenv("JOB_FAIR_SHARE_WINDOW_SECONDS", "3600"))
+
+    def weight(self, tier: Optional[str]) -> float:
+        return max(self.tier_weights.get((tier or "free").lower(), self.tier_weights["free"]), 0.01)
+
+    def max_running(self, tier: Optional[str]) -> int:
+        return int(self.tier_max_running.get((tier or "free").lower(), self.tier_max_running["free"]))
+
+    def cost(self, duration_seconds: Optional[float]) -> float:
+        """Scheduling cost of a job: its media duration, or the default if it wasn't probed"""
+        return duration_seconds if duration_seconds else self.default_duration_seconds
+
+    def is_short(self, duration_seconds: Optional[float]) -> bool:
+        return bool(duration_seconds) and duration_seconds <= self.short_job_seconds
+
+    def sort_key(self, job: Dict[str, Any]) -> float:
+        """Order of one user's jobs: arrival time, with short jobs moved ahead"""
+        boost = self.short_job_boost_seconds if self.is_short(job.get("duration_seconds")) else 0.0
+        return job["run_at"] - boost
+
+    def order(
+        self,
+        jobs: List[Dict[str, Any]],
+        tiers: Dict[str, Optional[str]],
+        service: Optional[Dict[str, float]] = None,
+        running: Optional[Dict[str, int]] = None,
+        respect_caps: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Order queued jobs the way they would be claimed
+
+        Args:
+            jobs: Queued jobs
+            tiers: Subscription tier by user id
+            service: Recent service (seconds of media) by user id
+            running: Running job count by user id
+            respect_caps: Leave out users already at their running cap (for
+                choosing a claim); otherwise every job is ordered (for queue
+                positions)
+        """
+        service = defaultdict(float, service or {})
+        running = defaultdict(int, running or {})
+
+        by_user = defaultdict(list)
+        for job in jobs:
+            by_user[job["user_id"] or ""].append(job)
+
+        heap = []
+        for user_id, user_jobs in by_user.items():
+            # Popped from the end; equal keys keep their given (creation) order
+            user_jobs.sort(key=self.sort_key)
+            user_jobs.reverse()
+            if respect_caps and running[user_id] >= self.max_running(tiers.get(user_id)):
+                continue
+            heapq.heappush(heap, self._entry(user_id, user_jobs[-1], service, tiers))
+
+        ordered = []
+        while heap:
+            _, _, user_id = heapq.heappop(heap)
+            user_jobs = by_user[user_id]
+            job = user_jobs.pop()
+            ordered.append(job)
+
+            # Picking the job adds its cost to the user's service
+            service[user_id] += self.cost(job.get("duration_seconds"))
+            running[user_id] += 1
+            if not user_jobs:
+                continue
+            if respect_caps and running[user_id] >= self.max_running(tiers.get(user_id)):
+                continue
+            heapq.heappush(heap, self._entry(user_id, user_jobs[-1], service, tiers))
+        return ordered
+
+    def _entry(self, user_id: str, job: Dict[str, Any], service: Dict[str, float], tiers: Dict[str, Optional[str]]):
+        finish = (service[user_id] + self.cost(job.get("duration_seconds"))) / self.weight(tiers.get(user_id))
+        # Ties go to the job that has waited longest
+        return finish, self.sort_key(job), user_id
+
+# Shared instance so the queue and the status endpoint order jobs the same way
+fair_scheduler = FairScheduler()
@@ -0,0 +1,136 @@
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .job_queue import JobQueue, PermanentJobError, job_queue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A handler runs one job and returns the summary's error message if processing failed.
+# Exceptions it raises are retried by the queue, except PermanentJobError.
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[str]]]
+
+def default_handlers() -> Dict[str, JobHandler]:
+    """Handlers for the job kinds enqueued by the API"""
+    # Imported here because the endpoint modules import the queue to enqueue jobs
+    from ..api.endpoints.process import run_media_file_job
+    from ..api.endpoints.youtube import run_youtube_job
+    return {
+        "media_file": run_media_file_job,
+        "youtube": run_youtube_job
+    }
+
+class JobWorker:
+    """
+    Runs jobs from the durable queue, up to `concurrency` at a time.
+
+    Each running job has a heartbeat that renews its lease. If the lease is
+    lost (the job was reclaimed after a stall), the job is cancelled here so
+    it doesn't run twice. On shutdown the worker stops claiming and waits for
+    running jobs. Jobs still running after the grace period are cancelled and
+    handed back to the queue.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        concurrency: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ):
+        """Initialize the worker using environment variables for anything not given"""
+        self.queue = queue or job_queue
+        self.handlers = handlers if handlers is not None else default_handlers()
+        self.concurrency = concurrency or int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+        self.poll_interval = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+        self.heartbeat_interval = float(os.getenv("JOB_HEARTBEAT_SECONDS", str(self.queue.lease_seconds / 4)))
+        self.shutdown_grace = float(os.getenv("JOB_SHUTDOWN_GRACE_SECONDS", "30"))
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = asyncio.Event()
+        self._running = {}
+        self._lost_leases = set()
+
+    async def run(self) -> None:
+        """Claim and run jobs until stop() is called"""
+        logger.info(f"Job worker {self.worker_id} started with {self.concurrency} slots")
+        await asyncio.gather(*(self._slot() for _ in range(self.concurrency)))
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def stop(self) -> None:
+        """Stop claiming, let running jobs finish within the grace period, then hand back the rest"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        running = list(self._running.values())
+        if not running:
+            return
+        logger.info(f"Waiting up to {self.shutdown_grace:.0f}s for {len(running)} running jobs")
+        _, pending = await asyncio.wait(running, timeout=self.shutdown_grace)
+        for task in pending:
+            task.cancel()
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._execute(job)
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, f"Unknown job kind: {job['kind']}", False)
+            return
+
+        task = asyncio.create_task(handler(job))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, task))
+        try:
+            error = await task
+        except asyncio.CancelledError:
+            if job_id in self._lost_leases:
+                logger.error(f"Stopped job {job_id} after losing its lease")
+            else:
+                await asyncio.to_thread(self.queue.release, job_id, self.worker_id)
+        except PermanentJobError as e:
+            logger.error(f"Job {job_id} failed permanently: {e}")
+            await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, str(e), False)
+        except Exception as e:
+            logger.error(f"Job {job_id} raised: {e}")
+            await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, str(e))
+        else:
+            await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, error)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+            self._lost_leases.discard(job_id)
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                owned = await asyncio.to_thread(self.queue.heartbeat, job_id, self.worker_id)
+            except Exception as e:
+                # Keep trying; if the lease runs out meanwhile, the next heartbeat says so
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not owned:
+                self._lost_leases.add(job_id)
+                task.cancel()
+                return
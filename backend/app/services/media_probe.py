@@ -0,0 +1,141 @@
+import os
+import json
+import shutil
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MediaProbe:
+    """
+    Single entry point for FFmpeg/FFprobe media inspection.
+
+    Binary availability is checked once when the service is created, and each
+    file is probed with a single ffprobe call whose result is cached by path,
+    modification time and size.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Check for FFmpeg binaries and set up the probe cache"""
+        self.ffmpeg_available = self._binary_available("ffmpeg")
+        self.ffprobe_available = self._binary_available("ffprobe")
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        logger.info(f"FFmpeg available: {self.ffmpeg_available}, FFprobe available: {self.ffprobe_available}")
+
+    def _binary_available(self, name: str) -> bool:
+        """Check if a binary can be executed from the system PATH"""
+        if shutil.which(name) is None:
+            return False
+        try:
+            subprocess.run(
+                [name, "-version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
+            return True
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return False
+
+    def probe(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get media information for a file
+
+        Args:
+            file_path: Path to the audio/video file
+
+        Returns:
+            Dict with duration, bit_rate, format_name, audio_codec, video_codec,
+            channels and sample_rate (values are 0/None when unknown)
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        info = self._run_ffprobe(file_path, stat.st_size)
+
+        with self._lock:
+            self._cache[key] = info
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return info
+
+    def get_duration(self, file_path: str) -> float:
+        """Get audio/video file duration in seconds"""
+        return self.probe(file_path)["duration"]
+
+    def _run_ffprobe(self, file_path: str, file_size: int) -> Dict[str, Any]:
+        """Run ffprobe once and extract format and stream details"""
+        info = {
+            "duration": 0.0,
+            "bit_rate": 0,
+            "format_name": None,
+            "audio_codec": None,
+            "video_codec": None,
+            "channels": 0,
+            "sample_rate": 0
+        }
+
+        if not self.ffprobe_available:
+            logger.warning("FFprobe not available, media information unknown")
+            return info
+
+        try:
+            cmd = [
+                "ffprobe",
+                "-v", "error",
+                "-show_format",
+                "-show_streams",
+                "-of", "json",
+                file_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            data = json.loads(result.stdout or "{}")
+        except (subprocess.SubprocessError, ValueError) as e:
+            logger.warning(f"Failed to probe media with FFprobe: {e}")
+            return info
+
+        media_format = data.get("format", {})
+        info["duration"] = self._to_float(media_format.get("duration"))
+        info["bit_rate"] = int(self._to_float(media_format.get("bit_rate")))
+        info["format_name"] = media_format.get("format_name")
+
+        for stream in data.get("streams", []):
+            codec_type = stream.get("codec_type")
+            if codec_type == "audio" and info["audio_codec"] is None:
+                info["audio_codec"] = stream.get("codec_name")
+                info["channels"] = int(stream.get("channels") or 0)
+                info["sample_rate"] = int(self._to_float(stream.get("sample_rate")))
+                if not info["duration"]:
+                    info["duration"] = self._to_float(stream.get("duration"))
+            elif codec_type == "video" and info["video_codec"] is None:
+                # Cover art is reported as a video stream but carries no video
+                if not stream.get("disposition", {}).get("attached_pic"):
+                    info["video_codec"] = stream.get("codec_name")
+
+        if not info["bit_rate"] and info["duration"]:
+            info["bit_rate"] = int(file_size * 8 / info["duration"])
+
+        return info
+
+    def _to_float(self, value: Optional[Any]) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+# Shared instance so binaries are checked once per process
+media_probe = MediaProbe()
@@ -0,0 +1,46 @@
+import os
+import threading
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+# One client per process (and per flavour) so every service shares the same
+# connection pool instead of opening its own
+_client = None
+_async_client = None
+_lock = threading.Lock()
+
+def _connection_limits() -> httpx.Limits:
+    """Connection pool limits for the OpenAI HTTP clients"""
+    return httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+    )
+
+def _timeout() -> httpx.Timeout:
+    # Long uploads to Whisper need a generous read timeout, but connecting should fail fast
+    return httpx.Timeout(float(os.getenv("OPENAI_TIMEOUT", "600")), connect=10.0)
+
+def get_openai_client() -> OpenAI:
+    """Get the process-wide synchronous OpenAI client"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                timeout=_timeout(),
+                http_client=DefaultHttpxClient(limits=_connection_limits())
+            )
+        return _client
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get the process-wide AsyncOpenAI client"""
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            _async_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                timeout=_timeout(),
+                http_client=DefaultAsyncHttpxClient(limits=_connection_limits())
+            )
+        return _async_client
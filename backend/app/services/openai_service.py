@@ -1,26 +1,130 @@
 import os
+import re
 import logging
 import tempfile
 import math
 import io
 import subprocess
+import shutil
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from openai import OpenAI, APIStatusError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, IO, Union, Callable
+import asyncio
+import inspect
+from openai import APIStatusError, RateLimitError
+from tenacity import retry, stop_after_attempt, wait_random_exponential, Retrying, AsyncRetrying
+
+# tiktoken gives exact token counts for chunking; fall back to an estimate without it
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from .openai_client import get_openai_client, get_async_openai_client
+from .transcription_cache import transcription_cache
+from .summary_cache import summary_cache
+from .media_probe import media_probe
+from .rate_limiter import openai_rate_limits
+from .transcription_backends import get_transcription_backend
+from .transcript_formatter import format_combined_transcript
+from .summary_parser import SummaryParser
+from .segment_store import SegmentStore
+from .silence_detection import TimeMap, parse_silencedetect_output, plan_segments
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class OpenAIService:
+    # Define a more structured prompt for our use case
+    SUMMARY_PROMPT = """
+You are an expert summarizer for Scribe It, a service that condenses videos into comprehensive summaries.
+
+Please analyze the following transcript and generate a structured summary with these components:
+
+1. OVERVIEW: A concise 2-3 paragraph summary of the main content and context of the discussion.
+
+2. KEY POINTS: A bullet-point list of the 5-8 most important insights, facts, or topics covered.
+
+3. ACTION ITEMS: A bullet-point list of specific tasks, follow-ups, or commitments mentioned by participants.
+
+4. NOTABLE QUOTES: 2-3 significant or representative quotes from the transcript (with attribution if possible).
+
+Format your response with clear headings for each section.
+"""
+
+    # Prompt for the map step of long transcripts
+    CHUNK_SUMMARY_PROMPT = """
+The following text is part {part} of {total} of a longer transcript. Write concise notes on this part only, with these headings:
+
+OVERVIEW: One paragraph describing what this part covers.
+
+KEY POINTS: Bullet points with the important insights, facts, or topics.
+
+ACTION ITEMS: Bullet points with tasks, follow-ups, or commitments (write "None" if there are none).
+
+NOTABLE QUOTES: Up to 2 significant quotes, verbatim, with attribution if possible.
+"""
+
+    # Introduces the per-chunk notes in the reduce step
+    MERGE_NOTES_PREAMBLE = (
+        "The transcript was too long to summarize at once, so it was split into consecutive parts. "
+        "Below are notes for each part in order. Combine them into a single summary of the whole transcript, "
+        "merging duplicate points and keeping only the most important ones."
+    )
+
     def __init__(self):
-        # Simple initialization without proxy parameters
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-        )
+        # Process-wide client with a shared connection pool
+        self.client = get_openai_client()
         self.logger = logging.getLogger(__name__)
-        self.MAX_FILE_SIZE = 24 * 1024 * 1024  # 24MB to be safe (OpenAI limit is 25MB)
+        # Hosted Whisper or a local engine, chosen by TRANSCRIPTION_BACKEND
+        self.transcription_backend = get_transcription_backend()
+        self.MAX_FILE_SIZE = self.transcription_backend.max_file_size
+        # Maximum number of segments transcribed at the same time
+        self.max_concurrent_segments = int(os.getenv(
+            "OPENAI_MAX_CONCURRENT_SEGMENTS",
+            str(self.transcription_backend.default_concurrency)
+        ))
+        self.transcription_model = self.transcription_backend.model_name
+        self.transcription_cache = transcription_cache
+        # Request budgets shared by every job (and, with the file store, every worker)
+        self.rate_limits = openai_rate_limits
+        self.media_probe = media_probe
+        # Re-encode media to mono low-bitrate speech audio before upload
+        self.normalize_audio = os.getenv("AUDIO_NORMALIZATION_ENABLED", "true").lower() == "true"
+        self.normalize_min_bytes = int(os.getenv("AUDIO_NORMALIZATION_MIN_MB", "4")) * 1024 * 1024
+        self.normalize_bitrate = os.getenv("AUDIO_NORMALIZATION_BITRATE", "24k")
+        # Cut long media inside pauses and drop long silent stretches
+        self.silence_detection = os.getenv("SILENCE_DETECTION_ENABLED", "true").lower() == "true"
+        self.silence_noise_db = float(os.getenv("SILENCE_NOISE_DB", "-35"))
+        self.silence_min_seconds = float(os.getenv("SILENCE_MIN_SECONDS", "0.4"))
+        self.silence_trim_seconds = float(os.getenv("SILENCE_TRIM_SECONDS", "2.0"))
+        # Segments are sized from the bitrate to fill (but not exceed) the upload limit
+        self.segment_target_bytes = int(self.MAX_FILE_SIZE * 0.9)
+        self.min_segment_seconds = int(os.getenv("SEGMENT_MIN_SECONDS", "60"))
+        self.max_segment_seconds = int(os.getenv("SEGMENT_MAX_SECONDS", "1800"))
+        self.max_resplit_depth = 3
+        # Segments are held in memory and spill to disk only above this size
+        self.segment_spill_bytes = int(os.getenv("SEGMENT_SPILL_MB", "8")) * 1024 * 1024
+        # Summarization settings; long transcripts are summarized with map-reduce
+        self.summary_model = "gpt-4o"
+        self.summary_temperature = 0.3
+        self.summary_max_tokens = 1000  # Increased token limit for more comprehensive summaries
+        self.chunk_summary_max_tokens = 700
+        self.summary_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "12000"))
+        # A chunk must hold several chunk notes, or condensing the notes can't shrink them
+        if self.summary_chunk_tokens < 3 * self.chunk_summary_max_tokens:
+            raise ValueError(
+                f"SUMMARY_CHUNK_TOKENS ({self.summary_chunk_tokens}) must be at least "
+                f"{3 * self.chunk_summary_max_tokens} (3x the {self.chunk_summary_max_tokens} token chunk notes)"
+            )
+        self.max_condense_rounds = int(os.getenv("SUMMARY_MAX_CONDENSE_ROUNDS", "3"))
+        self.max_concurrent_summaries = int(os.getenv("OPENAI_MAX_CONCURRENT_SUMMARIES", "4"))
+        self.summary_cache = summary_cache
+        self._token_encoding = tiktoken.get_encoding("o200k_base") if TIKTOKEN_AVAILABLE else None
 
     def _get_file_size(self, file_path: str) -> int:
         """Get file size in bytes"""
@@ -32,96 +136,300 @@ class OpenAIService:
         return Path(file_path).suffix.lower() in supported_extensions
 
     def _check_ffmpeg_available(self) -> bool:
-        """Check if FFmpeg is available in the system PATH"""
-        try:
-            subprocess.run(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        """Check if FFmpeg is available in the system PATH (checked once at startup)"""
+        return self.media_probe.ffmpeg_available
 
     def _get_audio_duration(self, file_path: str) -> float:
-        """Get audio/video file duration in seconds using FFmpeg"""
-        try:
-            # Use FFprobe to get duration
-            cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
-            return duration
-        except (subprocess.SubprocessError, ValueError) as e:
-            self.logger.warning(f"Failed to get duration with FFmpeg: {e}")
-            return 0.0
+        """Get audio/video file duration in seconds from the cached probe"""
+        return self.media_probe.get_duration(file_path)
 
-    def _split_audio_file(self, file_path: str, segment_length_seconds: int = 300) -> List[str]:
+    def _normalize_audio_file(self, file_path: str) -> str:
         """
-        Split audio/video file into smaller segments using FFmpeg
+        Extract the audio track and downmix it to 16kHz mono Opus/WebM using FFmpeg
         Args:
             file_path: Path to the audio/video file
-            segment_length_seconds: Length of each segment in seconds (default: 5 minutes)
         Returns:
-            List of paths to the segment files
+            Path to the normalized file, or the original path if normalization was skipped
         """
-        self.logger.info(f"Splitting audio/video file using FFmpeg: {file_path}")
+        if not self.normalize_audio:
+            return file_path
+        
+        # Small files already fit comfortably in a single request
+        file_size = self._get_file_size(file_path)
+        if file_size <= self.normalize_min_bytes:
+            self.logger.info("File is already small, skipping audio normalization")
+            return file_path
+        
+        # Audio-only files already near the target bitrate would not shrink much
+        media_info = self.media_probe.probe(file_path)
+        if not media_info["video_codec"] and 0 < media_info["bit_rate"] <= self._parse_bitrate(self.normalize_bitrate) * 1.5:
+            self.logger.info("File is already compact audio, skipping audio normalization")
+            return file_path
         
-        # Check if FFmpeg is available
         if not self._check_ffmpeg_available():
-            raise RuntimeError("FFmpeg is required but not found in PATH")
+            self.logger.warning("FFmpeg not available, skipping audio normalization")
+            return file_path
         
-        # Create temp directory for segments
-        temp_dir = tempfile.mkdtemp()
-        file_extension = Path(file_path).suffix
-        output_pattern = os.path.join(temp_dir, f"segment_%03d{file_extension}")
+        fd, output_path = tempfile.mkstemp(suffix=".webm")
+        os.close(fd)
         
         try:
-            # Execute FFmpeg to split the file into segments
             cmd = [
-                "ffmpeg", 
+                "ffmpeg",
+                "-y",
                 "-i", file_path,
-                "-f", "segment", 
-                "-segment_time", str(segment_length_seconds),
-                "-c", "copy",  # Copy codec (no re-encoding)
-                "-reset_timestamps", "1",  # Reset timestamps for each segment
-                "-map", "0",  # Map all streams
+                "-vn",  # Drop video tracks
+                "-map", "0:a:0",  # First audio stream only
+                "-ac", "1",  # Mono
+                "-ar", "16000",  # Whisper resamples to 16kHz internally
+                "-c:a", "libopus",
+                "-b:a", self.normalize_bitrate,
+                "-application", "voip",  # Tune the encoder for speech
                 "-loglevel", "warning",
-                output_pattern
+                output_path
             ]
             
             self.logger.info(f"Running FFmpeg command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            self.logger.debug(f"FFmpeg output: {result.stdout}")
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
             
-            # Get list of generated segment files
-            segment_files = sorted([
-                os.path.join(temp_dir, f) 
-                for f in os.listdir(temp_dir)
-                if os.path.isfile(os.path.join(temp_dir, f))
-            ])
+            normalized_size = self._get_file_size(output_path)
+            if normalized_size == 0 or normalized_size >= file_size:
+                self.logger.info("Normalized audio is not smaller than the original, using original file")
+                os.remove(output_path)
+                return file_path
             
-            if not segment_files:
-                raise RuntimeError("FFmpeg did not generate any segment files")
-                
-            self.logger.info(f"Created {len(segment_files)} segments from audio/video file")
-            return segment_files
+            self.logger.info(f"Normalized audio from {file_size / (1024 * 1024):.2f} MB to {normalized_size / (1024 * 1024):.2f} MB")
+            return output_path
             
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"FFmpeg error: {e.stderr}")
-            raise RuntimeError(f"Failed to split audio/video file: {e.stderr}")
-        except Exception as e:
-            self.logger.error(f"Error splitting file: {str(e)}")
+            self.logger.warning(f"Audio normalization failed, using original file: {e.stderr}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return file_path
+
+    def _detect_silences(self, file_path: str, duration: float) -> List[Tuple[float, float]]:
+        """
+        Detect silent intervals using FFmpeg's silencedetect filter
+        Args:
+            file_path: Path to the audio/video file
+            duration: Media duration in seconds
+        Returns:
+            List of (start, end) silence intervals in seconds
+        """
+        cmd = [
+            "ffmpeg",
+            "-i", file_path,
+            "-vn",
+            "-af", f"silencedetect=noise={self.silence_noise_db}dB:d={self.silence_min_seconds}",
+            "-f", "null",
+            "-"
+        ]
+        
+        self.logger.info(f"Running FFmpeg command: {' '.join(cmd)}")
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        silences = parse_silencedetect_output(result.stderr, duration)
+        self.logger.info(f"Detected {len(silences)} silent intervals")
+        return silences
+
+    def _extract_segment(self, source: Union[str, IO[bytes]], ranges: List[Tuple[float, float]]) -> IO[bytes]:
+        """
+        Encode the given ranges of the input back to back into an in-memory segment
+        
+        FFmpeg writes the segment to a pipe; it is held in memory and only spilled
+        to a temporary file once it grows past the configured threshold. A
+        file-like source is streamed to FFmpeg's stdin from a thread, and
+        FFmpeg's log goes to a temporary file, so no pipe can fill up and
+        block FFmpeg while stdout is being drained.
+        Args:
+            source: Path to the audio/video file, or a file-like object holding it
+            ranges: Kept (start, end) ranges of the source, in seconds
+        Returns:
+            Seekable file-like object with the WebM/Opus segment
+        """
+        segment_start, segment_end = ranges[0][0], ranges[-1][1]
+        cmd = [
+            "ffmpeg",
+            "-ss", f"{segment_start:.3f}",
+            "-to", f"{segment_end:.3f}",
+            "-i", source if isinstance(source, str) else "pipe:0",
+            "-vn",
+            "-ac", "1",
+            "-ar", "16000",
+            "-c:a", "libopus",
+            "-b:a", self.normalize_bitrate,
+            "-application", "voip",
+            "-loglevel", "error"
+        ]
+        
+        # Drop the silent gaps between kept ranges (times are relative to the seek point)
+        if len(ranges) > 1:
+            keep = "+".join(
+                f"between(t,{start - segment_start:.3f},{end - segment_start:.3f})"
+                for start, end in ranges
+            )
+            cmd += ["-af", f"aselect='{keep}',asetpts=N/SR/TB"]
+        
+        cmd += ["-f", "webm", "pipe:1"]
+        
+        segment = tempfile.SpooledTemporaryFile(max_size=self.segment_spill_bytes, suffix=".webm")
+        try:
+            with tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=None if isinstance(source, str) else subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr
+                )
+                feeder = None
+                if not isinstance(source, str):
+                    feeder = threading.Thread(target=self._feed_pipe, args=(source, process.stdin), daemon=True)
+                    feeder.start()
+                for chunk in iter(lambda: process.stdout.read(1024 * 1024), b""):
+                    segment.write(chunk)
+                process.stdout.close()
+                returncode = process.wait()
+                if feeder is not None:
+                    feeder.join()
+                if returncode != 0:
+                    stderr.seek(0)
+                    raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr.read().decode(errors="replace"))
+        except Exception:
+            segment.close()
             raise
+        
+        segment.seek(0)
+        return segment
+
+    @staticmethod
+    def _feed_pipe(source: IO[bytes], pipe: IO[bytes]) -> None:
+        """Copy a file-like source into a subprocess's stdin in chunks, then close it"""
+        try:
+            source.seek(0)
+            shutil.copyfileobj(source, pipe, 1024 * 1024)
+        except (BrokenPipeError, ValueError):
+            # FFmpeg stopped reading (it reached the end time, or failed); its exit code tells which
+            pass
+        finally:
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+
+    def _parse_bitrate(self, bitrate: str) -> int:
+        """Convert an FFmpeg bitrate string such as '24k' to bits per second"""
+        bitrate = bitrate.strip().lower()
+        if bitrate.endswith("k"):
+            return int(float(bitrate[:-1]) * 1000)
+        if bitrate.endswith("m"):
+            return int(float(bitrate[:-1]) * 1000 * 1000)
+        return int(bitrate)
+
+    def _segment_length_for_bitrate(self, bits_per_second: float) -> int:
+        """
+        Pick the segment length that fills the upload limit at the given bitrate
+        Args:
+            bits_per_second: Bitrate of the segments that will be uploaded
+        Returns:
+            Segment length in seconds, clamped to the configured bounds
+        """
+        if bits_per_second <= 0:
+            return 300
+        seconds = self.segment_target_bytes * 8 / bits_per_second
+        return int(max(self.min_segment_seconds, min(seconds, self.max_segment_seconds)))
+
+    def _plan_audio_segments(self, file_path: str, duration: float) -> List[TimeMap]:
+        """
+        Plan how audio/video file is cut into segments
+        
+        Cut points are placed inside pauses and long silences are dropped when
+        silence detection is enabled; otherwise the file is cut at fixed intervals.
+        Args:
+            file_path: Path to the audio/video file
+            duration: Media duration in seconds
+        Returns:
+            One TimeMap per segment describing which ranges of the file it contains
+        """
+        self.logger.info(f"Planning segments using FFmpeg: {file_path}")
+        
+        # Check if FFmpeg is available
+        if not self._check_ffmpeg_available():
+            raise RuntimeError("FFmpeg is required but not found in PATH")
+        
+        if duration <= 0:
+            raise RuntimeError("Could not determine audio/video duration")
+        
+        # Segments are re-encoded, so their size follows the output bitrate
+        segment_length_seconds = self._segment_length_for_bitrate(self._parse_bitrate(self.normalize_bitrate))
+        
+        if self.silence_detection:
+            try:
+                silences = self._detect_silences(file_path, duration)
+                plan = [
+                    TimeMap(ranges)
+                    for ranges in plan_segments(
+                        duration,
+                        silences,
+                        segment_length_seconds,
+                        trim_seconds=self.silence_trim_seconds
+                    )
+                ]
+                kept_seconds = sum(time_map.duration for time_map in plan)
+                self.logger.info(f"Planned {len(plan)} silence-aligned segments ({duration - kept_seconds:.1f}s of silence trimmed)")
+                return plan
+            except subprocess.CalledProcessError as e:
+                self.logger.warning(f"Silence detection failed, falling back to fixed intervals: {e.stderr}")
+        
+        plan = [
+            TimeMap.offset(start, min(segment_length_seconds, duration - start))
+            for start in range(0, math.ceil(duration), segment_length_seconds)
+        ]
+        self.logger.info(f"Planned {len(plan)} fixed-length segments")
+        return plan
+
+    def transcribe_audio(self, audio_file_path: str, progress: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Transcribe audio file, reusing a cached result for identical media.
+        
+        If a progress recorder (see TranscriptionProgress) is given, it is told
+        the segment plan and receives each segment as it completes. Segments it
+        already holds from an earlier attempt are reused instead of re-transcribed.
+        """
+        cache_key = None
+        try:
+            # Hashing reads the whole file, so skip it when there is no cache to look in
+            if self.transcription_cache.enabled:
+                cache_key = self.transcription_cache.compute_key(audio_file_path, self.transcription_model)
+                cached = self.transcription_cache.get(cache_key)
+                if cached is not None:
+                    self._report_cached(progress, cached)
+                    return cached
+        except OSError as e:
+            self.logger.warning(f"Transcription cache lookup failed: {e}")
+        
+        # Check if format is supported before doing any work on the file
+        if not self._is_audio_format_supported(audio_file_path):
+            error_msg = f"Unsupported file format: {Path(audio_file_path).suffix}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        started_at = time.monotonic()
+        upload_path = self._normalize_audio_file(audio_file_path)
+        try:
+            result = self._transcribe_uncached(upload_path, progress)
+        finally:
+            if upload_path != audio_file_path and os.path.exists(upload_path):
+                os.remove(upload_path)
+        
+        # Don't cache transcripts that contain placeholders for failed segments
+        if cache_key and self._is_complete_transcription(result["text"]):
+            self.transcription_cache.put(cache_key, result, time.monotonic() - started_at)
+        return result
+
+    def _is_complete_transcription(self, text: str) -> bool:
+        """Check that no segment was replaced by an error/skip placeholder"""
+        return "[Error transcribing segment" not in text and "skipped due to size limitations]" not in text
 
-    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=2, max=4))
-    def transcribe_audio(self, audio_file_path: str) -> Dict[str, Any]:
+    def _transcribe_uncached(self, audio_file_path: str, progress: Optional[Any] = None) -> Dict[str, Any]:
         """Transcribe audio file using OpenAI's API."""
         self.logger.info(f"Transcribing audio file: {audio_file_path}")
         
@@ -140,23 +448,13 @@ class OpenAIService:
             try:
                 self.logger.info("Attempting to transcribe the entire file")
                 with open(audio_file_path, "rb") as audio_file:
-                    response = self.client.audio.transcriptions.create(
-                        file=audio_file,
-                        model="whisper-1"
-                    )
-                    
-                    # Handle response based on its structure
-                    if hasattr(response, 'text'):
-                        text = response.text
-                        segments = getattr(response, 'segments', [])
-                    elif isinstance(response, dict):
-                        text = response.get('text', '')
-                        segments = response.get('segments', [])
-                    else:
-                        text = str(response)
-                        segments = []
-                    
-                    return {"text": text, "segments": segments}
+                    response = self.transcription_backend.transcribe(audio_file)
+                
+                text, segments = response["text"], response["segments"]
+                if progress:
+                    progress.start([(0.0, None)])
+                    progress.segment_completed(0, 0.0, None, text, segments)
+                return {"text": text, "segments": segments}
             except APIStatusError as e:
                 # If the file is too large, we'll get a 413 error
                 self.logger.warning(f"Failed to transcribe entire file: {e}")
@@ -174,101 +472,203 @@ class OpenAIService:
             audio_duration = self._get_audio_duration(audio_file_path)
             self.logger.info(f"Audio duration: {audio_duration:.2f} seconds")
             
-            # Define segment length in seconds (matching the default in _split_audio_file)
-            segment_length_seconds = 300  # 5 minutes per segment
+            # Plan segments (segment length is derived from the bitrate)
+            plan = self._plan_audio_segments(audio_file_path, audio_duration)
             
-            # Split the file using FFmpeg
-            segment_files = self._split_audio_file(audio_file_path, segment_length_seconds)
+            # Each worker encodes its segment through an FFmpeg pipe and uploads it as
+            # soon as it is complete, so only in-flight segments are ever buffered
+            total_segments = len(plan)
+            results = self._load_checkpoints(progress, plan)
+            pending = [i for i in range(total_segments) if results[i] is None]
             
-            # Transcribe each segment
-            full_text = ""
-            all_segments = []
-            total_segments = len(segment_files)
+            max_workers = max(1, min(self.max_concurrent_segments, len(pending)))
+            self.logger.info(f"Transcribing {len(pending)} of {total_segments} segments with up to {max_workers} in flight")
             
-            for i, segment_file in enumerate(segment_files):
-                segment_size = self._get_file_size(segment_file)
-                segment_number = i + 1
-                approx_start_time = i * segment_length_seconds  # Approximate start time in seconds
-                
-                # Format timestamp as HH:MM:SS
-                start_time_formatted = self._format_timestamp(approx_start_time)
-                
-                self.logger.info(f"Transcribing segment {segment_number}/{total_segments} ({segment_size / (1024 * 1024):.2f} MB)")
-                
-                # Add segment heading with timestamp
-                if i > 0:
-                    full_text += f"\n\n"
-                
-                # Skip segments that are still too large
-                if segment_size > self.MAX_FILE_SIZE:
-                    self.logger.warning(f"Segment {segment_number} is still too large ({segment_size / (1024 * 1024):.2f} MB), skipping")
-                    full_text += f"[Segment {segment_number} at {start_time_formatted} skipped due to size limitations]"
-                    continue
-                
-                try:
-                    with open(segment_file, "rb") as audio_file:
-                        response = self.client.audio.transcriptions.create(
-                            file=audio_file,
-                            model="whisper-1"
-                        )
-                        
-                        # Handle response
-                        if hasattr(response, 'text'):
-                            text = response.text
-                            segments = getattr(response, 'segments', [])
-                        elif isinstance(response, dict):
-                            text = response.get('text', '')
-                            segments = response.get('segments', [])
-                        else:
-                            text = str(response)
-                            segments = []
-                        
-                        # Update segment timestamps if available
-                        if segments:
-                            for segment in segments:
-                                if hasattr(segment, 'start') and segment.start is not None:
-                                    # Adjust segment timestamps to account for position in the full audio
-                                    segment.start += approx_start_time
-                                if hasattr(segment, 'end') and segment.end is not None:
-                                    segment.end += approx_start_time
-                        
-                        # Add formatted text from this segment
-                        cleaned_text = text.strip()
-                        if cleaned_text:
-                            full_text += cleaned_text
-                        
-                        # Add segments to the collection
-                        all_segments.extend(segments)
-                        
-                except Exception as e:
-                    self.logger.error(f"Error transcribing segment {segment_number}: {e}")
-                    full_text += f"[Error transcribing segment {segment_number} at {start_time_formatted}]"
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._extract_and_transcribe_segment,
+                        audio_file_path,
+                        i,
+                        total_segments,
+                        time_map
+                    ): i
+                    for i, time_map in enumerate(plan)
+                    if results[i] is None
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    if progress:
+                        self._report_segment(progress, index, plan[index], results[index])
             
-            # Final text processing - clean up potential artifacts from combining segments
-            processed_text = self._process_combined_transcript(full_text)
-            
-            # Clean up temporary files
-            for segment_file in segment_files:
-                try:
-                    os.remove(segment_file)
-                except Exception as e:
-                    self.logger.warning(f"Failed to remove temp file {segment_file}: {e}")
-            
-            # Clean up temp directory
-            try:
-                os.rmdir(os.path.dirname(segment_files[0]))
-            except Exception as e:
-                self.logger.warning(f"Failed to remove temp directory: {e}")
-                
-            if not processed_text.strip():
-                raise ValueError("Failed to transcribe any segments of the file")
-                
-            return {"text": processed_text.strip(), "segments": all_segments}
+            return self._combine_segment_results(results)
             
         except Exception as e:
             self.logger.error(f"Error processing file with FFmpeg: {e}")
             raise ValueError(f"Failed to process large file: {str(e)}")
 
+    def _load_checkpoints(self, progress: Optional[Any], plan: List[TimeMap]) -> List[Optional[Tuple[str, List[Any]]]]:
+        """
+        Record the segment plan and reuse segments finished by an earlier attempt
+        Args:
+            progress: Progress recorder, or None
+            plan: Planned segments
+        Returns:
+            (text, segments) per planned segment, None where it still has to be transcribed
+        """
+        results = [None] * len(plan)
+        if not progress:
+            return results
+        
+        checkpoints = progress.start([(time_map.original_start, time_map.original_end) for time_map in plan])
+        for index, checkpoint in checkpoints.items():
+            # Placeholders for failed segments are transcribed again
+            if self._is_complete_transcription(checkpoint["text"]):
+                results[index] = (checkpoint["text"], SegmentStore.from_segments(checkpoint["segments"]))
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if len(missing) < len(plan):
+            first_missing = missing[0] + 1 if missing else None
+            self.logger.info(f"Resuming transcription: {len(plan) - len(missing)}/{len(plan)} segments checkpointed, first missing segment: {first_missing}")
+        return results
+
+    def _report_cached(self, progress: Optional[Any], result: Dict[str, Any]) -> None:
+        """Record a cached transcription as one finished segment, so progress shows it complete"""
+        if progress:
+            progress.start([(0.0, None)])
+            progress.segment_completed(0, 0.0, None, result["text"], result["segments"])
+
+    def _report_segment(self, progress: Any, index: int, time_map: TimeMap, result: Tuple[str, List[Any]]) -> None:
+        """Pass a finished segment to the progress recorder"""
+        text, segments = result
+        progress.segment_completed(index, time_map.original_start, time_map.original_end, text, segments)
+
+    def _map_segment_times(self, segments: SegmentStore, time_map: TimeMap) -> SegmentStore:
+        """Map segment timestamps back to their position in the full audio"""
+        return segments.mapped(time_map.to_original)
+
+    def _combine_segment_results(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        Join per-segment results (in original order) into a single transcription
+        Args:
+            results: (text, segments) tuples for each segment
+        Returns:
+            Dict with the combined "text" and "segments"
+        """
+        full_text = ""
+        all_segments = SegmentStore()
+        for i, (segment_text, segments) in enumerate(results):
+            if i > 0:
+                full_text += f"\n\n"
+            full_text += segment_text
+            all_segments.extend(segments)
+        
+        # Final text processing - clean up potential artifacts from combining segments
+        processed_text = self._process_combined_transcript(full_text)
+            
+        if not processed_text.strip():
+            raise ValueError("Failed to transcribe any segments of the file")
+            
+        return {"text": processed_text.strip(), "segments": all_segments}
+
+    def _extract_and_transcribe_segment(self, file_path: str, index: int, total_segments: int, time_map: TimeMap) -> Tuple[str, List[Any]]:
+        """
+        Encode one planned segment into memory and transcribe it
+        Args:
+            file_path: Path to the audio/video file
+            index: Zero-based position of the segment in the original file
+            total_segments: Total number of segments (for logging)
+            time_map: Ranges of the original file that make up this segment
+        Returns:
+            Tuple of (segment text or placeholder, segments with adjusted timestamps)
+        """
+        try:
+            segment_file = self._extract_segment(file_path, time_map.ranges)
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Failed to extract segment {index + 1}: {e.stderr}")
+            return f"[Error transcribing segment {index + 1} at {self._format_timestamp(time_map.original_start)}]", []
+        
+        with segment_file:
+            return self._transcribe_segment(segment_file, index, total_segments, time_map)
+
+    def _buffer_size(self, buffer: IO[bytes]) -> int:
+        """Get size in bytes of a seekable file-like object"""
+        position = buffer.tell()
+        size = buffer.seek(0, os.SEEK_END)
+        buffer.seek(position)
+        return size
+
+    def _transcribe_segment(self, segment_file: IO[bytes], index: int, total_segments: int, time_map: TimeMap, depth: int = 0) -> Tuple[str, List[Any]]:
+        """
+        Transcribe a single segment produced by the FFmpeg split
+        Args:
+            segment_file: File-like object holding the encoded segment
+            index: Zero-based position of the segment in the original file
+            total_segments: Total number of segments (for logging)
+            time_map: Mapping from segment time back to original media time
+            depth: Number of times this segment has already been re-split
+        Returns:
+            Tuple of (segment text or placeholder, segments with adjusted timestamps)
+        """
+        segment_size = self._buffer_size(segment_file)
+        segment_number = index + 1
+        
+        # Format timestamp as HH:MM:SS
+        start_time_formatted = self._format_timestamp(time_map.original_start)
+        
+        self.logger.info(f"Transcribing segment {segment_number}/{total_segments} ({segment_size / (1024 * 1024):.2f} MB)")
+        
+        # Re-split segments that are still too large instead of dropping them
+        if segment_size > self.MAX_FILE_SIZE:
+            if depth < self.max_resplit_depth and time_map.duration > self.min_segment_seconds / 4:
+                self.logger.warning(f"Segment {segment_number} is still too large ({segment_size / (1024 * 1024):.2f} MB), re-splitting")
+                return self._resplit_segment(segment_file, index, total_segments, time_map, depth)
+            self.logger.warning(f"Segment {segment_number} is still too large ({segment_size / (1024 * 1024):.2f} MB), skipping")
+            return f"[Segment {segment_number} at {start_time_formatted} skipped due to size limitations]", []
+        
+        try:
+            response = self.transcription_backend.transcribe(segment_file, f"segment_{segment_number:03d}.webm")
+            return response["text"].strip(), self._map_segment_times(response["segments"], time_map)
+            
+        except Exception as e:
+            self.logger.error(f"Error transcribing segment {segment_number}: {e}")
+            return f"[Error transcribing segment {segment_number} at {start_time_formatted}]", []
+
+    def _resplit_segment(self, segment_file: IO[bytes], index: int, total_segments: int, time_map: TimeMap, depth: int) -> Tuple[str, List[Any]]:
+        """
+        Transcode an oversized segment into smaller parts and transcribe each of them
+        Args:
+            segment_file: File-like object holding the oversized segment
+            index: Zero-based position of the segment in the original file
+            total_segments: Total number of segments (for logging)
+            time_map: Mapping from segment time back to original media time
+            depth: Number of times this segment has already been re-split
+        Returns:
+            Tuple of (combined text of the parts, segments with adjusted timestamps)
+        """
+        segment_size = self._buffer_size(segment_file)
+        parts = max(2, math.ceil(segment_size / self.segment_target_bytes))
+        part_length = time_map.duration / parts
+        
+        texts = []
+        all_segments = SegmentStore()
+        for part in range(parts):
+            start, end = part * part_length, (part + 1) * part_length
+            try:
+                part_file = self._extract_segment(segment_file, [(start, end)])
+            except subprocess.CalledProcessError as e:
+                self.logger.error(f"Failed to re-split segment {index + 1}: {e.stderr}")
+                texts.append(f"[Error transcribing segment {index + 1} at {self._format_timestamp(time_map.to_original(start))}]")
+                continue
+            
+            with part_file:
+                text, segments = self._transcribe_segment(part_file, index, total_segments, time_map.slice(start, end), depth + 1)
+            texts.append(text)
+            all_segments.extend(segments)
+        
+        return " ".join(text for text in texts if text), all_segments
+
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds as HH:MM:SS"""
         hours, remainder = divmod(int(seconds), 3600)
@@ -282,78 +682,219 @@ class OpenAIService:
         - Add proper paragraph breaks
         - Clean up punctuation and spacing
         """
-        if not text:
-            return ""
-        
-        # Replace multiple newlines with double newlines (for paragraph breaks)
-        processed = '\n\n'.join(p.strip() for p in text.split('\n') if p.strip())
-        
-        # Fix common segment boundary issues
-        # 1. Fix sentences that got cut off between segments (lowercase after period)
-        processed = processed.replace('. a', '. A')
-        processed = processed.replace('. t', '. T')
-        processed = processed.replace('. i', '. I')
-        
-        # 2. Fix missing spaces after punctuation
-        for punct in ['.', ',', '!', '?', ';', ':']:
-            processed = processed.replace(f"{punct}", f"{punct} ")
-            # Clean up any double spaces this might create
-            processed = processed.replace("  ", " ")
-        
-        # 3. Fix double punctuation that might occur at segment boundaries
-        for punct in ['.', ',', '!', '?']:
-            processed = processed.replace(f"{punct}{punct}", f"{punct}")
-        
-        # 4. Ensure proper capitalization after sentence endings
-        for end_punct in ['. ', '! ', '? ']:
-            segments = processed.split(end_punct)
-            for i in range(1, len(segments)):
-                if segments[i] and segments[i][0].islower():
-                    segments[i] = segments[i][0].upper() + segments[i][1:]
-            processed = end_punct.join(segments)
-        
-        return processed.strip()
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def generate_summary(self, text: str, prompt: Optional[str] = None) -> str:
-        """Generate a summary of the given text using OpenAI's API."""
-        self.logger.info(f"Generating summary for text of length: {len(text)}")
+        return format_combined_transcript(text)
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with tiktoken when installed, otherwise estimate ~4 characters per token"""
+        if self._token_encoding is not None:
+            return len(self._token_encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    def _chunk_transcript(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split text into chunks of at most max_tokens, preferring paragraph and sentence boundaries
+        Args:
+            text: Transcript (or notes) to split
+            max_tokens: Token budget per chunk
+        Returns:
+            List of chunks in original order
+        """
+        # Break into units no larger than the budget: paragraphs, then sentences, then words
+        units = []
+        for paragraph in text.split("\n\n"):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if self._count_tokens(paragraph) <= max_tokens:
+                units.append(paragraph)
+                continue
+            for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+                if self._count_tokens(sentence) <= max_tokens:
+                    units.append(sentence)
+                    continue
+                words = sentence.split()
+                step = max(1, max_tokens * 3 // 4)  # Words are usually more than one token
+                units.extend(" ".join(words[i:i + step]) for i in range(0, len(words), step))
         
-        # Define a more structured prompt for our use case
-        base_prompt = """
-You are an expert summarizer for Scribe It, a service that condenses videos into comprehensive summaries.
+        chunks = []
+        current = []
+        current_tokens = 0
+        for unit in units:
+            unit_tokens = self._count_tokens(unit)
+            if current and current_tokens + unit_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+        if current:
+            chunks.append(" ".join(current))
+        
+        return chunks
 
-Please analyze the following transcript and generate a structured summary with these components:
+    @retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=2, max=10))
+    def _create_summary_completion(self, content: str, max_tokens: int) -> str:
+        """Run a single summarization chat completion"""
+        # The token budget counts the prompt plus the requested completion length
+        self.rate_limits.chat.acquire(self._count_tokens(content) + max_tokens)
+        try:
+            raw_response = self.client.chat.completions.with_raw_response.create(
+                model=self.summary_model,  # Using more advanced model for better summarization
+                messages=self._summary_messages(content),
+                temperature=self.summary_temperature,  # Lower temperature for more focused output
+                max_tokens=max_tokens
+            )
+        except RateLimitError as e:
+            self.rate_limits.chat.throttled(e.response.headers)
+            raise
+        self.rate_limits.chat.update_from_headers(raw_response.headers)
+        response = raw_response.parse()
+        
+        # Access the message content using the current response structure
+        return response.choices[0].message.content
 
-1. OVERVIEW: A concise 2-3 paragraph summary of the main content and context of the discussion.
+    def _summary_messages(self, content: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are an expert summarizer that extracts key information from transcripts and produces clear, structured summaries."},
+            {"role": "user", "content": content}
+        ]
 
-2. KEY POINTS: A bullet-point list of the 5-8 most important insights, facts, or topics covered.
+    def _stream_summary_completion(self, content: str, max_tokens: int, on_update: Callable[[Dict[str, Any]], Any]) -> str:
+        """Run a summarization chat completion with stream=True, publishing parsed sections as they arrive"""
+        for attempt in Retrying(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=2, max=10), reraise=True):
+            with attempt:
+                self.rate_limits.chat.acquire(self._count_tokens(content) + max_tokens)
+                try:
+                    raw_response = self.client.chat.completions.with_raw_response.create(
+                        model=self.summary_model,
+                        messages=self._summary_messages(content),
+                        temperature=self.summary_temperature,
+                        max_tokens=max_tokens,
+                        stream=True
+                    )
+                except RateLimitError as e:
+                    self.rate_limits.chat.throttled(e.response.headers)
+                    raise
+                self.rate_limits.chat.update_from_headers(raw_response.headers)
+                
+                # A retry starts over with a fresh parser; each update is a full snapshot
+                parser = SummaryParser()
+                parts = []
+                for chunk in raw_response.parse():
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if parser.feed(delta):
+                        on_update(parser.snapshot())
+                if parser.close():
+                    on_update(parser.snapshot())
+                return "".join(parts)
 
-3. ACTION ITEMS: A bullet-point list of specific tasks, follow-ups, or commitments mentioned by participants.
+    def _should_condense(self, notes: List[str], combined: str, rounds: int, previous_count: Optional[int]) -> bool:
+        """
+        Whether chunk notes need another condense round before the final merge.
+        Stops after max_condense_rounds, or when a round didn't reduce the
+        number of notes, so a bad configuration can't loop on paid requests.
+        """
+        if len(notes) <= 1 or self._count_tokens(combined) <= self.summary_chunk_tokens:
+            return False
+        if rounds >= self.max_condense_rounds:
+            self.logger.warning(f"Notes still exceed the chunk budget after {rounds} condense rounds; merging them as they are")
+            return False
+        if previous_count is not None and len(notes) >= previous_count:
+            self.logger.warning(f"Condensing stopped reducing the notes ({len(notes)} chunks); merging them as they are")
+            return False
+        return True
 
-4. NOTABLE QUOTES: 2-3 significant or representative quotes from the transcript (with attribution if possible).
+    def _summarize_chunks(self, chunks: List[str]) -> List[str]:
+        """
+        Summarize chunks in parallel (map step)
+        Args:
+            chunks: Consecutive parts of the transcript or of earlier notes
+        Returns:
+            Notes for each chunk, in original order
+        """
+        total = len(chunks)
+        notes = [None] * total
+        max_workers = max(1, min(self.max_concurrent_summaries, total))
+        self.logger.info(f"Summarizing {total} chunks with up to {max_workers} in flight")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._create_summary_completion,
+                    f"{self.CHUNK_SUMMARY_PROMPT.format(part=i + 1, total=total)}\n\n{chunk}",
+                    self.chunk_summary_max_tokens
+                ): i
+                for i, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                notes[futures[future]] = future.result()
+        
+        return notes
 
-Format your response with clear headings for each section.
-"""
+    def generate_summary(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_update: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> str:
+        """
+        Generate a summary of the given text using OpenAI's API.
+        
+        If on_update is given, the final completion is streamed and on_update
+        receives the parsed summary so far (same structure as
+        parse_summary_response) each time an overview paragraph, key point,
+        action item or quote is completed.
+        """
+        self.logger.info(f"Generating summary for text of length: {len(text)}")
+        
         if prompt:
             instruction = prompt
         else:
-            instruction = base_prompt
-            
+            instruction = self.SUMMARY_PROMPT
+        
+        cache_key = self.summary_cache.compute_key(text, instruction, self.summary_model, self.summary_temperature)
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            if on_update:
+                on_update(self.parse_summary_response(cached))
+            return cached
+        
+        summary = self._generate_summary_uncached(text, instruction, on_update)
+        self.summary_cache.put(cache_key, summary)
+        return summary
+
+    def _generate_summary_uncached(self, text: str, instruction: str, on_update: Optional[Callable[[Dict[str, Any]], Any]] = None) -> str:
+        """Summarize text in one request, or with map-reduce when it is too long"""
+        # Only the request that produces the final summary is streamed
+        complete = (
+            self._create_summary_completion if on_update is None
+            else lambda content, max_tokens: self._stream_summary_completion(content, max_tokens, on_update)
+        )
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Using more advanced model for better summarization
-                messages=[
-                    {"role": "system", "content": "You are an expert summarizer that extracts key information from transcripts and produces clear, structured summaries."},
-                    {"role": "user", "content": f"{instruction}\n\n{text}"}
-                ],
-                temperature=0.3,  # Lower temperature for more focused output
-                max_tokens=1000   # Increased token limit for more comprehensive summaries
-            )
+            if self._count_tokens(text) <= self.summary_chunk_tokens:
+                return complete(f"{instruction}\n\n{text}", self.summary_max_tokens)
+            
+            # Map: summarize transcript chunks in parallel
+            notes = self._summarize_chunks(self._chunk_transcript(text, self.summary_chunk_tokens))
             
-            # Access the message content using the current response structure
-            summary = response.choices[0].message.content
-            return summary
+            # Condense the notes again if they still don't fit in a single request
+            combined = "\n\n".join(notes)
+            rounds = 0
+            previous_count = None
+            while self._should_condense(notes, combined, rounds, previous_count):
+                previous_count = len(notes)
+                notes = self._summarize_chunks(self._chunk_transcript(combined, self.summary_chunk_tokens))
+                combined = "\n\n".join(notes)
+                rounds += 1
+            
+            # Reduce: merge the notes into the standard summary structure
+            self.logger.info(f"Merging notes from {len(notes)} chunks into final summary")
+            return complete(
+                f"{instruction}\n\n{self.MERGE_NOTES_PREAMBLE}\n\n{combined}",
+                self.summary_max_tokens
+            )
         except Exception as e:
             self.logger.error(f"Error generating summary: {e}")
             raise
@@ -362,58 +903,298 @@ Format your response with clear headings for each section.
         """
         Parse the summary response into structured data
         """
-        # Enhanced parsing implementation for the new structured format
-        result = {
-            "summary": "",
-            "key_points": [],
-            "action_items": [],
-            "notable_quotes": []
-        }
+        parser = SummaryParser()
+        parser.feed(summary_text)
+        parser.close()
+        return parser.result
+
+
+class AsyncOpenAIService(OpenAIService):
+    """
+    Async variant of OpenAIService built on the process-wide AsyncOpenAI client.
+
+    API calls are awaited on the event loop instead of blocking a worker thread;
+    FFmpeg, hashing and other blocking file work is pushed to threads.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.async_client = get_async_openai_client()
+
+    async def transcribe_audio(self, audio_file_path: str, progress: Optional[Any] = None) -> Dict[str, Any]:
+        """Transcribe audio file, reusing a cached result for identical media."""
+        cache_key = None
+        try:
+            # Hashing reads the whole file, so skip it when there is no cache to look in
+            if self.transcription_cache.enabled:
+                cache_key = await asyncio.to_thread(self.transcription_cache.compute_key, audio_file_path, self.transcription_model)
+                cached = await asyncio.to_thread(self.transcription_cache.get, cache_key)
+                if cached is not None:
+                    await asyncio.to_thread(self._report_cached, progress, cached)
+                    return cached
+        except OSError as e:
+            self.logger.warning(f"Transcription cache lookup failed: {e}")
         
-        # Split by headers (both uppercase and regular case)
-        current_section = None
-        lines = summary_text.split("\n")
+        # Check if format is supported before doing any work on the file
+        if not self._is_audio_format_supported(audio_file_path):
+            error_msg = f"Unsupported file format: {Path(audio_file_path).suffix}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        started_at = time.monotonic()
+        upload_path = await asyncio.to_thread(self._normalize_audio_file, audio_file_path)
+        try:
+            result = await self._transcribe_uncached_async(upload_path, progress)
+        finally:
+            if upload_path != audio_file_path and os.path.exists(upload_path):
+                os.remove(upload_path)
+        
+        # Don't cache transcripts that contain placeholders for failed segments
+        if cache_key and self._is_complete_transcription(result["text"]):
+            await asyncio.to_thread(self.transcription_cache.put, cache_key, result, time.monotonic() - started_at)
+        return result
+
+    async def _transcribe_uncached_async(self, audio_file_path: str, progress: Optional[Any] = None) -> Dict[str, Any]:
+        """Transcribe audio file using OpenAI's API."""
+        self.logger.info(f"Transcribing audio file: {audio_file_path}")
         
-        for line in lines:
-            line = line.strip()
+        file_size = self._get_file_size(audio_file_path)
+        self.logger.info(f"Audio file size: {file_size / (1024 * 1024):.2f} MB")
+        
+        # First attempt: Try transcribing the entire file if it's within or close to the size limit
+        if file_size <= self.MAX_FILE_SIZE * 1.1:  # Allow 10% margin
+            try:
+                self.logger.info("Attempting to transcribe the entire file")
+                with open(audio_file_path, "rb") as audio_file:
+                    response = await self.transcription_backend.transcribe_async(audio_file)
+                
+                text, segments = response["text"], response["segments"]
+                if progress:
+                    await asyncio.to_thread(progress.start, [(0.0, None)])
+                    await asyncio.to_thread(progress.segment_completed, 0, 0.0, None, text, segments)
+                return {"text": text, "segments": segments}
+            except APIStatusError as e:
+                # If the file is too large, we'll get a 413 error
+                self.logger.warning(f"Failed to transcribe entire file: {e}")
+            except Exception as e:
+                self.logger.error(f"Unexpected error transcribing audio: {e}")
+                raise
+        
+        self.logger.info("File is too large for OpenAI API, using FFmpeg to split into chunks")
+        
+        try:
+            audio_duration = await asyncio.to_thread(self._get_audio_duration, audio_file_path)
+            self.logger.info(f"Audio duration: {audio_duration:.2f} seconds")
+            
+            plan = await asyncio.to_thread(self._plan_audio_segments, audio_file_path, audio_duration)
+            total_segments = len(plan)
+            results = await asyncio.to_thread(self._load_checkpoints, progress, plan)
+            pending = [i for i in range(total_segments) if results[i] is None]
+            
+            # Bound the number of segments encoded/uploaded at once
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrent_segments))
+            self.logger.info(f"Transcribing {len(pending)} of {total_segments} segments with up to {self.max_concurrent_segments} in flight")
+            
+            async def run(index: int, time_map: TimeMap) -> Tuple[str, List[Any]]:
+                async with semaphore:
+                    result = await self._extract_and_transcribe_segment_async(audio_file_path, index, total_segments, time_map)
+                if progress:
+                    await asyncio.to_thread(self._report_segment, progress, index, time_map, result)
+                return result
+            
+            transcribed = await asyncio.gather(*(run(i, plan[i]) for i in pending))
+            for index, result in zip(pending, transcribed):
+                results[index] = result
+            return self._combine_segment_results(results)
             
-            # Skip empty lines
-            if not line:
+        except Exception as e:
+            self.logger.error(f"Error processing file with FFmpeg: {e}")
+            raise ValueError(f"Failed to process large file: {str(e)}")
+
+    async def _extract_and_transcribe_segment_async(self, file_path: str, index: int, total_segments: int, time_map: TimeMap) -> Tuple[str, List[Any]]:
+        """Encode one planned segment into memory and transcribe it"""
+        try:
+            segment_file = await asyncio.to_thread(self._extract_segment, file_path, time_map.ranges)
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Failed to extract segment {index + 1}: {e.stderr}")
+            return f"[Error transcribing segment {index + 1} at {self._format_timestamp(time_map.original_start)}]", []
+        
+        with segment_file:
+            return await self._transcribe_segment_async(segment_file, index, total_segments, time_map)
+
+    async def _transcribe_segment_async(self, segment_file: IO[bytes], index: int, total_segments: int, time_map: TimeMap, depth: int = 0) -> Tuple[str, List[Any]]:
+        """Transcribe a single in-memory segment, re-splitting it if it is too large"""
+        segment_size = self._buffer_size(segment_file)
+        segment_number = index + 1
+        start_time_formatted = self._format_timestamp(time_map.original_start)
+        
+        self.logger.info(f"Transcribing segment {segment_number}/{total_segments} ({segment_size / (1024 * 1024):.2f} MB)")
+        
+        # Re-split segments that are still too large instead of dropping them
+        if segment_size > self.MAX_FILE_SIZE:
+            if depth < self.max_resplit_depth and time_map.duration > self.min_segment_seconds / 4:
+                self.logger.warning(f"Segment {segment_number} is still too large ({segment_size / (1024 * 1024):.2f} MB), re-splitting")
+                return await self._resplit_segment_async(segment_file, index, total_segments, time_map, depth)
+            self.logger.warning(f"Segment {segment_number} is still too large ({segment_size / (1024 * 1024):.2f} MB), skipping")
+            return f"[Segment {segment_number} at {start_time_formatted} skipped due to size limitations]", []
+        
+        try:
+            response = await self.transcription_backend.transcribe_async(segment_file, f"segment_{segment_number:03d}.webm")
+            return response["text"].strip(), self._map_segment_times(response["segments"], time_map)
+            
+        except Exception as e:
+            self.logger.error(f"Error transcribing segment {segment_number}: {e}")
+            return f"[Error transcribing segment {segment_number} at {start_time_formatted}]", []
+
+    async def _resplit_segment_async(self, segment_file: IO[bytes], index: int, total_segments: int, time_map: TimeMap, depth: int) -> Tuple[str, List[Any]]:
+        """Transcode an oversized segment into smaller parts and transcribe each of them"""
+        segment_size = self._buffer_size(segment_file)
+        parts = max(2, math.ceil(segment_size / self.segment_target_bytes))
+        part_length = time_map.duration / parts
+        
+        texts = []
+        all_segments = SegmentStore()
+        for part in range(parts):
+            start, end = part * part_length, (part + 1) * part_length
+            try:
+                part_file = await asyncio.to_thread(self._extract_segment, segment_file, [(start, end)])
+            except subprocess.CalledProcessError as e:
+                self.logger.error(f"Failed to re-split segment {index + 1}: {e.stderr}")
+                texts.append(f"[Error transcribing segment {index + 1} at {self._format_timestamp(time_map.to_original(start))}]")
                 continue
+            
+            with part_file:
+                text, segments = await self._transcribe_segment_async(part_file, index, total_segments, time_map.slice(start, end), depth + 1)
+            texts.append(text)
+            all_segments.extend(segments)
+        
+        return " ".join(text for text in texts if text), all_segments
+
+    @retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=2, max=10))
+    async def _create_summary_completion_async(self, content: str, max_tokens: int) -> str:
+        """Run a single summarization chat completion"""
+        await self.rate_limits.chat.acquire_async(self._count_tokens(content) + max_tokens)
+        try:
+            raw_response = await self.async_client.chat.completions.with_raw_response.create(
+                model=self.summary_model,
+                messages=self._summary_messages(content),
+                temperature=self.summary_temperature,
+                max_tokens=max_tokens
+            )
+        except RateLimitError as e:
+            self.rate_limits.chat.throttled(e.response.headers)
+            raise
+        self.rate_limits.chat.update_from_headers(raw_response.headers)
+        return raw_response.parse().choices[0].message.content
+
+    async def _summarize_chunks_async(self, chunks: List[str]) -> List[str]:
+        """Summarize chunks concurrently (map step), keeping their original order"""
+        total = len(chunks)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_summaries))
+        self.logger.info(f"Summarizing {total} chunks with up to {self.max_concurrent_summaries} in flight")
+        
+        async def run(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self._create_summary_completion_async(
+                    f"{self.CHUNK_SUMMARY_PROMPT.format(part=index + 1, total=total)}\n\n{chunk}",
+                    self.chunk_summary_max_tokens
+                )
+        
+        return list(await asyncio.gather(*(run(i, chunk) for i, chunk in enumerate(chunks))))
+
+    async def generate_summary(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_update: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> str:
+        """
+        Generate a summary of the given text using OpenAI's API.
+        
+        on_update may be a regular function (run in a thread) or a coroutine
+        function; see OpenAIService.generate_summary.
+        """
+        self.logger.info(f"Generating summary for text of length: {len(text)}")
+        
+        instruction = prompt or self.SUMMARY_PROMPT
+        
+        cache_key = self.summary_cache.compute_key(text, instruction, self.summary_model, self.summary_temperature)
+        cached = await asyncio.to_thread(self.summary_cache.get, cache_key)
+        if cached is not None:
+            if on_update:
+                await self._publish_update(on_update, self.parse_summary_response(cached))
+            return cached
+        
+        summary = await self._generate_summary_uncached_async(text, instruction, on_update)
+        await asyncio.to_thread(self.summary_cache.put, cache_key, summary)
+        return summary
+
+    async def _publish_update(self, on_update: Callable[[Dict[str, Any]], Any], parsed: Dict[str, Any]) -> None:
+        if inspect.iscoroutinefunction(on_update):
+            await on_update(parsed)
+        else:
+            await asyncio.to_thread(on_update, parsed)
+
+    async def _stream_summary_completion_async(self, content: str, max_tokens: int, on_update: Callable[[Dict[str, Any]], Any]) -> str:
+        """Run a summarization chat completion with stream=True, publishing parsed sections as they arrive"""
+        async for attempt in AsyncRetrying(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=2, max=10), reraise=True):
+            with attempt:
+                await self.rate_limits.chat.acquire_async(self._count_tokens(content) + max_tokens)
+                try:
+                    raw_response = await self.async_client.chat.completions.with_raw_response.create(
+                        model=self.summary_model,
+                        messages=self._summary_messages(content),
+                        temperature=self.summary_temperature,
+                        max_tokens=max_tokens,
+                        stream=True
+                    )
+                except RateLimitError as e:
+                    self.rate_limits.chat.throttled(e.response.headers)
+                    raise
+                self.rate_limits.chat.update_from_headers(raw_response.headers)
                 
-            # Check for section headers
-            lowered = line.lower()
-            if "overview" in lowered or "summary" in lowered:
-                current_section = "summary"
-                continue
-            elif "key points" in lowered:
-                current_section = "key_points"
-                continue
-            elif "action items" in lowered:
-                current_section = "action_items"
-                continue
-            elif "notable quotes" in lowered:
-                current_section = "notable_quotes"
-                continue
+                # A retry starts over with a fresh parser; each update is a full snapshot
+                parser = SummaryParser()
+                parts = []
+                async for chunk in raw_response.parse():
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if parser.feed(delta):
+                        await self._publish_update(on_update, parser.snapshot())
+                if parser.close():
+                    await self._publish_update(on_update, parser.snapshot())
+                return "".join(parts)
+
+    async def _generate_summary_uncached_async(self, text: str, instruction: str, on_update: Optional[Callable[[Dict[str, Any]], Any]] = None) -> str:
+        """Summarize text in one request, or with map-reduce when it is too long"""
+        # Only the request that produces the final summary is streamed
+        async def complete(content: str, max_tokens: int) -> str:
+            if on_update is None:
+                return await self._create_summary_completion_async(content, max_tokens)
+            return await self._stream_summary_completion_async(content, max_tokens, on_update)
+        
+        try:
+            if self._count_tokens(text) <= self.summary_chunk_tokens:
+                return await complete(f"{instruction}\n\n{text}", self.summary_max_tokens)
+            
+            notes = await self._summarize_chunks_async(self._chunk_transcript(text, self.summary_chunk_tokens))
+            
+            combined = "\n\n".join(notes)
+            rounds = 0
+            previous_count = None
+            while self._should_condense(notes, combined, rounds, previous_count):
+                previous_count = len(notes)
+                notes = await self._summarize_chunks_async(self._chunk_transcript(combined, self.summary_chunk_tokens))
+                combined = "\n\n".join(notes)
+                rounds += 1
             
-            # Process content based on current section
-            if current_section == "summary":
-                if result["summary"]:
-                    result["summary"] += " " + line
-                else:
-                    result["summary"] = line
-            elif current_section in ["key_points", "action_items", "notable_quotes"]:
-                # Check if the line is a bullet point
-                if line.startswith("- ") or line.startswith("• ") or line.startswith("* "):
-                    clean_line = line.replace("- ", "").replace("• ", "").replace("* ", "")
-                    result[current_section].append(clean_line)
-                # Handle numbered lists
-                elif line[0].isdigit() and len(line) > 2 and line[1:3] in [". ", ") ", "- "]:
-                    clean_line = line[3:].strip()
-                    result[current_section].append(clean_line)
-                # If not a bullet but we're in a bullet point section, it might be a continuation
-                elif current_section in ["key_points", "action_items", "notable_quotes"] and result[current_section]:
-                    # Append to the last bullet point as a continuation
-                    result[current_section][-1] += " " + line
-        
-        return result 
\ No newline at end of file
+            self.logger.info(f"Merging notes from {len(notes)} chunks into final summary")
+            return await complete(
+                f"{instruction}\n\n{self.MERGE_NOTES_PREAMBLE}\n\n{combined}",
+                self.summary_max_tokens
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating summary: {e}")
+            raise
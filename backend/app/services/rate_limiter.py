@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator, Mapping
+
+# File locking is only available on POSIX; other platforms use the in-process store
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+def parse_reset_duration(value: Optional[str]) -> float:
+    """Parse an x-ratelimit-reset-* header value such as "1s", "6m0s" or "20ms" into seconds"""
+    if not value:
+        return 0.0
+    seconds = 0.0
+    for amount, unit in _DURATION_RE.findall(value):
+        seconds += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return seconds
+
+class MemoryRateLimitStore:
+    """Bucket state shared by all jobs in this process"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self, key: str) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            yield self._states.setdefault(key, {})
+
+class FileRateLimitStore:
+    """
+    Bucket state shared by every worker process on the host (or on a shared volume).
+
+    Each update reads and rewrites a small JSON file while holding an
+    exclusive lock on it.
+    """
+
+    name = "file"
+
+    def __init__(self, state_dir: str):
+        self.state_dir = state_dir
+        self._lock = threading.Lock()
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    @contextmanager
+    def transaction(self, key: str) -> Iterator[Dict[str, Any]]:
+        path = os.path.join(self.state_dir, f"{key}.json")
+        with self._lock, open(path, "a+", encoding="utf-8") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                try:
+                    state = json.loads(state_file.read() or "{}")
+                except ValueError:
+                    state = {}
+                yield state
+                state_file.seek(0)
+                state_file.truncate()
+                json.dump(state, state_file)
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+class TokenBucket:
+    """
+    Token bucket whose state lives in a shared store.
+
+    Callers reserve capacity up front: the bucket may go negative, and each
+    caller is told how long to wait for its reservation to be covered. Waiters
+    are therefore served in the order they arrived, each at its own time,
+    instead of all retrying at once.
+    """
+
+    def __init__(self, store: Any, key: str, per_minute: float):
+        self.store = store
+        self.key = key
+        self.default_per_minute = per_minute
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        capacity = state.setdefault("capacity", self.default_per_minute)
+        level = state.get("level", capacity)
+        updated_at = state.get("updated_at", now)
+        state["level"] = min(capacity, level + (now - updated_at) * capacity / 60.0)
+        state["updated_at"] = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` from the bucket and return the seconds to wait before using it"""
+        now = time.time()
+        with self.store.transaction(self.key) as state:
+            self._refill(state, now)
+            capacity = state["capacity"]
+            state["level"] -= min(amount, capacity)
+            wait = max(0.0, state.get("paused_until", 0.0) - now)
+            if state["level"] < 0:
+                wait = max(wait, -state["level"] * 60.0 / capacity)
+            return wait
+
+    def update(self, limit: Optional[float], remaining: Optional[float], reset_seconds: float) -> None:
+        """Adopt the limit and remaining budget reported by the API"""
+        now = time.time()
+        with self.store.transaction(self.key) as state:
+            self._refill(state, now)
+            if limit:
+                state["capacity"] = limit
+                state["level"] = min(state["level"], limit)
+            if remaining is not None:
+                state["level"] = min(state["level"], remaining)
+                if remaining <= 0 and reset_seconds:
+                    state["paused_until"] = max(state.get("paused_until", 0.0), now + reset_seconds)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for `seconds`, e.g. after a 429"""
+        with self.store.transaction(self.key) as state:
+            state["paused_until"] = max(state.get("paused_until", 0.0), time.time() + seconds)
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget for one group of endpoints.
+
+    Limits start from configuration and are then adjusted from the
+    x-ratelimit-* headers of each response.
+    """
+
+    def __init__(self, store: Any, name: str, requests_per_minute: float, tokens_per_minute: Optional[float] = None):
+        self.name = name
+        self.requests = TokenBucket(store, f"{name}-requests", requests_per_minute)
+        self.tokens = TokenBucket(store, f"{name}-tokens", tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._throttled = 0
+
+    def _reserve(self, tokens: int) -> float:
+        wait = self.requests.reserve(1)
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            with self._lock:
+                self._waits += 1
+                self._wait_seconds += wait
+            logger.info(f"Rate limiter ({self.name}): waiting {wait:.2f}s")
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a request using `tokens` tokens fits in the budget"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """Wait on the event loop until a request using `tokens` tokens fits in the budget"""
+        wait = await asyncio.to_thread(self._reserve, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Adapt the buckets to the x-ratelimit-* headers of a response"""
+        try:
+            self.requests.update(
+                self._header_number(headers, "x-ratelimit-limit-requests"),
+                self._header_number(headers, "x-ratelimit-remaining-requests"),
+                parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            )
+            if self.tokens:
+                self.tokens.update(
+                    self._header_number(headers, "x-ratelimit-limit-tokens"),
+                    self._header_number(headers, "x-ratelimit-remaining-tokens"),
+                    parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+                )
+        except Exception as e:
+            logger.warning(f"Failed to update rate limits from headers: {e}")
+
+    def throttled(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Record a 429 and pause callers until the API says the budget is back"""
+        headers = headers or {}
+        retry_after = self._header_number(headers, "retry-after") or 0.0
+        retry_after = max(
+            retry_after,
+            parse_reset_duration(headers.get("x-ratelimit-reset-requests")) if self._header_number(headers, "x-ratelimit-remaining-requests") == 0 else 0.0,
+            parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) if self._header_number(headers, "x-ratelimit-remaining-tokens") == 0 else 0.0,
+        )
+        with self._lock:
+            self._throttled += 1
+        self.requests.pause(retry_after or 1.0)
+        logger.warning(f"Rate limiter ({self.name}): throttled by the API, pausing {retry_after or 1.0:.2f}s")
+
+    def _header_number(self, headers: Mapping[str, str], name: str) -> Optional[float]:
+        value = headers.get(name)
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 2),
+                "throttled": self._throttled
+            }
+
+class OpenAIRateLimits:
+    """Separate budgets for Whisper transcription and chat completions"""
+
+    def __init__(self, store: Optional[Any] = None):
+        """Initialize limiters using environment variables"""
+        self.store = store if store is not None else self._store_from_env()
+        self.whisper = RateLimiter(
+            self.store,
+            "whisper",
+            float(os.getenv("OPENAI_WHISPER_RPM", "50"))
+        )
+        self.chat = RateLimiter(
+            self.store,
+            "chat",
+            float(os.getenv("OPENAI_CHAT_RPM", "500")),
+            float(os.getenv("OPENAI_CHAT_TPM", "30000"))
+        )
+
+    def _store_from_env(self) -> Any:
+        backend = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+        if backend == "file":
+            if FCNTL_AVAILABLE:
+                state_dir = os.getenv(
+                    "RATE_LIMIT_STATE_DIR",
+                    os.path.join(tempfile.gettempdir(), "scribeit-rate-limits")
+                )
+                return FileRateLimitStore(state_dir)
+            logger.warning("File rate limit store needs fcntl, using the in-process store")
+        elif backend != "memory":
+            logger.warning(f"Unknown rate limit backend: {backend}")
+        return MemoryRateLimitStore()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.store.name,
+            "whisper": self.whisper.stats(),
+            "chat": self.chat.stats()
+        }
+
+# Shared instance so all jobs in the process draw from the same budget
+openai_rate_limits = OpenAIRateLimits()
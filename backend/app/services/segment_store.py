@@ -0,0 +1,194 @@
+import sys
+import struct
+import bisect
+from array import array
+from typing import Dict, Any, List, Tuple, Iterable, Iterator, Callable, Optional
+
+# Blob layout: magic, segment count, UTF-8 text length, then the start, end
+# and offset arrays (little-endian) followed by the text
+_MAGIC = b"SEG1"
+_HEADER = struct.Struct("<4sII")
+
+class SegmentStore:
+    """
+    Timestamped transcript segments in columnar form.
+
+    Start and end times are kept in parallel float arrays, and segment texts
+    are concatenated into one string with an array of character offsets, so
+    a long transcript costs a few bytes per segment instead of one SDK
+    object each. Segments are expected in time order; lookups between time
+    and text position are binary searches.
+    """
+
+    def __init__(self):
+        self.starts = array("d")
+        self.ends = array("d")
+        # offsets[i]:offsets[i + 1] is the text of segment i
+        self.offsets = array("q", [0])
+        self._parts = []
+        self._text = ""
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Any]) -> "SegmentStore":
+        """Build a store from SDK segment objects, dicts or (start, end, text) tuples"""
+        store = cls()
+        store.extend(segments)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[float, float, str]]:
+        text = self.text
+        for i in range(len(self)):
+            yield self.starts[i], self.ends[i], text[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def text(self) -> str:
+        """All segment texts, back to back"""
+        if self._parts:
+            self._text += "".join(self._parts)
+            self._parts = []
+        return self._text
+
+    def append(self, start: float, end: float, text: str) -> None:
+        self.starts.append(float(start or 0.0))
+        self.ends.append(float(end if end is not None else start or 0.0))
+        self._parts.append(text or "")
+        self.offsets.append(self.offsets[-1] + len(text or ""))
+
+    def extend(self, segments: Iterable[Any]) -> None:
+        """Append segments from another store, SDK objects, dicts or tuples"""
+        if isinstance(segments, SegmentStore):
+            base = self.offsets[-1]
+            self.starts.extend(segments.starts)
+            self.ends.extend(segments.ends)
+            self.offsets.extend(base + offset for offset in segments.offsets[1:])
+            self._parts.append(segments.text)
+            return
+        for segment in segments:
+            if isinstance(segment, dict):
+                self.append(segment.get("start"), segment.get("end"), segment.get("text", ""))
+            elif isinstance(segment, (tuple, list)):
+                self.append(*segment)
+            else:
+                self.append(getattr(segment, "start", None), getattr(segment, "end", None), getattr(segment, "text", ""))
+
+    def mapped(self, convert: Callable[[float], float]) -> "SegmentStore":
+        """Copy of the store with every start/end passed through `convert`"""
+        store = SegmentStore()
+        store.starts = array("d", (convert(value) for value in self.starts))
+        store.ends = array("d", (convert(value) for value in self.ends))
+        store.offsets = array("q", self.offsets)
+        store._text = self.text
+        return store
+
+    def span_for_time(self, start: float, end: float) -> Tuple[int, int]:
+        """
+        Character range of the text spoken between `start` and `end` seconds
+
+        Returns:
+            (char_start, char_end) into `text`; empty if no segment overlaps
+        """
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        if first >= last:
+            position = self.offsets[min(first, len(self))]
+            return position, position
+        return self.offsets[first], self.offsets[last]
+
+    def text_for_time(self, start: float, end: float) -> str:
+        """Text of the segments overlapping `start`..`end` seconds"""
+        char_start, char_end = self.span_for_time(start, end)
+        return self.text[char_start:char_end].strip()
+
+    def time_at_offset(self, offset: int) -> Optional[float]:
+        """
+        Media time of a character offset into `text`, interpolated within its segment
+
+        Returns:
+            Seconds from the start of the media, or None if the store is empty
+        """
+        if not len(self):
+            return None
+        index = min(max(bisect.bisect_right(self.offsets, offset) - 1, 0), len(self) - 1)
+        segment_start, segment_end = self.offsets[index], self.offsets[index + 1]
+        fraction = (offset - segment_start) / (segment_end - segment_start) if segment_end > segment_start else 0.0
+        fraction = min(max(fraction, 0.0), 1.0)
+        return self.starts[index] + (self.ends[index] - self.starts[index]) * fraction
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [{"start": start, "end": end, "text": text} for start, end, text in self]
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary blob"""
+        # Offsets are character positions, so the text is decoded as a whole on load
+        encoded = self.text.encode("utf-8")
+        arrays = [array("d", self.starts), array("d", self.ends), array("q", self.offsets)]
+        if sys.byteorder == "big":
+            for values in arrays:
+                values.byteswap()
+        return _HEADER.pack(_MAGIC, len(self), len(encoded)) + b"".join(values.tobytes() for values in arrays) + encoded
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "SegmentStore":
+        """Load a store written by to_bytes"""
+        magic, count, text_length = _HEADER.unpack_from(blob)
+        if magic != _MAGIC:
+            raise ValueError("Not a segment store blob")
+        store = cls()
+        position = _HEADER.size
+        for name, typecode, length in (("starts", "d", count), ("ends", "d", count), ("offsets", "q", count + 1)):
+            values = array(typecode)
+            values.frombytes(blob[position:position + length * values.itemsize])
+            if sys.byteorder == "big":
+                values.byteswap()
+            setattr(store, name, values)
+            position += length * values.itemsize
+        store._text = blob[position:position + text_length].decode("utf-8")
+        return store
+
+class TranscriptAlignment:
+    """
+    Maps character offsets between the segment text and the formatted
+    transcript stored on the summary.
+
+    The formatter only changes whitespace, punctuation and letter case, so
+    the letters and digits of the segment text appear in the transcript in
+    the same order. The transcript may also hold text with no segments (the
+    placeholder for a segment that failed), so each character is matched
+    with the next equal one within a short window, and characters with no
+    match nearby are skipped instead of pulling the alignment ahead.
+    """
+
+    # How far ahead in the transcript a character is looked for
+    MAX_SKIP = 256
+
+    def __init__(self, segment_text: str, transcript: str):
+        self.segment_length = len(segment_text)
+        self.transcript_length = len(transcript)
+        source = [(index, char.lower()[:1]) for index, char in enumerate(segment_text) if char.isalnum()]
+        target_positions = [index for index, char in enumerate(transcript) if char.isalnum()]
+        target = "".join(transcript[index].lower()[:1] for index in target_positions)
+
+        # Parallel arrays of aligned positions, increasing in both texts
+        self.segment_positions = array("q")
+        self.transcript_positions = array("q")
+        cursor = 0
+        for position, char in source:
+            match = target.find(char, cursor, cursor + self.MAX_SKIP)
+            if match < 0:
+                continue
+            self.segment_positions.append(position)
+            self.transcript_positions.append(target_positions[match])
+            cursor = match + 1
+
+    def to_transcript(self, offset: int) -> int:
+        """Transcript offset of the first aligned character at or after a segment text offset"""
+        index = bisect.bisect_left(self.segment_positions, offset)
+        return self.transcript_positions[index] if index < len(self.transcript_positions) else self.transcript_length
+
+    def to_segments(self, offset: int) -> int:
+        """Segment text offset of the first aligned character at or after a transcript offset"""
+        index = bisect.bisect_left(self.transcript_positions, offset)
+        return self.segment_positions[index] if index < len(self.segment_positions) else self.segment_length
@@ -0,0 +1,161 @@
+import re
+import bisect
+from typing import List, Tuple
+
+Range = Tuple[float, float]
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+class TimeMap:
+    """
+    Maps time in a trimmed segment back to time in the original media.
+
+    A segment is built from one or more kept ranges of the original file
+    played back to back; silent gaps between them are removed.
+    """
+
+    def __init__(self, ranges: List[Range]):
+        self.ranges = list(ranges)
+        self._trimmed_starts = []
+        offset = 0.0
+        for start, end in self.ranges:
+            self._trimmed_starts.append(offset)
+            offset += end - start
+        self.duration = offset
+
+    @classmethod
+    def offset(cls, start: float, length: float) -> "TimeMap":
+        """Identity mapping for an untrimmed segment starting at `start`"""
+        return cls([(start, start + length)])
+
+    @property
+    def original_start(self) -> float:
+        return self.ranges[0][0] if self.ranges else 0.0
+
+    @property
+    def original_end(self) -> float:
+        return self.ranges[-1][1] if self.ranges else 0.0
+
+    def slice(self, start: float, end: float) -> "TimeMap":
+        """Mapping for the part of this segment between trimmed times `start` and `end`"""
+        ranges = []
+        for (range_start, range_end), trimmed_start in zip(self.ranges, self._trimmed_starts):
+            trimmed_end = trimmed_start + (range_end - range_start)
+            overlap_start, overlap_end = max(start, trimmed_start), min(end, trimmed_end)
+            if overlap_end > overlap_start:
+                ranges.append((
+                    range_start + (overlap_start - trimmed_start),
+                    range_start + (overlap_end - trimmed_start)
+                ))
+        return TimeMap(ranges)
+
+    def to_original(self, seconds: float) -> float:
+        """Convert a time within the trimmed segment to original media time"""
+        if not self.ranges:
+            return seconds
+        index = max(0, bisect.bisect_right(self._trimmed_starts, seconds) - 1)
+        return self.ranges[index][0] + (seconds - self._trimmed_starts[index])
+
+def parse_silencedetect_output(output: str, duration: float) -> List[Range]:
+    """
+    Parse silence intervals from FFmpeg `silencedetect` log output
+
+    Args:
+        output: stderr of an FFmpeg run with the silencedetect filter
+        duration: Media duration, used to close a trailing silence
+
+    Returns:
+        Sorted list of (start, end) silence intervals in seconds
+    """
+    silences = []
+    current_start = None
+    for line in output.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            current_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and current_start is not None:
+            silences.append((current_start, float(end_match.group(1))))
+            current_start = None
+
+    # Silence running to the end of the file has no silence_end line
+    if current_start is not None and duration > current_start:
+        silences.append((current_start, duration))
+
+    return silences
+
+def plan_segments(
+    duration: float,
+    silences: List[Range],
+    segment_length: float,
+    trim_seconds: float = 2.0,
+    padding: float = 0.25
+) -> List[List[Range]]:
+    """
+    Plan segment boundaries that fall inside pauses and drop long silences
+
+    Args:
+        duration: Media duration in seconds
+        silences: Detected silence intervals
+        segment_length: Maximum amount of kept audio per segment, in seconds
+        trim_seconds: Silences at least this long are removed from the upload
+        padding: Audio kept on each side of a removed silence
+
+    Returns:
+        One list of kept (start, end) ranges of the original media per segment
+    """
+    # Audio to keep: everything except the inside of long silences
+    kept = []
+    position = 0.0
+    for start, end in silences:
+        if end - start < trim_seconds:
+            continue
+        cut_start, cut_end = start + padding, end - padding
+        if cut_start > position:
+            kept.append((position, cut_start))
+        position = max(position, cut_end)
+    if duration > position:
+        kept.append((position, duration))
+
+    # Short pauses are the preferred places to cut inside a kept range
+    pauses = sorted((start + end) / 2 for start, end in silences if end - start < trim_seconds)
+
+    segments = []
+    current = []
+    used = 0.0
+
+    for span_start, span_end in kept:
+        start = span_start
+        while span_end - start > 0.05:
+            remaining = segment_length - used
+            if span_end - start <= remaining:
+                current.append((start, span_end))
+                used += span_end - start
+                break
+
+            # Latest pause that still fits in this segment
+            limit = start + remaining
+            index = bisect.bisect_right(pauses, limit) - 1
+            cut = pauses[index] if index >= 0 and pauses[index] > start else None
+
+            if cut is None or used + (cut - start) < segment_length / 2:
+                if current and used >= segment_length / 2:
+                    # Segment is full enough - cut at the removed silence before this span
+                    segments.append(current)
+                    current, used = [], 0.0
+                    continue
+                if cut is None:
+                    # No pause available, fall back to a hard cut
+                    cut = limit
+
+            current.append((start, cut))
+            segments.append(current)
+            current, used = [], 0.0
+            start = cut
+
+    if current:
+        segments.append(current)
+
+    return segments
@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MemorySummaryCacheBackend:
+    """In-process LRU store with a per-entry TTL"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            summary, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._entries[key] = (summary, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class DiskSummaryCacheBackend:
+    """
+    Store shared by all workers on the host (or on a shared volume).
+
+    Expiry uses the creation time stored in each entry; eviction removes the
+    least recently used files once the entry limit is exceeded.
+    """
+
+    name = "disk"
+
+    def __init__(self, cache_dir: str, max_entries: int, ttl_seconds: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("created_at", 0) + self.ttl_seconds < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        try:
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("summary")
+
+    def put(self, key: str, summary: str) -> None:
+        # Write to a temp file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as entry_file:
+                json.dump({"summary": summary, "created_at": time.time()}, entry_file)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            logger.warning(f"Failed to write summary cache entry: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond max_entries"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    continue
+
+            if len(entries) <= self.max_entries:
+                return
+
+            for _, path in sorted(entries)[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+
+class SummaryCache:
+    """
+    Cache of generated summaries keyed by transcript, prompt, model and temperature.
+
+    Lookups go through the configured backends in order (fast in-process tier
+    first); a hit in a slower tier is copied into the faster ones.
+    """
+
+    def __init__(self, backends: Optional[List[Any]] = None):
+        """Initialize cache using environment variables"""
+        self.enabled = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+        self.backends = backends if backends is not None else self._backends_from_env()
+        self._lock = threading.Lock()
+        self._misses = 0
+        self._hits = {backend.name: 0 for backend in self.backends}
+
+    def _backends_from_env(self) -> List[Any]:
+        ttl_seconds = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        max_entries = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1000"))
+        backends = []
+        for name in os.getenv("SUMMARY_CACHE_BACKENDS", "memory,disk").split(","):
+            name = name.strip().lower()
+            if name == "memory":
+                backends.append(MemorySummaryCacheBackend(max_entries, ttl_seconds))
+            elif name == "disk":
+                cache_dir = os.getenv(
+                    "SUMMARY_CACHE_DIR",
+                    os.path.join(tempfile.gettempdir(), "scribeit-summary-cache")
+                )
+                backends.append(DiskSummaryCacheBackend(cache_dir, max_entries, ttl_seconds))
+            elif name:
+                logger.warning(f"Unknown summary cache backend: {name}")
+        return backends
+
+    def compute_key(self, text: str, prompt: str, model: str, temperature: float) -> str:
+        """Hash the inputs that determine a summary"""
+        digest = hashlib.sha256()
+        for part in (model, repr(temperature), prompt, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached summary
+
+        Args:
+            key: Cache key from compute_key
+
+        Returns:
+            The raw summary text, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        for position, backend in enumerate(self.backends):
+            summary = backend.get(key)
+            if summary is None:
+                continue
+            # Promote to the faster tiers
+            for faster in self.backends[:position]:
+                faster.put(key, summary)
+            with self._lock:
+                self._hits[backend.name] += 1
+            logger.info(f"Summary cache hit ({backend.name}): {key[:12]}")
+            return summary
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, summary: str) -> None:
+        """Store a summary in every tier"""
+        if not self.enabled:
+            return
+        for backend in self.backends:
+            backend.put(key, summary)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            hits = sum(self._hits.values())
+            lookups = hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "backends": [backend.name for backend in self.backends],
+                "hits": hits,
+                "hits_by_backend": dict(self._hits),
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0
+            }
+
+# Shared instance so all services report into the same counters
+summary_cache = SummaryCache()
@@ -0,0 +1,102 @@
+import copy
+from typing import Dict, Any, List
+
+BULLET_SECTIONS = ["key_points", "action_items", "notable_quotes"]
+
+class SummaryParser:
+    """
+    Incremental parser for the structured summary format.
+
+    Text can be fed in arbitrary pieces (e.g. streamed completion deltas);
+    each complete line is parsed as soon as it arrives. Feeding the whole
+    response at once gives the same result as parsing it in pieces.
+    """
+
+    def __init__(self):
+        self.result = {
+            "summary": "",
+            "key_points": [],
+            "action_items": [],
+            "notable_quotes": []
+        }
+        self._current_section = None
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Parse the complete lines in `text` (plus anything buffered before it)
+
+        Returns:
+            One {"section", "index", "text"} update per changed value; index is
+            the position of the item in a bullet section (None for the summary)
+        """
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        updates = []
+        for line in lines:
+            update = self._parse_line(line)
+            if update:
+                updates.append(update)
+        return updates
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Parse the final line, which has no trailing newline"""
+        line, self._buffer = self._buffer, ""
+        update = self._parse_line(line)
+        return [update] if update else []
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the result parsed so far"""
+        return copy.deepcopy(self.result)
+
+    def _parse_line(self, line: str) -> Dict[str, Any]:
+        result = self.result
+        line = line.strip()
+
+        # Skip empty lines
+        if not line:
+            return None
+
+        # Check for section headers
+        lowered = line.lower()
+        if "overview" in lowered or "summary" in lowered:
+            self._current_section = "summary"
+            return None
+        elif "key points" in lowered:
+            self._current_section = "key_points"
+            return None
+        elif "action items" in lowered:
+            self._current_section = "action_items"
+            return None
+        elif "notable quotes" in lowered:
+            self._current_section = "notable_quotes"
+            return None
+
+        current_section = self._current_section
+
+        # Process content based on current section
+        if current_section == "summary":
+            if result["summary"]:
+                result["summary"] += " " + line
+            else:
+                result["summary"] = line
+            return {"section": "summary", "index": None, "text": result["summary"]}
+        elif current_section in BULLET_SECTIONS:
+            # Check if the line is a bullet point
+            if line.startswith("- ") or line.startswith("• ") or line.startswith("* "):
+                clean_line = line.replace("- ", "").replace("• ", "").replace("* ", "")
+                result[current_section].append(clean_line)
+            # Handle numbered lists
+            elif line[0].isdigit() and len(line) > 2 and line[1:3] in [". ", ") ", "- "]:
+                clean_line = line[3:].strip()
+                result[current_section].append(clean_line)
+            # If not a bullet but we're in a bullet point section, it might be a continuation
+            elif result[current_section]:
+                # Append to the last bullet point as a continuation
+                result[current_section][-1] += " " + line
+            else:
+                return None
+            items = result[current_section]
+            return {"section": current_section, "index": len(items) - 1, "text": items[-1]}
+
+        return None
@@ -0,0 +1,156 @@
+import re
+import string
+
+# Punctuation that needs repairing: doubled punctuation, or punctuation glued to the
+# next word. The pattern starts with a single character class, so the regex engine
+# skips ahead between candidates and well-formed text never reaches the loop.
+_REPAIR_RE = re.compile(r"([.,!?;:](?:[.,!?;:]+|(?=[\"')\]]*[A-Za-z]))[\"')\]]*)")
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+# A sentence end and the lowercase letter after it. Splitting on it puts every
+# such letter at the same stride in the pieces, so they can be capitalized
+# together instead of one callback per sentence.
+_SENTENCE_START_RE = re.compile(r"([.!?][\"')\]]*\s+)([a-z])")
+
+# URLs, e-mail addresses, bare domains and dotted abbreviations (e.g., U.S.), matched
+# from the start of a token. Their inner punctuation must not be split.
+_VERBATIM_TOKEN_RE = re.compile(
+    r"([\"'(\[]*(?:[A-Za-z]\.){2}"
+    r"|\S*?(?:(?i:https?://|www\.)|@|\.(?i:com|org|net|io|edu|gov|ai|dev|app|co)\b))?\S*"
+)
+
+# Words ending in a period that do not end a sentence, matched against the
+# end of the text before the period
+_ABBREVIATIONS = ("mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "approx")
+_ABBREVIATION_RE = re.compile(
+    r"(?<![^ \n])[\"'(\[]*(?:(?:[A-Za-z]\.)+[A-Za-z]|" + "|".join(_ABBREVIATIONS) + r")\Z",
+    re.IGNORECASE
+)
+
+# The last two characters before a period that may end an abbreviation, including
+# dotted ones, or a whole sentence shorter than that. Most sentence ends fail
+# this cheap test and never reach the regex.
+_ABBREVIATION_TAILS = frozenset(
+    [word[-2:] for word in _ABBREVIATIONS]
+    + [prefix + letter for letter in string.ascii_lowercase for prefix in ("", ".")]
+    + [""]
+)
+
+# Tokens are never searched for further than this many characters either side
+_MAX_TOKEN_LOOKBACK = 256
+
+# Longest word (including its period) treated as an abbreviation, e.g. "U.S.A." or "approx."
+_MAX_ABBREVIATION_LENGTH = 7
+
+def _token_start(text: str, position: int) -> int:
+    """Index of the first character of the whitespace-delimited token containing position"""
+    window_start = max(0, position - _MAX_TOKEN_LOOKBACK)
+    return max(
+        text.rfind(" ", window_start, position),
+        text.rfind("\n", window_start, position),
+        window_start - 1
+    ) + 1
+
+def _ends_with_abbreviation(text: str) -> bool:
+    """Check if a period after the text ends an abbreviation"""
+    # The period counts towards the length, except for a word that starts the text
+    start = len(text) - _MAX_ABBREVIATION_LENGTH + 1 if len(text) > _MAX_ABBREVIATION_LENGTH else 0
+    return _ABBREVIATION_RE.search(text, start) is not None
+
+def _normalize_punctuation_run(run: str) -> str:
+    """Collapse doubled punctuation from segment boundaries, keeping ellipses"""
+    if len(run) > 1 and run == run[0] * len(run):
+        if run[0] != "." or len(run) == 2:
+            return run[0]
+    return run
+
+def _normalize_whitespace(line: str) -> str:
+    """Strip a line and collapse runs of whitespace inside it to single spaces"""
+    line = line.strip()
+    # Whitespace other than a space is unprintable, so most lines skip the split
+    if "  " in line or not line.isprintable():
+        return " ".join(line.split())
+    return line
+
+def _capitalize_first(paragraph: str) -> str:
+    """Capitalize the first letter of a paragraph, skipping opening quotes/brackets"""
+    for index, char in enumerate(paragraph):
+        if char.isalpha():
+            if char.islower():
+                return paragraph[:index] + char.upper() + paragraph[index + 1:]
+            return paragraph
+        if char not in "\"'([":
+            return paragraph
+    return paragraph
+
+def _repair_punctuation(text: str) -> str:
+    """Collapse doubled punctuation and add the missing space after punctuation glued to a word"""
+    # Odd pieces are the punctuation to repair, each followed by the text after it
+    pieces = _REPAIR_RE.split(text)
+    position = token_end = 0
+    verbatim = False
+    for index in range(1, len(pieces), 2):
+        position += len(pieces[index - 1])
+        piece = pieces[index]
+        if pieces[index + 1][:1] in _ASCII_LETTERS:
+            if position >= token_end:
+                token = _VERBATIM_TOKEN_RE.match(text, _token_start(text, position), position + _MAX_TOKEN_LOOKBACK)
+                token_end = token.end()
+                verbatim = token.group(1) is not None
+            # Punctuation glued to a word may belong to a URL, address or abbreviation
+            if verbatim:
+                position += len(piece)
+                continue
+            repaired = piece + " "
+        else:
+            repaired = piece
+        if len(piece) > 1:
+            punct = piece.rstrip("\"')]")
+            if len(punct) > 1:
+                repaired = _normalize_punctuation_run(punct) + repaired[len(punct):]
+        pieces[index] = repaired
+        position += len(piece)
+    return "".join(pieces)
+
+def format_combined_transcript(text: str) -> str:
+    """
+    Clean up a transcript assembled from separately transcribed segments
+
+    - Joins non-empty lines into paragraphs separated by blank lines
+    - Adds missing spaces after punctuation and collapses doubled punctuation
+    - Capitalizes the start of each sentence and paragraph
+
+    URLs, e-mail addresses, decimals, times and abbreviations are left intact.
+    Each step is a single regex scan of the text, so cost is linear in the
+    length of the transcript.
+    """
+    if not text:
+        return ""
+
+    # Replace multiple newlines with double newlines (for paragraph breaks),
+    # collapsing runs of whitespace and capitalizing each paragraph on the way
+    processed = "\n\n".join(
+        _capitalize_first(line)
+        for line in map(_normalize_whitespace, text.split("\n"))
+        if line
+    )
+    processed = _repair_punctuation(processed)
+
+    # Capitalize the start of each new sentence (but not after an ellipsis or abbreviation).
+    # The pieces repeat text, sentence end, first letter, so the letters are uppercased
+    # together. The text before a sentence end starts with the previous letter.
+    pieces = _SENTENCE_START_RE.split(processed)
+    letters = pieces[2::3]
+    pieces[2::3] = [
+        letter
+        if end[0] == "." and (
+            before[-1:] == "."
+            or before[-2:].lower() in _ABBREVIATION_TAILS and _ends_with_abbreviation(previous + before)
+        )
+        else capital
+        for previous, before, end, letter, capital in zip(
+            [""] + letters, pieces[0::3], pieces[1::3], letters, "".join(letters).upper()
+        )
+    ]
+
+    return "".join(pieces).strip()
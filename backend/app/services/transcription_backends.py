@@ -0,0 +1,211 @@
+import os
+import io
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, IO
+
+from openai import APIConnectionError, RateLimitError, InternalServerError
+from tenacity import stop_after_attempt, wait_random_exponential, retry_if_exception_type, Retrying, AsyncRetrying
+
+# faster-whisper is optional; the local backend is unavailable without it
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+from .openai_client import get_openai_client, get_async_openai_client
+from .rate_limiter import openai_rate_limits
+from .segment_store import SegmentStore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Transient API failures worth retrying for a single segment. Other errors
+# (e.g. 413 for an oversized upload) are handled by the caller.
+RETRYABLE_API_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+def parse_transcription_response(response: Any) -> Dict[str, Any]:
+    """Extract text and timestamped segments from a transcription response"""
+    # Handle response based on its structure
+    if hasattr(response, 'text'):
+        text = response.text
+        segments = getattr(response, 'segments', None) or []
+    elif isinstance(response, dict):
+        text = response.get('text', '')
+        segments = response.get('segments', None) or []
+    else:
+        text = str(response)
+        segments = []
+    # Copy timestamps out of the SDK objects so they can be released
+    return {"text": text, "segments": SegmentStore.from_segments(segments)}
+
+class OpenAITranscriptionBackend:
+    """Hosted Whisper through the OpenAI API"""
+
+    name = "openai"
+
+    def __init__(self):
+        self.client = get_openai_client()
+        self.async_client = get_async_openai_client()
+        self.rate_limits = openai_rate_limits
+        self.model_name = "whisper-1"
+        self.max_file_size = 24 * 1024 * 1024  # 24MB to be safe (OpenAI limit is 25MB)
+        self.default_concurrency = 4
+        # Attempts per upload before the segment is replaced by a placeholder
+        self.max_attempts = int(os.getenv("TRANSCRIPTION_SEGMENT_MAX_ATTEMPTS", "3"))
+
+    def _retrying_options(self) -> Dict[str, Any]:
+        return {
+            "stop": stop_after_attempt(self.max_attempts),
+            "wait": wait_random_exponential(multiplier=1, max=10),
+            "retry": retry_if_exception_type(RETRYABLE_API_ERRORS),
+            "reraise": True
+        }
+
+    def transcribe(self, audio_file: IO[bytes], file_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe an audio file, retrying transient failures
+
+        Returns:
+            Dict with "text" and "segments" (a SegmentStore)
+        """
+        for attempt in Retrying(**self._retrying_options()):
+            with attempt:
+                self.rate_limits.whisper.acquire()
+                audio_file.seek(0)
+                try:
+                    raw_response = self.client.audio.transcriptions.with_raw_response.create(
+                        file=(file_name, audio_file) if file_name else audio_file,
+                        model=self.model_name,
+                        # Include segment timestamps
+                        response_format="verbose_json"
+                    )
+                except RateLimitError as e:
+                    self.rate_limits.whisper.throttled(e.response.headers)
+                    raise
+                self.rate_limits.whisper.update_from_headers(raw_response.headers)
+                return parse_transcription_response(raw_response.parse())
+
+    async def transcribe_async(self, audio_file: IO[bytes], file_name: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of transcribe on the shared AsyncOpenAI client"""
+        async for attempt in AsyncRetrying(**self._retrying_options()):
+            with attempt:
+                await self.rate_limits.whisper.acquire_async()
+                audio_file.seek(0)
+                try:
+                    raw_response = await self.async_client.audio.transcriptions.with_raw_response.create(
+                        file=(file_name, audio_file) if file_name else audio_file,
+                        model=self.model_name,
+                        response_format="verbose_json"
+                    )
+                except RateLimitError as e:
+                    self.rate_limits.whisper.throttled(e.response.headers)
+                    raise
+                self.rate_limits.whisper.update_from_headers(raw_response.headers)
+                return parse_transcription_response(raw_response.parse())
+
+# Model loaded once in each worker process of the local backend
+_worker_model = None
+
+def _load_worker_model(model_size: str, compute_type: str, cpu_threads: int) -> None:
+    global _worker_model
+    _worker_model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+def _transcribe_in_worker(audio: bytes, language: Optional[str]) -> Dict[str, Any]:
+    segments, _ = _worker_model.transcribe(io.BytesIO(audio), language=language)
+    store = SegmentStore()
+    texts = []
+    # Segments are generated lazily as decoding progresses
+    for segment in segments:
+        store.append(segment.start, segment.end, segment.text)
+        texts.append(segment.text)
+    return {"text": "".join(texts).strip(), "segments": store}
+
+class LocalWhisperBackend:
+    """
+    On-machine transcription with faster-whisper (CTranslate2) on the CPU.
+
+    Segments are decoded in a pool of worker processes, each holding its own
+    copy of the model, so long recordings use all cores. The pool is started
+    on first use.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.model_size = os.getenv("LOCAL_WHISPER_MODEL", "small")
+        self.compute_type = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+        self.cpu_threads = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", "2"))
+        self.language = os.getenv("LOCAL_WHISPER_LANGUAGE") or None
+        self.max_workers = int(os.getenv(
+            "LOCAL_WHISPER_WORKERS",
+            str(max(1, (os.cpu_count() or 1) // self.cpu_threads))
+        ))
+        self.model_name = f"faster-whisper-{self.model_size}-{self.compute_type}"
+        # Smaller segments spread one recording across the worker pool
+        self.max_file_size = int(float(os.getenv("LOCAL_WHISPER_MAX_SEGMENT_MB", "2")) * 1024 * 1024)
+        self.default_concurrency = self.max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                logger.info(f"Starting {self.max_workers} local transcription workers ({self.model_name})")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # Spawned workers don't inherit the API process's threads and sockets
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_load_worker_model,
+                    initargs=(self.model_size, self.compute_type, self.cpu_threads)
+                )
+            return self._pool
+
+    def _read(self, audio_file: IO[bytes]) -> bytes:
+        audio_file.seek(0)
+        return audio_file.read()
+
+    def transcribe(self, audio_file: IO[bytes], file_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe an audio file in a worker process
+
+        Returns:
+            Dict with "text" and "segments" (a SegmentStore)
+        """
+        return self._get_pool().submit(_transcribe_in_worker, self._read(audio_file), self.language).result()
+
+    async def transcribe_async(self, audio_file: IO[bytes], file_name: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of transcribe; waits on the worker without blocking the event loop"""
+        future = self._get_pool().submit(_transcribe_in_worker, self._read(audio_file), self.language)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+# One backend per process so the local worker pool is shared by every job
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_transcription_backend() -> Any:
+    """Get the transcription backend selected by TRANSCRIPTION_BACKEND (openai or local)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            name = os.getenv("TRANSCRIPTION_BACKEND", "openai").lower()
+            if name == "local" and FASTER_WHISPER_AVAILABLE:
+                _backend = LocalWhisperBackend()
+            else:
+                if name == "local":
+                    logger.warning("faster-whisper is not installed, using the OpenAI transcription backend")
+                elif name != "openai":
+                    logger.warning(f"Unknown transcription backend: {name}")
+                _backend = OpenAITranscriptionBackend()
+        return _backend
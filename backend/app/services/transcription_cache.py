@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Optional, List
+
+from .segment_store import SegmentStore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def serialize_segments(segments: Any) -> List[Dict[str, Any]]:
+    """Convert a SegmentStore or SDK segment objects into plain dicts"""
+    if isinstance(segments, SegmentStore):
+        return segments.to_dicts()
+    serialized = []
+    for segment in segments:
+        if isinstance(segment, dict):
+            serialized.append(segment)
+        elif hasattr(segment, "model_dump"):
+            serialized.append(segment.model_dump())
+        else:
+            serialized.append({
+                "start": getattr(segment, "start", None),
+                "end": getattr(segment, "end", None),
+                "text": getattr(segment, "text", "")
+            })
+    return serialized
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of Whisper transcriptions stored on local disk.
+
+    Entries are keyed by a SHA-256 of the media bytes plus the transcription
+    model, so re-uploads of the same recording skip the API entirely. The store
+    is bounded by total size and evicts the least recently used entries first.
+    """
+
+    CHUNK_SIZE = 1024 * 1024  # Read media in 1MB chunks when hashing
+
+    def __init__(self):
+        """Initialize cache using environment variables"""
+        self.enabled = os.getenv("TRANSCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_dir = os.getenv(
+            "TRANSCRIPTION_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "scribeit-transcription-cache")
+        )
+        self.max_bytes = int(os.getenv("TRANSCRIPTION_CACHE_MAX_MB", "512")) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._seconds_saved = 0.0
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def compute_key(self, file_path: str, model: str) -> str:
+        """
+        Compute the cache key for a media file
+
+        Args:
+            file_path: Path to the audio/video file
+            model: Transcription model name
+
+        Returns:
+            Hex digest identifying the (media bytes, model) pair
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as media_file:
+            for chunk in iter(lambda: media_file.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        digest.update(model.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached transcription
+
+        Args:
+            key: Cache key from compute_key
+
+        Returns:
+            Dict with "text" and "segments", or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+            self._seconds_saved += entry.get("transcribe_seconds", 0.0)
+
+        logger.info(f"Transcription cache hit: {key[:12]}")
+        return {"text": entry["text"], "segments": SegmentStore.from_segments(entry.get("segments", []))}
+
+    def put(self, key: str, result: Dict[str, Any], transcribe_seconds: float = 0.0) -> None:
+        """
+        Store a transcription result and evict old entries if over budget
+
+        Args:
+            key: Cache key from compute_key
+            result: Dict with "text" and "segments"
+            transcribe_seconds: Wall-clock time the transcription took
+        """
+        if not self.enabled:
+            return
+
+        entry = {
+            "text": result.get("text", ""),
+            "segments": serialize_segments(result.get("segments") or []),
+            "transcribe_seconds": transcribe_seconds,
+            "created_at": time.time()
+        }
+
+        path = self._entry_path(key)
+        # Write to a temp file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as entry_file:
+                json.dump(entry, entry_file)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write transcription cache entry: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the store fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                    total_size -= size
+                except OSError:
+                    continue
+                if total_size <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "whisper_seconds_saved": round(self._seconds_saved, 2)
+            }
+
+# Shared instance so all services report into the same counters
+transcription_cache = TranscriptionCache()
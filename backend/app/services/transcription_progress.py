@@ -0,0 +1,202 @@
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..db.database import WorkerSessionLocal
+from ..models.summary import Summary
+from ..models.transcript_chunk import TranscriptChunk
+from .transcript_formatter import format_combined_transcript
+from .transcription_cache import serialize_segments
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TranscriptionProgress:
+    """
+    Records transcription progress for a summary as segments complete.
+
+    Stored segments are also checkpoints: when the same summary is transcribed
+    again (a retry, or after a worker restart), segments that already finished
+    are loaded instead of being sent to the API again.
+
+    Each call uses its own short-lived session, so it is safe to call from the
+    worker threads that transcribe segments. Failures are logged and never
+    interrupt the transcription itself.
+    """
+
+    def __init__(self, summary_id: str):
+        self.summary_id = summary_id
+
+    def start(self, bounds: List[Tuple[float, Optional[float]]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Record the segment plan and load checkpoints from an earlier attempt
+
+        Args:
+            bounds: (start, end) of each planned segment in the original media
+
+        Returns:
+            Stored {"text", "segments"} by segment index, for chunks whose bounds
+            match the plan. Chunks from a different plan are discarded.
+        """
+        db = WorkerSessionLocal()
+        try:
+            summary = db.query(Summary).filter(Summary.id == self.summary_id).first()
+            if summary is None:
+                return {}
+            summary.segments_total = len(bounds)
+            # Each attempt restarts the clock, so the ETA leaves out earlier
+            # attempts and the retry backoff. Database time, like the chunks'
+            # created_at that the ETA compares against.
+            summary.processing_started_at = func.now()
+            
+            checkpoints = {}
+            chunks = db.query(TranscriptChunk).filter(TranscriptChunk.summary_id == self.summary_id).all()
+            for chunk in chunks:
+                index = chunk.segment_index
+                if index < len(bounds) and self._same_bounds((chunk.start_seconds, chunk.end_seconds), bounds[index]):
+                    checkpoints[index] = {"text": chunk.text or "", "segments": chunk.segments or []}
+                else:
+                    db.delete(chunk)
+            db.commit()
+            
+            if checkpoints:
+                logger.info(f"Found {len(checkpoints)}/{len(bounds)} checkpointed segments for {self.summary_id}")
+            return checkpoints
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to record transcription start for {self.summary_id}: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def _same_bounds(self, stored: Tuple[Optional[float], Optional[float]], planned: Tuple[float, Optional[float]]) -> bool:
+        for stored_value, planned_value in zip(stored, planned):
+            if stored_value is None or planned_value is None:
+                if stored_value is not planned_value:
+                    return False
+            elif abs(stored_value - planned_value) > 0.01:
+                return False
+        return True
+
+    def segment_completed(
+        self,
+        index: int,
+        start_seconds: Optional[float],
+        end_seconds: Optional[float],
+        text: str,
+        segments: Optional[List[Any]] = None
+    ) -> None:
+        """Store a finished segment; it doubles as the checkpoint for resuming"""
+        db = WorkerSessionLocal()
+        try:
+            # A segment transcribed again (a failed placeholder) gets a new row,
+            # so its created_at says when it finished
+            db.query(TranscriptChunk).filter(
+                TranscriptChunk.summary_id == self.summary_id,
+                TranscriptChunk.segment_index == index
+            ).delete(synchronize_session=False)
+            chunk = TranscriptChunk(summary_id=self.summary_id, segment_index=index)
+            db.add(chunk)
+            chunk.start_seconds = start_seconds
+            chunk.end_seconds = end_seconds
+            chunk.text = text
+            chunk.segments = serialize_segments(segments or [])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to record segment {index + 1} for {self.summary_id}: {e}")
+        finally:
+            db.close()
+
+    def summary_updated(self, parsed: Dict[str, Any]) -> None:
+        """
+        Store the parsed summary streamed so far, while the summary is still
+        processing. It goes in its own column: the final summary columns are
+        only written once the summary is complete, so a failed job never
+        leaves a truncated summary (or search index entry) behind.
+        """
+        db = WorkerSessionLocal()
+        try:
+            summary = db.query(Summary).filter(Summary.id == self.summary_id).first()
+            if summary is None:
+                return
+            summary.partial_summary = {
+                "summary": parsed["summary"],
+                "key_points": parsed["key_points"],
+                "action_items": parsed["action_items"],
+                "notable_quotes": parsed.get("notable_quotes", [])
+            }
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to record partial summary for {self.summary_id}: {e}")
+        finally:
+            db.close()
+
+def get_progress(db: Session, summary: Summary) -> Dict[str, Any]:
+    """
+    Build progress details for a summary from its stored chunks
+
+    Args:
+        db: Database session
+        summary: Summary being processed
+
+    Returns:
+        Dict with segments_completed, segments_total, percent_complete,
+        eta_seconds (None until it can be estimated), partial_transcript
+        (the text of the leading run of finished segments, empty once the
+        summary is finished) and partial_summary (the sections streamed so
+        far, None until summarization starts)
+    """
+    chunks = db.query(TranscriptChunk.segment_index, TranscriptChunk.created_at).filter(
+        TranscriptChunk.summary_id == summary.id
+    ).order_by(TranscriptChunk.segment_index).all()
+    
+    total = summary.segments_total or 0
+    completed = len(chunks)
+    
+    if summary.status == "completed":
+        percent = 100.0
+    elif total:
+        percent = round(100.0 * min(completed, total) / total, 1)
+    else:
+        percent = 0.0
+    
+    # Estimate the remaining time from the average time per segment finished
+    # in this attempt; segments loaded from checkpoints took no time. Segments
+    # run concurrently, so this is an upper bound that tightens as more finish.
+    eta_seconds = None
+    started_at = summary.processing_started_at
+    if summary.status == "processing" and total and 0 < completed < total and started_at:
+        finished_now = sum(1 for chunk in chunks if chunk.created_at and chunk.created_at >= started_at)
+        if finished_now:
+            elapsed = (db.query(func.now()).scalar() - started_at).total_seconds()
+            eta_seconds = round(max(0.0, elapsed / finished_now * (total - completed)), 1)
+    
+    partial_transcript = ""
+    partial_summary = None
+    if summary.status not in ("completed", "failed"):
+        # Only show text up to the first missing segment so the transcript reads in order
+        leading = 0
+        while leading < completed and chunks[leading].segment_index == leading:
+            leading += 1
+        if leading:
+            texts = db.query(TranscriptChunk.text).filter(
+                TranscriptChunk.summary_id == summary.id,
+                TranscriptChunk.segment_index < leading
+            ).order_by(TranscriptChunk.segment_index).all()
+            partial_transcript = format_combined_transcript("\n\n".join(text or "" for text, in texts))
+        if summary.status == "processing":
+            partial_summary = summary.partial_summary
+    
+    return {
+        "segments_completed": completed,
+        "segments_total": total,
+        "percent_complete": percent,
+        "eta_seconds": eta_seconds,
+        "partial_transcript": partial_transcript,
+        "partial_summary": partial_summary
+    }
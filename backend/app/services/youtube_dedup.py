@@ -0,0 +1,189 @@
+import os
+import re
+import logging
+from datetime import timedelta
+from typing import Optional, List
+from urllib.parse import urlparse, parse_qs
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from ..models.summary import Summary
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_HOSTS = {"youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com"}
+# Path prefixes that are followed by the video ID
+YOUTUBE_ID_PATHS = ("embed", "shorts", "live", "v", "e")
+
+# Result fields copied from a finished summary to the summaries sharing it
+SHARED_FIELDS = (
+    "duration_seconds",
+    "minutes_charged",
+    "segments_total",
+    "transcription",
+    "summary_text",
+    "key_points",
+    "action_items",
+    "notable_quotes",
+    "speaker_labels",
+    "transcript_segments",
+)
+
+def canonical_video_id(url: str) -> Optional[str]:
+    """
+    Extract the YouTube video ID from any of its URL forms (watch, youtu.be,
+    shorts, embed, live, mobile and music hosts)
+
+    Returns:
+        The 11 character video ID, or None if the URL isn't a YouTube video
+    """
+    parsed = urlparse(str(url).strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    parts = [part for part in parsed.path.split("/") if part]
+
+    candidate = None
+    if host == "youtu.be":
+        candidate = parts[0] if parts else None
+    elif host in YOUTUBE_HOSTS:
+        if parts[:1] == ["watch"]:
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in YOUTUBE_ID_PATHS:
+            candidate = parts[1]
+
+    if candidate and VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+class YouTubeDeduplicator:
+    """
+    Shares the processing of one YouTube video between summaries.
+
+    Summaries are keyed by canonical video ID. The first submission of a
+    video is the leader and gets a job. Submissions made while the leader is
+    in flight attach to it as followers (source_summary_id) and get no job of
+    their own; when the leader finishes, its transcription and summary (or
+    its error) are copied to every follower. A submission of a video that
+    completed within YOUTUBE_RESULT_REUSE_SECONDS gets the stored result
+    straight away.
+
+    Attaching and finishing take the same transaction-scoped advisory lock on
+    the video ID, so a follower either attaches before the leader finishes
+    and is included in the fan-out, or sees the finished result.
+    """
+
+    def __init__(self):
+        """Initialize deduplication settings using environment variables"""
+        self.enabled = os.getenv("YOUTUBE_DEDUP_ENABLED", "true").lower() == "true"
+        # How long a finished result is reused for new submissions; 0 turns reuse off
+        self.reuse_seconds = int(os.getenv("YOUTUBE_RESULT_REUSE_SECONDS", "86400"))
+
+    def lock(self, db: Session, video_id: str) -> None:
+        """Serialize submissions and completion of one video until the transaction ends"""
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"youtube:{video_id}"})
+
+    def find_in_flight(self, db: Session, video_id: str) -> Optional[Summary]:
+        """The leader summary currently processing this video, if any"""
+        return db.query(Summary).filter(
+            Summary.video_id == video_id,
+            Summary.source_summary_id.is_(None),
+            Summary.status.in_(("pending", "processing"))
+        ).order_by(Summary.created_at).first()
+
+    def find_completed(self, db: Session, video_id: str) -> Optional[Summary]:
+        """The most recent result for this video within the reuse window"""
+        if self.reuse_seconds <= 0:
+            return None
+        return db.query(Summary).filter(
+            Summary.video_id == video_id,
+            Summary.status == "completed",
+            Summary.transcription.isnot(None),
+            Summary.completed_at >= func.now() - timedelta(seconds=self.reuse_seconds)
+        ).order_by(Summary.completed_at.desc()).first()
+
+    def attach(self, db: Session, summary: Summary) -> Optional[str]:
+        """
+        Share an existing result or in-flight job with a new, flushed summary.
+        Call before enqueueing, in the submitting transaction.
+
+        Returns:
+            "reused" if the summary was completed from a stored result,
+            "attached" if it now waits on an in-flight summary, or None if it
+            needs its own job
+        """
+        if not self.enabled or not summary.video_id:
+            return None
+
+        self.lock(db, summary.video_id)
+
+        completed = self.find_completed(db, summary.video_id)
+        if completed is not None:
+            self.copy_result(completed, summary)
+            logger.info(f"Reused result of {completed.id} for summary {summary.id} (video {summary.video_id})")
+            return "reused"
+
+        leader = self.find_in_flight(db, summary.video_id)
+        if leader is not None and leader.id != summary.id:
+            summary.source_summary_id = leader.id
+            summary.status = leader.status
+            logger.info(f"Summary {summary.id} attached to in-flight summary {leader.id} (video {summary.video_id})")
+            return "attached"
+        return None
+
+    def followers(self, db: Session, leader: Summary) -> List[Summary]:
+        return db.query(Summary).filter(
+            Summary.source_summary_id == leader.id,
+            Summary.status.in_(("pending", "processing"))
+        ).all()
+
+    def share_status(self, db: Session, leader: Summary) -> None:
+        """Mirror the leader's processing state onto its followers"""
+        for follower in self.followers(db, leader):
+            follower.status = leader.status
+
+    def share_result(self, db: Session, leader: Summary) -> int:
+        """
+        Copy a finished leader's result to its followers, in the transaction
+        that completes the leader
+
+        Returns:
+            Number of followers completed
+        """
+        if not leader.video_id:
+            return 0
+        self.lock(db, leader.video_id)
+        followers = self.followers(db, leader)
+        for follower in followers:
+            self.copy_result(leader, follower)
+        if followers:
+            logger.info(f"Shared result of {leader.id} with {len(followers)} other summaries")
+        return len(followers)
+
+    def share_failure(self, db: Session, leader: Summary) -> int:
+        """Fail the followers of a leader that failed, with the same error"""
+        if not leader.video_id:
+            return 0
+        self.lock(db, leader.video_id)
+        followers = self.followers(db, leader)
+        for follower in followers:
+            follower.status = "failed"
+            follower.error_message = leader.error_message
+        return len(followers)
+
+    @staticmethod
+    def copy_result(source: Summary, target: Summary) -> None:
+        for field in SHARED_FIELDS:
+            setattr(target, field, getattr(source, field))
+        target.title = target.title or source.title
+        target.error_message = None
+        target.partial_summary = None
+        target.status = "completed"
+        target.completed_at = func.now()
+
+# Shared instance used by the YouTube endpoint, its job handler and the queue
+youtube_dedup = YouTubeDeduplicator()
@@ -0,0 +1,505 @@
+"""
+End-to-end throughput benchmark of upload -> transcribe -> summarize -> DB write,
+run entirely against local stand-ins (see pipeline_fakes.py), so no API
+money is spent and no network access is needed.
+
+The API runs in a separate uvicorn process with S3 replaced by a local
+directory and YouTube downloads replaced by a fixture file. Its OpenAI
+client points at a fake OpenAI server. The benchmark submits jobs to
+/api/process/upload and /api/youtube/process at a fixed concurrency. It
+polls each job until it finishes and reports:
+
+- jobs/minute
+- per-stage p50/p95/p99 latency
+- peak RSS of the API process
+- peak disk use of its working directories
+
+Results are written as JSON so runs can be compared across commits.
+
+Requires a PostgreSQL database migrated to head (alembic upgrade head),
+taken from DATABASE_URL like the app itself.
+
+Usage (from the backend directory):
+    python benchmarks/pipeline_benchmark.py [--jobs 20] [--concurrency 4] [--youtube-ratio 0.5]
+        [--audio-seconds 300] [--whisper-latency 1.0] [--chat-latency 1.0] [--rate-limit-rate 0.05]
+        [--output results.json] [--baseline previous.json]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime, timezone
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+# Peak RSS comes from getrusage, which is POSIX-only
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline_fakes import FakeOpenAIServer, LocalS3Service, FixtureYouTubeDownloader, write_fixture_audio
+
+BENCHMARK_USER_EMAIL = "pipeline-benchmark@scribeit.local"
+STAGES = [
+    "submit", "queue_wait", "youtube_download", "s3_upload", "transcribe",
+    "summarize", "db_statement", "job_processing", "end_to_end"
+]
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Linearly interpolated percentile (p in 0..100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize_timings(values: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 4) if values else None,
+        **{f"p{p}": round(percentile(values, p), 4) if values else None for p in (50, 95, 99)}
+    }
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+def directory_size(path: str) -> int:
+    total = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += directory_size(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except FileNotFoundError:
+                    # Temp files come and go while we walk
+                    continue
+    except FileNotFoundError:
+        pass
+    return total
+
+class DiskSampler:
+    """Track the peak size of a directory tree from a background thread"""
+
+    def __init__(self, path: str, interval: float = 0.25):
+        self.path = path
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, directory_size(self.path))
+            self._stop.wait(self.interval)
+
+    def start(self) -> "DiskSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        return self.peak_bytes
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# ---------------------------------------------------------------------------
+# API process
+# ---------------------------------------------------------------------------
+
+def serve(args: argparse.Namespace) -> None:
+    """Run the API with local S3 and YouTube stand-ins and stage timing hooks"""
+    import uvicorn
+    from sqlalchemy import event
+
+    from main import app
+    from app.api.endpoints import process, youtube
+    from app.db.database import engine, worker_engine, SessionLocal
+    from app.models.user import User
+    from app.core.auth import create_access_token, get_password_hash
+
+    timings = defaultdict(list)
+    lock = threading.Lock()
+
+    def record(stage: str, seconds: float) -> None:
+        with lock:
+            timings[stage].append(seconds)
+
+    def timed(stage, func):
+        def wrapper(*a, **kw):
+            started = time.perf_counter()
+            try:
+                return func(*a, **kw)
+            finally:
+                record(stage, time.perf_counter() - started)
+        return wrapper
+
+    def timed_async(stage, func):
+        async def wrapper(*a, **kw):
+            started = time.perf_counter()
+            try:
+                return await func(*a, **kw)
+            finally:
+                record(stage, time.perf_counter() - started)
+        return wrapper
+
+    # External services
+    s3_service = LocalS3Service(args.s3_dir, latency=args.s3_latency)
+    s3_service.upload_file = timed("s3_upload", s3_service.upload_file)
+    process.s3_service = s3_service
+    youtube.s3_service = s3_service
+    youtube.download_youtube_audio = timed(
+        "youtube_download",
+        FixtureYouTubeDownloader(args.fixture, args.audio_seconds, latency=args.youtube_latency)
+    )
+
+    # Pipeline stages
+    for module in (process, youtube):
+        service = module.openai_service
+        service.transcribe_audio = timed_async("transcribe", service.transcribe_audio)
+        service.generate_summary = timed_async("summarize", service.generate_summary)
+    process.process_media_file = timed_async("job_processing", process.process_media_file)
+    youtube.process_youtube_video = timed_async("job_processing", youtube.process_youtube_video)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("benchmark_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record("db_statement", time.perf_counter() - conn.info["benchmark_started"].pop())
+
+    for role_engine in (engine, worker_engine):
+        event.listen(role_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(role_engine, "after_cursor_execute", after_cursor_execute)
+
+    @app.get("/benchmark/stats", include_in_schema=False)
+    async def benchmark_stats():
+        with lock:
+            stages = {stage: list(values) for stage, values in timings.items()}
+        stats = {"stages": stages}
+        if RESOURCE_AVAILABLE:
+            # ru_maxrss is in kilobytes on Linux
+            stats["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            stats["peak_children_rss_kb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return stats
+
+    # Benchmark user with unlimited minutes
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCHMARK_USER_EMAIL).first()
+        if not user:
+            user = User(email=BENCHMARK_USER_EMAIL, hashed_password=get_password_hash("benchmark"))
+            db.add(user)
+        user.minutes_remaining = 10 ** 9
+        db.commit()
+    finally:
+        db.close()
+
+    with open(args.ready_file, "w", encoding="utf-8") as ready:
+        json.dump({"token": create_access_token({"sub": BENCHMARK_USER_EMAIL})}, ready)
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+# ---------------------------------------------------------------------------
+# Load driver
+# ---------------------------------------------------------------------------
+
+async def run_job(client: httpx.AsyncClient, index: int, kind: str, fixture_bytes: bytes, args: argparse.Namespace) -> Dict[str, Any]:
+    job = {"index": index, "kind": kind, "status": None, "timings": {}}
+    started = time.perf_counter()
+    if kind == "youtube":
+        response = await client.post("/api/youtube/process", json={"url": f"https://www.youtube.com/watch?v=bench{index:05d}"})
+    else:
+        response = await client.post(
+            "/api/process/upload",
+            files={"file": (f"benchmark-{index:05d}.wav", fixture_bytes, "audio/wav")},
+            data={"title": f"Benchmark upload {index}"}
+        )
+    submitted = time.perf_counter()
+    job["timings"]["submit"] = submitted - started
+    if response.status_code != 200:
+        job["status"] = "rejected"
+        job["error"] = f"{response.status_code}: {response.text[:200]}"
+        return job
+    summary_id = response.json()["summary_id"]
+
+    deadline = started + args.job_timeout
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(args.poll_interval)
+        status_response = await client.get(f"/api/process/status/{summary_id}")
+        if status_response.status_code != 200:
+            continue
+        status = status_response.json()
+        if status["status"] != "pending" and "queue_wait" not in job["timings"]:
+            job["timings"]["queue_wait"] = time.perf_counter() - submitted
+        if status["status"] in ("completed", "failed"):
+            job["status"] = status["status"]
+            job["error"] = status.get("error_message")
+            job["timings"]["end_to_end"] = time.perf_counter() - started
+            return job
+    job["status"] = "timeout"
+    return job
+
+async def drive(base_url: str, token: str, fixture_bytes: bytes, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # Spread YouTube jobs evenly through the run
+    kinds = [
+        "youtube" if int((i + 1) * args.youtube_ratio) > int(i * args.youtube_ratio) else "upload"
+        for i in range(args.jobs)
+    ]
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=httpx.Timeout(300.0),
+        limits=httpx.Limits(max_connections=args.concurrency * 2)
+    ) as client:
+        async def limited(index: int, kind: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_job(client, index, kind, fixture_bytes, args)
+
+        return await asyncio.gather(*(limited(i, kind) for i, kind in enumerate(kinds)))
+
+def start_api_process(args: argparse.Namespace, workdir: str, fixture: str, fake_openai: FakeOpenAIServer, port: int) -> subprocess.Popen:
+    tmp_dir = os.path.join(workdir, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": fake_openai.base_url,
+        "OPENAI_API_KEY": "benchmark",
+        "TRANSCRIPTION_BACKEND": "openai",
+        "RATE_LIMIT_BACKEND": "memory",
+        # Jobs run in the server process, where the fakes are installed
+        "JOB_QUEUE_EMBEDDED_WORKER": "true",
+        # Job temp files land in the sampled working directory
+        "TMPDIR": tmp_dir,
+        "TRANSCRIPTION_CACHE_DIR": os.path.join(workdir, "cache", "transcription"),
+        "SUMMARY_CACHE_DIR": os.path.join(workdir, "cache", "summary"),
+        "PYTHONUNBUFFERED": "1"
+    })
+    if not args.with_caches:
+        # Every job uses the same fixture, so caches would skip the work being measured
+        env["TRANSCRIPTION_CACHE_ENABLED"] = "false"
+        env["SUMMARY_CACHE_ENABLED"] = "false"
+
+    command = [
+        sys.executable, os.path.abspath(__file__), "serve",
+        "--port", str(port),
+        "--ready-file", os.path.join(workdir, "ready.json"),
+        "--s3-dir", os.path.join(workdir, "s3"),
+        "--fixture", fixture,
+        "--audio-seconds", str(args.audio_seconds),
+        "--s3-latency", str(args.s3_latency),
+        "--youtube-latency", str(args.youtube_latency)
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+def wait_until_ready(process: subprocess.Popen, ready_file: str, base_url: str, timeout: float = 120.0) -> str:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API process exited with code {process.returncode} during startup")
+        if os.path.exists(ready_file):
+            try:
+                if httpx.get(f"{base_url}/health", timeout=2.0).status_code == 200:
+                    with open(ready_file, encoding="utf-8") as ready:
+                        return json.load(ready)["token"]
+            except httpx.HTTPError:
+                pass
+        time.sleep(0.2)
+    raise RuntimeError("API process did not become ready in time")
+
+def build_results(args: argparse.Namespace, jobs: List[Dict[str, Any]], server_stats: Dict[str, Any],
+                  fake_openai: FakeOpenAIServer, wall_seconds: float, peak_disk_bytes: int) -> Dict[str, Any]:
+    stages = defaultdict(list)
+    for job in jobs:
+        for stage, seconds in job["timings"].items():
+            stages[stage].append(seconds)
+    for stage, values in server_stats.get("stages", {}).items():
+        stages[stage].extend(values)
+
+    statuses = defaultdict(int)
+    for job in jobs:
+        statuses[job["status"]] += 1
+    errors = sorted({job["error"] for job in jobs if job.get("error")})
+
+    peak_rss_kb = server_stats.get("peak_rss_kb")
+    peak_children_rss_kb = server_stats.get("peak_children_rss_kb")
+    return {
+        "benchmark": "pipeline",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git": git_revision(),
+        "config": {
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "youtube_ratio": args.youtube_ratio,
+            "audio_seconds": args.audio_seconds,
+            "whisper_latency": args.whisper_latency,
+            "whisper_latency_per_mb": args.whisper_latency_per_mb,
+            "chat_latency": args.chat_latency,
+            "rate_limit_rate": args.rate_limit_rate,
+            "s3_latency": args.s3_latency,
+            "youtube_latency": args.youtube_latency,
+            "with_caches": args.with_caches
+        },
+        "jobs": dict(statuses),
+        "errors": errors[:10],
+        "wall_seconds": round(wall_seconds, 2),
+        "jobs_per_minute": round(statuses["completed"] / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        "stages": {stage: summarize_timings(stages[stage]) for stage in STAGES if stages.get(stage)},
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1) if peak_rss_kb else None,
+        "peak_children_rss_mb": round(peak_children_rss_kb / 1024, 1) if peak_children_rss_kb else None,
+        "peak_disk_mb": round(peak_disk_bytes / (1024 * 1024), 1),
+        "fake_openai": fake_openai.stats()
+    }
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    def change(current, previous) -> str:
+        if current is None or not previous:
+            return ""
+        return f"{(current - previous) / previous:+.1%}"
+
+    print(f"jobs: {results['jobs']}  wall: {results['wall_seconds']}s")
+    print(f"jobs/minute: {results['jobs_per_minute']}"
+          + (f"  (baseline {baseline['jobs_per_minute']}, {change(results['jobs_per_minute'], baseline['jobs_per_minute'])})" if baseline else ""))
+    print(f"peak RSS: {results['peak_rss_mb']} MB (children {results['peak_children_rss_mb']} MB)  peak disk: {results['peak_disk_mb']} MB")
+    print(f"{'stage':>16} {'count':>6} {'p50 s':>9} {'p95 s':>9} {'p99 s':>9}" + (f" {'p95 vs baseline':>16}" if baseline else ""))
+    for stage, stats in results["stages"].items():
+        line = f"{stage:>16} {stats['count']:>6} {stats['p50']:>9.3f} {stats['p95']:>9.3f} {stats['p99']:>9.3f}"
+        if baseline:
+            previous = baseline.get("stages", {}).get(stage, {}).get("p95")
+            line += f" {change(stats['p95'], previous):>16}"
+        print(line)
+    for error in results["errors"]:
+        print(f"error: {error}")
+
+def run(args: argparse.Namespace) -> None:
+    workdir = tempfile.mkdtemp(prefix="scribeit-pipeline-benchmark-")
+    fixture = write_fixture_audio(os.path.join(workdir, "fixture.wav"), args.audio_seconds)
+    with open(fixture, "rb") as fixture_file:
+        fixture_bytes = fixture_file.read()
+
+    transcript_text = None
+    if args.transcript_file:
+        with open(args.transcript_file, encoding="utf-8") as transcript:
+            transcript_text = transcript.read()
+    fake_openai = FakeOpenAIServer(
+        whisper_latency=args.whisper_latency,
+        whisper_latency_per_mb=args.whisper_latency_per_mb,
+        chat_latency=args.chat_latency,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        transcript_text=transcript_text
+    ).start()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    api_process = start_api_process(args, workdir, fixture, fake_openai, port)
+    try:
+        token = wait_until_ready(api_process, os.path.join(workdir, "ready.json"), base_url)
+        disk_sampler = DiskSampler(workdir).start()
+        started = time.perf_counter()
+        jobs = asyncio.run(drive(base_url, token, fixture_bytes, args))
+        wall_seconds = time.perf_counter() - started
+        peak_disk_bytes = disk_sampler.stop()
+        server_stats = httpx.get(f"{base_url}/benchmark/stats", timeout=30.0).json()
+    finally:
+        api_process.terminate()
+        try:
+            api_process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            api_process.kill()
+        fake_openai.stop()
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = build_results(args, jobs, server_stats, fake_openai, wall_seconds, peak_disk_bytes)
+
+    output = args.output
+    if not output:
+        results_dir = os.path.join(BACKEND_DIR, "benchmarks", "results")
+        os.makedirs(results_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(results_dir, f"pipeline-{results['git']['commit'] or 'unknown'}-{stamp}.json")
+    with open(output, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+    print(f"results written to {output}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        # Internal: the API process started by run()
+        parser = argparse.ArgumentParser(prog="pipeline_benchmark.py serve")
+        parser.add_argument("--port", type=int, required=True)
+        parser.add_argument("--ready-file", required=True)
+        parser.add_argument("--s3-dir", required=True)
+        parser.add_argument("--fixture", required=True)
+        parser.add_argument("--audio-seconds", type=float, required=True)
+        parser.add_argument("--s3-latency", type=float, default=0.0)
+        parser.add_argument("--youtube-latency", type=float, default=0.0)
+        serve(parser.parse_args(sys.argv[2:]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20, help="Number of jobs to submit")
+    parser.add_argument("--concurrency", type=int, default=4, help="Jobs in flight at once")
+    parser.add_argument("--youtube-ratio", type=float, default=0.5, help="Fraction of jobs submitted as YouTube URLs")
+    parser.add_argument("--audio-seconds", type=float, default=300, help="Length of the fixture recording")
+    parser.add_argument("--transcript-file", help="Text to serve as canned transcripts (default: synthetic)")
+    parser.add_argument("--whisper-latency", type=float, default=1.0, help="Fake transcription latency per request (s)")
+    parser.add_argument("--whisper-latency-per-mb", type=float, default=0.5, help="Extra fake transcription latency per uploaded MB (s)")
+    parser.add_argument("--chat-latency", type=float, default=1.0, help="Fake chat completion latency before the first token (s)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of OpenAI requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with injected 429s (s)")
+    parser.add_argument("--s3-latency", type=float, default=0.05, help="Latency of each local S3 operation (s)")
+    parser.add_argument("--youtube-latency", type=float, default=1.0, help="Latency of each fixture YouTube download (s)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Status polling interval per job (s)")
+    parser.add_argument("--job-timeout", type=float, default=900, help="Give up on a job after this long (s)")
+    parser.add_argument("--with-caches", action="store_true", help="Leave the transcription and summary caches enabled")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the working directory for inspection")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/pipeline-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
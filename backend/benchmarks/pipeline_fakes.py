@@ -0,0 +1,358 @@
+"""
+Local stand-ins for the external services used by the processing pipeline,
+for benchmarking without network access or API spend:
+
+- FakeOpenAIServer: an HTTP server speaking the subset of the OpenAI API the
+  app uses (verbose_json transcriptions, plain and streamed chat
+  completions), with configurable latency and injected 429s
+- LocalS3Service: S3Service backed by a local directory
+- FixtureYouTubeDownloader: replacement for download_youtube_audio that
+  "downloads" a fixture file
+- write_fixture_audio: generates a speech-like WAV file (tone bursts
+  separated by short silences)
+"""
+import os
+import json
+import math
+import time
+import uuid
+import wave
+import array
+import random
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List
+
+VOCABULARY = (
+    "the a we to and of that is it in for you this so on with about our they have "
+    "meeting project budget quarter team customer release plan review design update "
+    "think need going next week really just like right okay yeah because which would"
+).split()
+
+CANNED_SUMMARY = """## Overview
+The team reviewed the quarterly plan, the state of the release and the open customer issues.
+They agreed to move the design review to next week.
+
+## Key Points
+- The release is on track for the end of the quarter
+- Two customer issues are still open and need an owner
+- The budget for the next quarter has been approved
+
+## Action Items
+- Schedule the design review for next week
+- Assign owners to the open customer issues
+
+## Notable Quotes
+- "We should ship the smaller release first."
+"""
+
+def write_fixture_audio(path: str, seconds: float, sample_rate: int = 16000) -> str:
+    """Write a mono 16-bit WAV of tone bursts separated by short silences"""
+    rng = random.Random(seconds)
+    samples = array.array("h")
+    position = 0.0
+    while position < seconds:
+        burst = min(rng.uniform(2.0, 6.0), seconds - position)
+        frequency = rng.uniform(140.0, 280.0)
+        samples.extend(
+            int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+            for i in range(int(burst * sample_rate))
+        )
+        position += burst
+        pause = min(rng.uniform(0.3, 0.9), max(seconds - position, 0.0))
+        samples.extend([0] * int(pause * sample_rate))
+        position += pause
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return path
+
+class FakeOpenAIServer:
+    """
+    Minimal OpenAI API on localhost.
+
+    Point the app at it with OPENAI_BASE_URL=<server.base_url>. Every request
+    waits for its configured latency; a fraction of requests can be answered
+    with 429 and a Retry-After header to exercise the retry and rate limit
+    paths.
+    """
+
+    def __init__(
+        self,
+        whisper_latency: float = 1.0,
+        whisper_latency_per_mb: float = 0.5,
+        chat_latency: float = 1.0,
+        stream_chunk_delay: float = 0.01,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        words_per_minute: int = 150,
+        transcript_text: Optional[str] = None,
+        seed: int = 42
+    ):
+        self.whisper_latency = whisper_latency
+        self.whisper_latency_per_mb = whisper_latency_per_mb
+        self.chat_latency = chat_latency
+        self.stream_chunk_delay = stream_chunk_delay
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.words_per_minute = words_per_minute
+        self.transcript_words = transcript_text.split() if transcript_text else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {"transcriptions": 0, "chat_completions": 0, "chat_streams": 0, "rate_limited": 0, "bytes_received": 0}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "FakeOpenAIServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                fake._handle(self)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counts)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def _read_body(self, handler: BaseHTTPRequestHandler) -> bytes:
+        if handler.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(handler.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    handler.rfile.readline()
+                    break
+                parts.append(handler.rfile.read(size))
+                handler.rfile.readline()
+            return b"".join(parts)
+        return handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+
+    def _send_json(self, handler: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        # Generous limits so the app's limiter doesn't throttle on its own
+        return {
+            "x-ratelimit-limit-requests": "10000",
+            "x-ratelimit-remaining-requests": "9999",
+            "x-ratelimit-reset-requests": "6ms",
+            "x-ratelimit-limit-tokens": "10000000",
+            "x-ratelimit-remaining-tokens": "9999000",
+            "x-ratelimit-reset-tokens": "6ms"
+        }
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        body = self._read_body(handler)
+        self._count("bytes_received", len(body))
+        path = handler.path.split("?")[0]
+
+        with self._lock:
+            rate_limited = self._rng.random() < self.rate_limit_rate
+        if rate_limited:
+            self._count("rate_limited")
+            self._send_json(
+                handler, 429,
+                {"error": {"message": "Rate limit reached (benchmark)", "type": "requests", "code": "rate_limit_exceeded"}},
+                {"retry-after": str(self.retry_after), "x-ratelimit-remaining-requests": "0",
+                 "x-ratelimit-reset-requests": f"{self.retry_after}s"}
+            )
+            return
+
+        if path.endswith("/audio/transcriptions"):
+            self._count("transcriptions")
+            time.sleep(self.whisper_latency + self.whisper_latency_per_mb * len(body) / (1024 * 1024))
+            self._send_json(handler, 200, self._transcription(self._audio_duration(body)), self._rate_limit_headers())
+        elif path.endswith("/chat/completions"):
+            request = json.loads(body or b"{}")
+            time.sleep(self.chat_latency)
+            if request.get("stream"):
+                self._count("chat_streams")
+                self._stream_chat(handler, request)
+            else:
+                self._count("chat_completions")
+                self._send_json(handler, 200, self._chat_completion(request), self._rate_limit_headers())
+        else:
+            self._send_json(handler, 404, {"error": {"message": f"Unknown path {path}"}})
+
+    def _transcript_words(self, count: int) -> List[str]:
+        with self._lock:
+            if self.transcript_words:
+                start = self._rng.randrange(len(self.transcript_words))
+                return [self.transcript_words[(start + i) % len(self.transcript_words)] for i in range(count)]
+            return [self._rng.choice(VOCABULARY) for _ in range(count)]
+
+    def _audio_duration(self, body: bytes) -> float:
+        """Estimate the duration of the uploaded audio to size the transcript"""
+        # Uncompressed WAV carries its byte rate in the header
+        header = body.find(b"RIFF")
+        if header >= 0 and body[header + 8:header + 12] == b"WAVE":
+            byte_rate = int.from_bytes(body[header + 28:header + 32], "little")
+            if byte_rate:
+                return max((len(body) - header - 44) / byte_rate, 1.0)
+        # Otherwise assume a normalized upload (~24 kbit/s)
+        return max(len(body) / 3000.0, 1.0)
+
+    def _transcription(self, duration: float) -> Dict[str, Any]:
+        words = self._transcript_words(max(int(duration / 60.0 * self.words_per_minute), 1))
+        segments = []
+        per_segment = 12
+        seconds_per_word = duration / len(words)
+        for index, start in enumerate(range(0, len(words), per_segment)):
+            chunk = words[start:start + per_segment]
+            text = " " + " ".join(chunk).capitalize() + "."
+            segments.append({
+                "id": index,
+                "seek": 0,
+                "start": round(start * seconds_per_word, 2),
+                "end": round((start + len(chunk)) * seconds_per_word, 2),
+                "text": text,
+                "tokens": [],
+                "temperature": 0.0,
+                "avg_logprob": -0.2,
+                "compression_ratio": 1.4,
+                "no_speech_prob": 0.01
+            })
+        return {
+            "task": "transcribe",
+            "language": "english",
+            "duration": duration,
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "segments": segments
+        }
+
+    def _chat_completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": CANNED_SUMMARY},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 200, "total_tokens": 1200}
+        }
+
+    def _stream_chat(self, handler: BaseHTTPRequestHandler, request: Dict[str, Any]) -> None:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        for name, value in self._rate_limit_headers().items():
+            handler.send_header(name, value)
+        handler.end_headers()
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = request.get("model", "gpt-4o")
+
+        def send(payload: str) -> None:
+            data = f"data: {payload}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            handler.wfile.flush()
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            return json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            })
+
+        send(chunk({"role": "assistant", "content": ""}))
+        # Roughly token-sized deltas
+        for start in range(0, len(CANNED_SUMMARY), 16):
+            time.sleep(self.stream_chunk_delay)
+            send(chunk({"content": CANNED_SUMMARY[start:start + 16]}))
+        send(chunk({}, "stop"))
+        send("[DONE]")
+        handler.wfile.write(b"0\r\n\r\n")
+        handler.wfile.flush()
+
+class LocalS3Service:
+    """S3Service with the same interface, storing objects under a local directory"""
+
+    def __init__(self, root_dir: str, latency: float = 0.0):
+        self.root_dir = root_dir
+        self.latency = latency
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _path(self, s3_key: str) -> str:
+        return os.path.join(self.root_dir, *s3_key.split("/"))
+
+    def upload_file(self, file_data, original_filename, user_id):
+        extension = original_filename.split('.')[-1].lower()
+        s3_key = f"uploads/{user_id}/{uuid.uuid4()}.{extension}"
+        path = self._path(s3_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        time.sleep(self.latency)
+        with open(path, "wb") as target:
+            shutil.copyfileobj(file_data, target)
+        return s3_key
+
+    def download_file(self, s3_key, local_path):
+        time.sleep(self.latency)
+        shutil.copyfile(self._path(s3_key), local_path)
+        return local_path
+
+    def delete_file(self, s3_key):
+        try:
+            os.remove(self._path(s3_key))
+        except FileNotFoundError:
+            pass
+
+class FixtureYouTubeDownloader:
+    """Stand-in for download_youtube_audio that copies a fixture into the job's temp dir"""
+
+    def __init__(self, fixture_path: str, duration: float, latency: float = 0.0):
+        self.fixture_path = fixture_path
+        self.duration = duration
+        self.latency = latency
+
+    def __call__(self, url, output_path):
+        time.sleep(self.latency)
+        video_id = url.split("v=")[-1].split("&")[0] if "v=" in url else url.rstrip("/").split("/")[-1]
+        extension = os.path.splitext(self.fixture_path)[1]
+        file_path = os.path.join(os.path.dirname(output_path), f"{video_id}{extension}")
+        shutil.copyfile(self.fixture_path, file_path)
+        return {
+            'title': f"Benchmark video {video_id}",
+            'duration': self.duration,
+            'file_path': file_path
+        }
@@ -0,0 +1,234 @@
+"""
+Micro-benchmarks for the service hot paths, with regression thresholds.
+
+Each case runs a function on a realistic fixture and compares the best time
+per call against a budget. With --baseline, it is also compared against an
+earlier run. The script exits non-zero if a case goes over its budget, or
+regresses by more than --max-regression against the baseline, so it can gate
+CI.
+
+Cases:
+- parse_summary_response on a long structured GPT output
+- _process_combined_transcript on a three-hour transcript
+- _format_timestamp over a multi-hour range
+- the dashboard summary serialization on 1,000 rows
+- JWT encode/decode in core.auth
+- bcrypt hashing and verification in core.auth. These have a floor as well
+  as a budget, because a much faster hash means the work factor dropped.
+
+Usage (from the backend directory):
+    python benchmarks/service_microbenchmarks.py [--repeat 5] [--only jwt] [--output results.json]
+        [--baseline previous.json] [--max-regression 1.25]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Callable, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class Case:
+    """
+    One benchmark: a setup callable that builds the fixture and returns the
+    function to time, plus its per-call budget (and optional floor) in
+    milliseconds. Setup runs only for the cases that are selected.
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], Any]], number: int, budget_ms: float, floor_ms: Optional[float] = None):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.budget_ms = budget_ms
+        self.floor_ms = floor_ms
+
+    def run(self, repeat: int) -> Dict[str, Any]:
+        func = self.setup()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(self.number):
+                func()
+            timings.append((time.perf_counter() - started) / self.number * 1000)
+        return {
+            "best_ms": round(min(timings), 6),
+            "median_ms": round(statistics.median(timings), 6),
+            "number": self.number,
+            "repeat": repeat,
+            "budget_ms": self.budget_ms,
+            "floor_ms": self.floor_ms
+        }
+
+def long_summary_output(key_points: int = 400, seed: int = 7) -> str:
+    """A structured summary the size of a long-meeting GPT response, in the formats the parser accepts"""
+    from transcript_formatter_benchmark import VOCABULARY
+
+    rng = random.Random(seed)
+
+    def sentence(low: int = 8, high: int = 30) -> str:
+        return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(low, high))).capitalize()
+
+    lines = ["## Overview"]
+    lines += [sentence(30, 80) + "." for _ in range(12)]
+    for header, count in (("## Key Points", key_points), ("## Action Items", key_points // 2), ("## Notable Quotes", key_points // 4)):
+        lines += ["", header]
+        for i in range(count):
+            style = i % 3
+            if style == 0:
+                lines.append(f"- {sentence()}")
+            elif style == 1:
+                lines.append(f"{i % 9 + 1}. {sentence()}")
+            else:
+                lines.append(f"* {sentence()}")
+            # Wrapped bullets continue on the next line
+            if rng.random() < 0.25:
+                lines.append(sentence(4, 12))
+    return "\n".join(lines)
+
+def dashboard_rows(count: int = 1000) -> List[Any]:
+    """Transient Summary instances like a 1,000-row dashboard page"""
+    from app.models.summary import Summary
+
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Summary(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            user_id="benchmark",
+            title=f"Weekly sync {i}",
+            status="completed" if i % 10 else "processing",
+            source_type="youtube" if i % 2 else "file_upload",
+            created_at=created + timedelta(hours=i),
+            duration_seconds=(i % 180) * 60.0 if i % 7 else None,
+            minutes_charged=(i % 180) if i % 7 else 0
+        )
+        for i in range(count)
+    ]
+
+def bare_service():
+    # The timed methods don't use instance state; skipping __init__ avoids
+    # creating API clients, caches and the transcription backend
+    from app.services.openai_service import OpenAIService
+    return OpenAIService.__new__(OpenAIService)
+
+def parse_summary_case() -> Callable[[], Any]:
+    service = bare_service()
+    summary_output = long_summary_output()
+    return lambda: service.parse_summary_response(summary_output)
+
+def process_transcript_case() -> Callable[[], Any]:
+    from transcript_formatter_benchmark import synthetic_transcript
+
+    service = bare_service()
+    # Three hours at ~150 words per minute
+    transcript = synthetic_transcript(27000)
+    return lambda: service._process_combined_transcript(transcript)
+
+def format_timestamps_case() -> Callable[[], Any]:
+    service = bare_service()
+    timestamps = [i * 1.37 for i in range(10000)]
+
+    def format_timestamps():
+        for seconds in timestamps:
+            service._format_timestamp(seconds)
+    return format_timestamps
+
+def dashboard_case() -> Callable[[], Any]:
+    from app.api.endpoints.dashboard import format_dashboard_summaries
+
+    rows = dashboard_rows(1000)
+    return lambda: format_dashboard_summaries(rows)
+
+def jwt_encode_case() -> Callable[[], Any]:
+    from app.core.auth import create_access_token
+
+    return lambda: create_access_token({"sub": "benchmark@scribeit.local"})
+
+def jwt_decode_case() -> Callable[[], Any]:
+    from jose import jwt
+    from app.core.auth import create_access_token, SECRET_KEY, ALGORITHM
+
+    token = create_access_token({"sub": "benchmark@scribeit.local"})
+    return lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def bcrypt_hash_case() -> Callable[[], Any]:
+    from app.core.auth import get_password_hash
+
+    return lambda: get_password_hash("correct horse battery staple")
+
+def bcrypt_verify_case() -> Callable[[], Any]:
+    from app.core.auth import get_password_hash, verify_password
+
+    password_hash = get_password_hash("correct horse battery staple")
+    return lambda: verify_password("correct horse battery staple", password_hash)
+
+def build_cases() -> List[Case]:
+    return [
+        Case("parse_summary_response", parse_summary_case, 20, budget_ms=50),
+        Case("process_combined_transcript", process_transcript_case, 5, budget_ms=100),
+        # 10,000 calls per iteration
+        Case("format_timestamp_x10000", format_timestamps_case, 5, budget_ms=100),
+        Case("dashboard_serialize_1000", dashboard_case, 10, budget_ms=50),
+        Case("jwt_encode", jwt_encode_case, 200, budget_ms=2),
+        Case("jwt_decode", jwt_decode_case, 200, budget_ms=2),
+        Case("bcrypt_hash", bcrypt_hash_case, 3, budget_ms=1500, floor_ms=50),
+        Case("bcrypt_verify", bcrypt_verify_case, 3, budget_ms=1500, floor_ms=50)
+    ]
+
+def check(name: str, result: Dict[str, Any], baseline: Optional[Dict[str, Any]], max_regression: float) -> List[str]:
+    failures = []
+    best = result["best_ms"]
+    if best > result["budget_ms"]:
+        failures.append(f"{name}: {best:.3f} ms is over the {result['budget_ms']} ms budget")
+    if result["floor_ms"] is not None and best < result["floor_ms"]:
+        failures.append(f"{name}: {best:.3f} ms is under the {result['floor_ms']} ms floor")
+    previous = (baseline or {}).get("cases", {}).get(name)
+    if previous and best > previous["best_ms"] * max_regression:
+        failures.append(f"{name}: {best:.3f} ms regressed from {previous['best_ms']:.3f} ms (limit {max_regression:.2f}x)")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Run only cases whose name contains this text")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="Allowed slowdown factor against the baseline")
+    args = parser.parse_args()
+
+    # Import from the app package and the sibling benchmarks; the app modules are
+    # only imported by the selected cases' setup
+    sys.path.append(BACKEND_DIR)
+    sys.path.append(BENCHMARKS_DIR)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {}
+    failures = []
+    print(f"{'case':>28} {'best ms':>11} {'median ms':>11} {'budget ms':>10} {'vs baseline':>12}")
+    cases = [case for case in build_cases() if not args.only or args.only in case.name]
+    for case in cases:
+        result = case.run(args.repeat)
+        results[case.name] = result
+        previous = (baseline or {}).get("cases", {}).get(case.name)
+        change = f"{result['best_ms'] / previous['best_ms'] - 1:+.1%}" if previous else ""
+        print(f"{case.name:>28} {result['best_ms']:>11.4f} {result['median_ms']:>11.4f} {case.budget_ms:>10} {change:>12}")
+        failures += check(case.name, result, baseline, args.max_regression)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"created_at": datetime.now(timezone.utc).isoformat(), "cases": results}, output_file, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
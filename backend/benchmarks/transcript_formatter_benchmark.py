@@ -0,0 +1,113 @@
+"""
+Benchmark the transcript post-processor against the previous implementation.
+
+Exits non-zero when the current formatter is slower than the legacy one on any
+input shape.
+
+Usage (from the backend directory):
+    python benchmarks/transcript_formatter_benchmark.py [--words 50000] [--repeat 7] [--min-speedup 1.0]
+"""
+import gc
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.transcript_formatter import format_combined_transcript
+
+VOCABULARY = (
+    "the a we to and of that is it in for you this so on with about our they have "
+    "meeting project budget quarter team customer release plan review design update "
+    "think need going next week really just like right okay yeah because which would"
+).split()
+
+EXTRAS = ["3.5", "1,200", "10:30", "e.g.", "U.S.", "https://example.com/docs", "Dr.", "v2.0"]
+
+def legacy_process_combined_transcript(text: str) -> str:
+    """Previous OpenAIService._process_combined_transcript, kept for comparison"""
+    if not text:
+        return ""
+    processed = '\n\n'.join(p.strip() for p in text.split('\n') if p.strip())
+    processed = processed.replace('. a', '. A')
+    processed = processed.replace('. t', '. T')
+    processed = processed.replace('. i', '. I')
+    for punct in ['.', ',', '!', '?', ';', ':']:
+        processed = processed.replace(f"{punct}", f"{punct} ")
+        processed = processed.replace("  ", " ")
+    for punct in ['.', ',', '!', '?']:
+        processed = processed.replace(f"{punct}{punct}", f"{punct}")
+    for end_punct in ['. ', '! ', '? ']:
+        segments = processed.split(end_punct)
+        for i in range(1, len(segments)):
+            if segments[i] and segments[i][0].islower():
+                segments[i] = segments[i][0].upper() + segments[i][1:]
+        processed = end_punct.join(segments)
+    return processed.strip()
+
+def synthetic_transcript(words: int, lowercase_rate: float = 0.2, sentence_words: tuple = (6, 24), seed: int = 42) -> str:
+    """Whisper-like text with some lowercase sentence starts, glued punctuation and segment breaks"""
+    rng = random.Random(seed)
+    parts = []
+    count = 0
+    while count < words:
+        length = rng.randint(*sentence_words)
+        sentence = [rng.choice(VOCABULARY) for _ in range(length)]
+        if rng.random() < 0.2:
+            sentence.insert(rng.randrange(length), rng.choice(EXTRAS))
+        if rng.random() < 0.3:
+            sentence[rng.randrange(length)] += ","
+        if rng.random() >= lowercase_rate:
+            sentence[0] = sentence[0].capitalize()
+        ending = rng.choice([". ", ". ", ". ", "? ", "! ", ".", ".. "])
+        parts.append(" ".join(sentence) + ending)
+        count += len(sentence)
+        # Segment boundary roughly every 750 words
+        if rng.random() < length / 750:
+            parts.append("\n\n")
+    return "".join(parts)
+
+def best_time(func, text: str, repeat: int) -> float:
+    # CPU time of the process, so a busy host does not skew one side of the comparison
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.process_time()
+            func(text)
+            timings.append(time.process_time() - started)
+    finally:
+        gc.enable()
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-speedup", type=float, default=1.0, help="Fail when the current formatter is slower than this against legacy")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'lowercase starts':>16} {'sentence words':>15} {'chars':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    # From typical Whisper output to worst case (no sentence capitalized), then
+    # short sentences, where sentence ends are densest
+    for lowercase_rate, sentence_words in ((0.05, (6, 24)), (0.2, (6, 24)), (1.0, (6, 24)), (0.2, (4, 10)), (1.0, (4, 10))):
+        text = synthetic_transcript(args.words, lowercase_rate, sentence_words)
+        legacy = best_time(legacy_process_combined_transcript, text, args.repeat)
+        current = best_time(format_combined_transcript, text, args.repeat)
+        speedup = legacy / current
+        shape = f"{sentence_words[0]}-{sentence_words[1]}"
+        print(f"{lowercase_rate:>16.0%} {shape:>15} {len(text):>9} {legacy * 1000:>10.2f} {current * 1000:>11.2f} {speedup:>7.2f}x")
+        if speedup < args.min_speedup:
+            failures.append(f"{lowercase_rate:.0%} lowercase starts, {shape} words per sentence: {speedup:.2f}x legacy")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
+import asyncio
 from dotenv import load_dotenv
 
 from app.api.api import api_router
+from app.services.job_worker import JobWorker
+from app.services.admission_control import admission_controller
+from app.db.database import SessionLocal
 
 # Load environment variables
 load_dotenv()
@@ -28,18 +33,54 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router)
 
+# Jobs run in dedicated workers (worker.py); JOB_QUEUE_EMBEDDED_WORKER=true runs one inside
+# the API process instead, for single-process development setups
+@app.on_event("startup")
+async def start_embedded_worker():
+    app.state.job_worker = None
+    if os.getenv("JOB_QUEUE_EMBEDDED_WORKER", "false").lower() == "true":
+        app.state.job_worker = JobWorker()
+        app.state.job_worker_task = asyncio.create_task(app.state.job_worker.run())
+
+@app.on_event("shutdown")
+async def stop_embedded_worker():
+    if app.state.job_worker is not None:
+        await app.state.job_worker.stop()
+        await app.state.job_worker_task
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "message": "Service is running"}
 
+# Readiness check for load balancers: not ready while the database is
+# unreachable or the processing backlog is over its admission limits
+@app.get("/ready")
+def readiness_check():
+    db = SessionLocal()
+    try:
+        readiness = admission_controller.readiness(db)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "message": str(e)})
+    finally:
+        db.close()
+    
+    if not readiness["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "overloaded", **readiness},
+            headers={"Retry-After": str(readiness["retry_after"])}
+        )
+    return {"status": "ready", **readiness}
+
 # Root endpoint
 @app.get("/")
 async def root():
     return {
         "message": "Welcome to ScribeIt API",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready"
     }
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@ load_dotenv()
 # Import models
 from app.models.user import User
 from app.models.summary import Summary
+from app.models.transcript_chunk import TranscriptChunk
+from app.models.job import Job
 from app.db.database import Base
 
 # this is the Alembic Config object, which provides
@@ -81,8 +83,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Commit and stamp each revision on its own, so a failure in one
+        # revision doesn't leave the ones before it applied but unrecorded
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -0,0 +1,85 @@
+"""Add full-text search to summaries
+
+Revision ID: e4b9d2a17c58
+Revises: c3e87f05a6d1
+Create Date: 2026-10-16 13:41:27.905316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9d2a17c58'
+down_revision = 'c3e87f05a6d1'
+branch_labels = None
+depends_on = None
+
+# Rows updated per transaction while backfilling existing summaries
+BACKFILL_BATCH_SIZE = 500
+
+# Title ranks highest, then the summary and key points, then the transcription
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION summaries_search_vector(title text, summary_text text, key_points json, transcription text)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(summary_text, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(key_points::text, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(transcription, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE
+"""
+
+SEARCH_VECTOR_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION summaries_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := summaries_search_vector(NEW.title, NEW.summary_text, NEW.key_points, NEW.transcription);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER summaries_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, summary_text, key_points, transcription ON summaries
+FOR EACH ROW EXECUTE FUNCTION summaries_search_vector_update()
+"""
+
+BACKFILL_BATCH = """
+UPDATE summaries
+SET search_vector = summaries_search_vector(title, summary_text, key_points, transcription)
+WHERE id IN (
+    SELECT id FROM summaries
+    WHERE search_vector IS NULL
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+"""
+
+
+def upgrade() -> None:
+    # The backfill commits everything before it, so the DDL is idempotent: if a
+    # later step fails before the revision is stamped, rerunning it succeeds
+    op.execute("ALTER TABLE summaries ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(SEARCH_VECTOR_TRIGGER_FUNCTION)
+    op.execute("DROP TRIGGER IF EXISTS summaries_search_vector_trigger ON summaries")
+    op.execute(SEARCH_VECTOR_TRIGGER)
+
+    # Backfill existing rows in small committed batches so the table is never
+    # locked for the whole backfill. New writes are covered by the trigger.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            result = connection.execute(sa.text(BACKFILL_BATCH), {"batch_size": BACKFILL_BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summaries_search_vector ON summaries USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summaries_search_vector', table_name='summaries', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS summaries_search_vector_trigger ON summaries")
+    op.execute("DROP FUNCTION IF EXISTS summaries_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS summaries_search_vector(text, text, json, text)")
+    op.drop_column('summaries', 'search_vector')
@@ -1,4 +1,5 @@
 @echo off
 cd %~dp0
 echo Starting ScribeIt Backend...
+start "ScribeIt Worker" python worker.py
 uvicorn main:app --host 0.0.0.0 --port 8000 --reload 
\ No newline at end of file
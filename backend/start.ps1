@@ -2,4 +2,5 @@ $scriptPath = Split-Path -Parent $MyInvocation.MyCommand.Path
 Set-Location $scriptPath
 
 Write-Host "Starting ScribeIt Backend..." -ForegroundColor Green
+Start-Process python -ArgumentList "worker.py" -WorkingDirectory $scriptPath
 uvicorn main:app --host 0.0.0.0 --port 8000 --reload 
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import sys
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+# Make the app package importable when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture
+def postgres_url():
+    """
+    URL of an empty database created for the test on the Postgres server at
+    TEST_DATABASE_URL, and dropped afterwards
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine, text
+
+    name = f"scribeit_test_{uuid.uuid4().hex[:12]}"
+    server = create_engine(url, isolation_level="AUTOCOMMIT")
+    with server.connect() as connection:
+        connection.execute(text(f'CREATE DATABASE "{name}"'))
+    try:
+        yield urlunsplit(urlsplit(url)._replace(path=f"/{name}"))
+    finally:
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        server.dispose()
+
+@pytest.fixture
+def postgres_db(postgres_url):
+    """
+    Session on a scratch Postgres database with the tables created from the
+    models. Uses its own engine, since other tests may already have imported
+    app.db.database with the configured DATABASE_URL.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import Base
+    # Register every table
+    from app.models import user, summary, transcript_chunk, job  # noqa: F401
+
+    engine = create_engine(postgres_url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.admission_control import AdmissionController
+
+def _controller(monkeypatch, snapshot, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    controller = AdmissionController()
+    # Serve a fixed backlog instead of querying the jobs table
+    controller._snapshot = snapshot
+    controller._snapshot_expire = math.inf
+    return controller
+
+def _snapshot(queued=0, running=0, backlog_seconds=0.0, slots=4, ratio=0.3):
+    return {
+        "queued": queued,
+        "running": running,
+        "processing_ratio": ratio,
+        "worker_slots": slots,
+        "backlog_seconds": backlog_seconds,
+        "eta_seconds": backlog_seconds / slots
+    }
+
+def test_retry_after_is_clamped(monkeypatch):
+    controller = _controller(monkeypatch, _snapshot(), ADMISSION_MIN_RETRY_AFTER_SECONDS=5, ADMISSION_MAX_RETRY_AFTER_SECONDS=600)
+    assert controller._clamp(0.2) == 5
+    assert controller._clamp(42.1) == 43
+    assert controller._clamp(10_000) == 600
+
+def test_no_overload_under_the_limits(monkeypatch):
+    controller = _controller(monkeypatch, _snapshot(queued=10, backlog_seconds=4000), ADMISSION_MAX_BACKLOG_SECONDS=3600)
+    assert controller.overload(db=None) is None
+
+def test_backlog_over_limit_retries_when_it_drains_back(monkeypatch):
+    controller = _controller(
+        monkeypatch,
+        _snapshot(queued=50, backlog_seconds=4 * 4000),
+        ADMISSION_MAX_BACKLOG_SECONDS=3600
+    )
+    overload = controller.overload(db=None)
+    assert overload["retry_after"] == 400
+
+def test_queue_length_over_limit_retries_after_excess_jobs_drain(monkeypatch):
+    controller = _controller(
+        monkeypatch,
+        _snapshot(queued=12, running=0, backlog_seconds=1200, slots=2),
+        ADMISSION_MAX_QUEUED_JOBS=10,
+        ADMISSION_MAX_BACKLOG_SECONDS=100000
+    )
+    # 100s of work per job, 3 jobs over the limit, 2 slots
+    assert controller.overload(db=None)["retry_after"] == 150
+
+def test_eta_adds_own_processing_to_the_queue_wait(monkeypatch):
+    controller = _controller(monkeypatch, _snapshot(backlog_seconds=800, slots=4, ratio=0.5))
+    assert controller.eta_seconds(db=None, duration_seconds=600) == 200 + 300
+
+def test_disabled_admits_everything(monkeypatch):
+    controller = _controller(monkeypatch, _snapshot(queued=10**6, backlog_seconds=10**9), ADMISSION_CONTROL_ENABLED="false")
+    assert controller.admit(db=None, user_id="u") == {"admitted": True}
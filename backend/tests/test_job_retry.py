@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.user import User
+from app.models.summary import Summary
+from app.models.job import Job
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobQueue, PermanentJobError
+from app.services.job_worker import JobWorker
+
+@pytest.fixture
+def queue(postgres_db, monkeypatch):
+    # The queue opens its own sessions; point them at the scratch database
+    monkeypatch.setattr(job_queue_module, "WorkerSessionLocal", sessionmaker(bind=postgres_db.get_bind()))
+    queue = JobQueue()
+    queue.retry_delay_seconds = 0
+    queue.max_attempts = 3
+    return queue
+
+def _enqueue(db, queue):
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    summary = Summary(user_id=user.id, source_type="file_upload", status="pending")
+    db.add(summary)
+    db.flush()
+    job = queue.enqueue(db, summary.id, "media_file", user_id=user.id)
+    db.commit()
+    return summary, job
+
+def _run_next(worker):
+    """Claim the next job and run it to the end, as a worker slot does"""
+    job = worker.queue.claim(worker.worker_id)
+    assert job is not None
+    asyncio.run(worker._execute(job))
+    return job
+
+def _mark_processing(db, summary_id):
+    db.query(Summary).filter(Summary.id == summary_id).update({"status": "processing"})
+    db.commit()
+
+def test_job_that_raises_once_is_retried_and_completes(postgres_db, queue):
+    db = postgres_db
+    summary, job = _enqueue(db, queue)
+    calls = []
+
+    async def handler(claimed):
+        calls.append(claimed["attempts"])
+        _mark_processing(db, claimed["summary_id"])
+        if len(calls) == 1:
+            raise ConnectionError("S3 download timed out")
+        db.query(Summary).filter(Summary.id == claimed["summary_id"]).update({"status": "completed"})
+        db.commit()
+        return None
+
+    worker = JobWorker(queue=queue, handlers={"media_file": handler}, concurrency=1)
+
+    _run_next(worker)
+    db.expire_all()
+    assert db.get(Job, job.id).status == "queued"
+    assert db.get(Job, job.id).last_error == "S3 download timed out"
+    # Waiting for its retry, not failed
+    assert db.get(Summary, summary.id).status == "pending"
+
+    _run_next(worker)
+    db.expire_all()
+    assert calls == [1, 2]
+    assert db.get(Job, job.id).status == "completed"
+    assert db.get(Summary, summary.id).status == "completed"
+
+def test_summary_fails_once_attempts_are_used_up(postgres_db, queue):
+    db = postgres_db
+    summary, job = _enqueue(db, queue)
+
+    async def handler(claimed):
+        _mark_processing(db, claimed["summary_id"])
+        raise ConnectionError("OpenAI unavailable")
+
+    worker = JobWorker(queue=queue, handlers={"media_file": handler}, concurrency=1)
+    for _ in range(3):
+        _run_next(worker)
+
+    db.expire_all()
+    assert db.get(Job, job.id).status == "failed"
+    assert db.get(Job, job.id).attempts == 3
+    assert db.get(Summary, summary.id).status == "failed"
+    assert db.get(Summary, summary.id).error_message == "OpenAI unavailable"
+    assert queue.claim(worker.worker_id) is None
+
+def test_permanent_error_fails_without_retrying(postgres_db, queue):
+    db = postgres_db
+    summary, job = _enqueue(db, queue)
+
+    async def handler(claimed):
+        raise PermanentJobError("This video is private.")
+
+    worker = JobWorker(queue=queue, handlers={"media_file": handler}, concurrency=1)
+    _run_next(worker)
+
+    db.expire_all()
+    assert db.get(Job, job.id).status == "failed"
+    assert db.get(Job, job.id).attempts == 1
+    assert db.get(Summary, summary.id).error_message == "This video is private."
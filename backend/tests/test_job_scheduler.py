@@ -0,0 +1,45 @@
+from app.services.job_scheduler import FairScheduler, parse_tier_setting
+
+def _job(job_id, user_id, duration=None, run_at=0.0):
+    return {"id": job_id, "user_id": user_id, "duration_seconds": duration, "run_at": run_at}
+
+def _ids(jobs):
+    return [job["id"] for job in jobs]
+
+def test_parse_tier_setting_keeps_defaults_and_skips_invalid():
+    settings = parse_tier_setting("pro:8, basic:x,enterprise:16", {"free": 1.0, "pro": 4.0})
+    assert settings == {"free": 1.0, "pro": 8.0, "enterprise": 16.0}
+
+def test_higher_tier_gets_a_larger_share():
+    scheduler = FairScheduler()
+    jobs = [_job(f"free-{i}", "free-user", 600, run_at=i) for i in range(4)]
+    jobs += [_job(f"pro-{i}", "pro-user", 600, run_at=10 + i) for i in range(4)]
+    ordered = _ids(scheduler.order(jobs, {"free-user": "free", "pro-user": "pro"}, respect_caps=False))
+    # Pro's weight is 4: it gets four turns for each free turn despite arriving later
+    assert ordered[:3] == ["pro-0", "pro-1", "pro-2"]
+    assert sum(job_id.startswith("pro") for job_id in ordered[:5]) == 4
+    assert len(ordered) == len(jobs)
+
+def test_recent_service_lowers_priority():
+    scheduler = FairScheduler()
+    jobs = [_job("a", "busy", 600), _job("b", "idle", 600, run_at=5)]
+    ordered = scheduler.order(jobs, {}, service={"busy": 7200.0}, respect_caps=False)
+    assert _ids(ordered) == ["b", "a"]
+
+def test_short_jobs_are_boosted_within_a_user():
+    scheduler = FairScheduler()
+    jobs = [_job("long", "u", 3600, run_at=0), _job("short", "u", 120, run_at=60)]
+    assert _ids(scheduler.order(jobs, {}, respect_caps=False)) == ["short", "long"]
+
+def test_running_caps_leave_out_users_at_their_limit():
+    scheduler = FairScheduler()
+    jobs = [_job("f1", "free-user", 60), _job("f2", "free-user", 60), _job("b1", "basic-user", 60)]
+    tiers = {"free-user": "free", "basic-user": "basic"}
+    assert _ids(scheduler.order(jobs, tiers, running={"free-user": 1})) == ["b1"]
+    # Free users run one job at a time, so only their first job is offered
+    assert sorted(_ids(scheduler.order(jobs, tiers))) == ["b1", "f1"]
+
+def test_jobs_without_owner_are_scheduled():
+    scheduler = FairScheduler()
+    jobs = [_job("x", None, 60), _job("y", "u", 60, run_at=1)]
+    assert sorted(_ids(scheduler.order(jobs, {}, respect_caps=False))) == ["x", "y"]
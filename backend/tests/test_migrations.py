@@ -0,0 +1,89 @@
+import os
+import uuid
+from importlib import import_module
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("alembic")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.services.youtube_dedup import canonical_video_id
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+search_migration = import_module("migrations.versions.e4b9d2a17c58_add_summary_search")
+
+def _alembic_config(url, monkeypatch):
+    # migrations/env.py takes the URL from DATABASE_URL. No ini file, so it
+    # leaves the test run's logging configuration alone.
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+def test_upgrade_downgrade_and_models_match(postgres_url, monkeypatch):
+    config = _alembic_config(postgres_url, monkeypatch)
+
+    command.upgrade(config, "head")
+    command.downgrade(config, "dbc1ea0d7a3c")
+    command.upgrade(config, "head")
+    # Raises if the migrated schema differs from the models
+    command.check(config)
+
+def test_search_migration_reruns_over_its_committed_ddl(postgres_url, monkeypatch):
+    config = _alembic_config(postgres_url, monkeypatch)
+    command.upgrade(config, "c3e87f05a6d1")
+
+    # What a failed run leaves behind: the backfill committed the column,
+    # functions and trigger, but e4b9d2a17c58 was never stamped
+    engine = create_engine(postgres_url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE summaries ADD COLUMN search_vector tsvector"))
+            connection.execute(text(search_migration.SEARCH_VECTOR_FUNCTION))
+            connection.execute(text(search_migration.SEARCH_VECTOR_TRIGGER_FUNCTION))
+            connection.execute(text(search_migration.SEARCH_VECTOR_TRIGGER))
+    finally:
+        engine.dispose()
+
+    command.upgrade(config, "head")
+    command.check(config)
+
+def test_video_id_backfill_only_takes_youtube_urls(postgres_url, monkeypatch):
+    config = _alembic_config(postgres_url, monkeypatch)
+    command.upgrade(config, "a9c3f5e81d27")
+
+    urls = [
+        "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=3",
+        "https://youtu.be/dQw4w9WgXcQ?t=10",
+        "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+        "https://evil.com/watch?v=dQw4w9WgXcQ",
+        "https://youtube.com.evil.com/embed/dQw4w9WgXcQ",
+        "https://evil.com/?u=https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQxx",
+    ]
+    engine = create_engine(postgres_url)
+    try:
+        with engine.begin() as connection:
+            user_id = str(uuid.uuid4())
+            connection.execute(text("INSERT INTO users (id, email) VALUES (:id, :email)"), {"id": user_id, "email": f"{user_id}@example.com"})
+            for url in urls:
+                connection.execute(
+                    text("INSERT INTO summaries (id, user_id, source_type, source_url, status) VALUES (:id, :user_id, 'youtube', :url, 'completed')"),
+                    {"id": str(uuid.uuid4()), "user_id": user_id, "url": url}
+                )
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as connection:
+            video_ids = dict(connection.execute(text("SELECT source_url, video_id FROM summaries")).all())
+    finally:
+        engine.dispose()
+
+    assert video_ids == {url: canonical_video_id(url) for url in urls}
+    assert sum(1 for video_id in video_ids.values() if video_id) == 4
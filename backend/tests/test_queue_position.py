@@ -0,0 +1,83 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import func
+
+from app.models.user import User
+from app.models.summary import Summary
+from app.models.job import Job
+from app.services.job_queue import job_queue
+from app.services.job_scheduler import fair_scheduler
+
+def _full_order(db):
+    """Every queued job ordered by the scheduler, as claims would hand them out"""
+    rows = db.query(
+        Job.id,
+        Job.user_id,
+        Job.duration_seconds,
+        func.extract("epoch", Job.run_at).label("run_at")
+    ).filter(Job.status == "queued").order_by(Job.created_at, Job.id).all()
+    jobs = [job_queue._schedulable(row) for row in rows]
+    user_ids = {job["user_id"] for job in jobs if job["user_id"]}
+    tiers = job_queue._tiers(db, user_ids)
+    service, running = job_queue._usage(db, user_ids)
+    return fair_scheduler.order(jobs, tiers, service, running, respect_caps=False)
+
+def _add_job(db, user, status, duration, created_at, locked_at=None):
+    summary = Summary(user_id=user.id, source_type="file_upload", status="pending")
+    db.add(summary)
+    db.flush()
+    job = Job(
+        summary_id=summary.id,
+        user_id=user.id,
+        kind="media_file",
+        status=status,
+        duration_seconds=duration,
+        run_at=created_at,
+        created_at=created_at,
+        locked_at=locked_at
+    )
+    db.add(job)
+    return job
+
+def test_queue_position_matches_the_full_scheduler_order(postgres_db):
+    db = postgres_db
+    rng = random.Random(3)
+    users = []
+    for tier in ("free", "free", "basic", "pro", "pro", None):
+        user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", subscription_tier=tier)
+        db.add(user)
+        users.append(user)
+    db.flush()
+
+    start = datetime.now(timezone.utc) - timedelta(hours=2)
+    durations = [None, 60, 300, 600, 1200, 1800, 3600, 7200]
+    for i in range(60):
+        user = rng.choice(users)
+        _add_job(db, user, "queued", rng.choice(durations), start + timedelta(seconds=rng.randrange(0, 7000)) + timedelta(microseconds=i))
+    # Recent service: running jobs and jobs started within the fair share window
+    for user in users[:4]:
+        _add_job(db, user, "running", rng.choice(durations), start, locked_at=datetime.now(timezone.utc))
+        _add_job(db, user, "completed", rng.choice(durations), start, locked_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+    db.commit()
+
+    ordered = _full_order(db)
+    assert len(ordered) == 60
+    for expected, job in enumerate(ordered, start=1):
+        summary_id = db.query(Job.summary_id).filter(Job.id == job["id"]).scalar()
+        assert job_queue.queue_position(db, summary_id) == {"queue_position": expected, "queue_length": 60}
+
+def test_queue_position_is_none_once_the_job_runs(postgres_db):
+    db = postgres_db
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    job = _add_job(db, user, "running", 600, datetime.now(timezone.utc))
+    db.commit()
+
+    assert job_queue.queue_position(db, job.summary_id) == {"queue_position": None, "queue_length": None}
@@ -0,0 +1,60 @@
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import MemoryRateLimitStore, TokenBucket, parse_reset_duration
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "time", clock.time)
+    return clock
+
+def test_reservations_within_capacity_do_not_wait(clock):
+    bucket = TokenBucket(MemoryRateLimitStore(), "requests", per_minute=60)
+    assert all(bucket.reserve(1) == 0.0 for _ in range(60))
+
+def test_waiters_are_spaced_by_the_refill_rate(clock):
+    bucket = TokenBucket(MemoryRateLimitStore(), "requests", per_minute=60)
+    for _ in range(60):
+        bucket.reserve(1)
+    # One token per second: each further caller waits one second longer
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    clock.now += 2.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+def test_reservation_larger_than_capacity_is_capped(clock):
+    bucket = TokenBucket(MemoryRateLimitStore(), "tokens", per_minute=1000)
+    assert bucket.reserve(5000) == 0.0
+    assert bucket.reserve(500) == pytest.approx(30.0)
+
+def test_update_adopts_reported_limits(clock):
+    bucket = TokenBucket(MemoryRateLimitStore(), "requests", per_minute=60)
+    bucket.update(limit=120, remaining=0, reset_seconds=5.0)
+    # Paused until the reset, then one request every half second
+    assert bucket.reserve(1) == pytest.approx(5.0)
+    clock.now += 10.0
+    assert bucket.reserve(1) == 0.0
+
+def test_pause_holds_back_callers(clock):
+    bucket = TokenBucket(MemoryRateLimitStore(), "requests", per_minute=60)
+    bucket.pause(3.0)
+    assert bucket.reserve(1) == pytest.approx(3.0)
+
+@pytest.mark.parametrize("value,seconds", [
+    ("1s", 1.0),
+    ("6m0s", 360.0),
+    ("20ms", 0.02),
+    ("1h2m3.5s", 3723.5),
+    ("", 0.0),
+    (None, 0.0),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == pytest.approx(seconds)
@@ -0,0 +1,52 @@
+import uuid
+
+import pytest
+
+# Runs against a scratch Postgres database (the postgres_db fixture): full-text
+# search and ts_rank_cd have no stand-in
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+from sqlalchemy import func
+
+from app.models.user import User
+from app.models.summary import Summary
+from app.api.endpoints.dashboard import search_summaries
+
+def _search(db, user, q, limit, cursor=None):
+    return search_summaries(q=q, limit=limit, cursor=cursor, db=db, current_user=user)
+
+def test_paging_through_tied_ranks_returns_every_match_once(postgres_db):
+    db = postgres_db
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+
+    # Identical documents rank identically, so every page boundary falls on a tie
+    documents = ["weekly budget meeting"] * 7 + ["budget"] * 3 + ["budget meeting about the budget"] * 2
+    expected = set()
+    for text in documents:
+        summary = Summary(
+            user_id=user.id,
+            title=text,
+            source_type="file_upload",
+            status="completed",
+            summary_text=text,
+            search_vector=func.to_tsvector("english", text)
+        )
+        db.add(summary)
+        db.flush()
+        expected.add(summary.id)
+    db.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = _search(db, user, "budget", limit=2, cursor=cursor)
+        seen.extend(result["id"] for result in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
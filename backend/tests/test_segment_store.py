@@ -0,0 +1,85 @@
+from app.services.segment_store import SegmentStore, TranscriptAlignment
+from app.services.transcript_formatter import format_combined_transcript
+
+def _store():
+    return SegmentStore.from_segments([
+        (0.0, 4.0, " so welcome everyone,today we cover the budget."),
+        (4.0, 9.5, " next item is hiring.. we need two engineers"),
+        (9.5, 15.0, " questions? email ops@example.com by friday."),
+    ])
+
+def test_alignment_maps_transcript_offsets_to_segment_times():
+    store = _store()
+    transcript = format_combined_transcript(store.text)
+    alignment = TranscriptAlignment(store.text, transcript)
+
+    # Offsets clients take from the formatted transcription land in the right segment
+    assert 4.0 <= store.time_at_offset(alignment.to_segments(transcript.index("Next item"))) < 9.5
+    assert 9.5 <= store.time_at_offset(alignment.to_segments(transcript.index("questions"))) <= 15.0
+    assert store.time_at_offset(alignment.to_segments(0)) < 0.5
+
+def test_alignment_maps_segment_spans_into_the_transcript():
+    store = _store()
+    transcript = format_combined_transcript(store.text)
+    alignment = TranscriptAlignment(store.text, transcript)
+
+    segment_start, segment_end = store.span_for_time(4.5, 9.0)
+    char_start = alignment.to_transcript(segment_start)
+    char_end = alignment.to_transcript(segment_end)
+    assert transcript[char_start:char_end].strip() == "Next item is hiring. We need two engineers"
+
+def test_alignment_skips_transcript_text_without_segments():
+    store = _store()
+    placeholder = " [Error transcribing segment 2 at 00:00:04] "
+    transcript = format_combined_transcript(store.text.replace(" next item", placeholder + "next item"))
+    alignment = TranscriptAlignment(store.text, transcript)
+
+    offset = transcript.index("questions")
+    assert 9.5 <= store.time_at_offset(alignment.to_segments(offset)) <= 15.0
+
+def test_span_for_time_covers_overlapping_segments():
+    store = _store()
+    char_start, char_end = store.span_for_time(3.0, 5.0)
+    assert (char_start, char_end) == (store.offsets[0], store.offsets[2])
+    assert store.text_for_time(10.0, 11.0) == "questions? email ops@example.com by friday."
+
+def test_span_for_time_between_or_after_segments_is_empty():
+    store = SegmentStore.from_segments([(0.0, 2.0, "one "), (5.0, 7.0, "two ")])
+    start, end = store.span_for_time(2.5, 4.5)
+    assert start == end == store.offsets[1]
+    start, end = store.span_for_time(8.0, 9.0)
+    assert start == end == len(store.text)
+
+def test_time_at_offset_interpolates_within_segment():
+    store = SegmentStore.from_segments([(0.0, 2.0, "abcd"), (10.0, 20.0, "0123456789")])
+    assert store.time_at_offset(0) == 0.0
+    assert store.time_at_offset(2) == 1.0
+    assert store.time_at_offset(9) == 15.0
+    # Offsets past the end clamp to the end of the last segment
+    assert store.time_at_offset(100) == 20.0
+    assert SegmentStore().time_at_offset(0) is None
+
+def test_round_trip_through_bytes():
+    store = _store()
+    store.append(15.0, 16.5, " café — naïve ✓")
+    loaded = SegmentStore.from_bytes(store.to_bytes())
+    assert list(loaded) == list(store)
+    assert loaded.text == store.text
+    assert list(loaded.offsets) == list(store.offsets)
+
+def test_from_bytes_rejects_other_blobs():
+    import pytest
+    with pytest.raises(ValueError):
+        SegmentStore.from_bytes(b"NOPE" + bytes(8))
+
+def test_extend_with_store_shifts_offsets():
+    first = SegmentStore.from_segments([{"start": 0.0, "end": 1.0, "text": "hello "}])
+    second = SegmentStore.from_segments([(1.0, 2.0, "big "), (2.0, 3.0, "world")])
+    first.extend(second)
+    assert [text for _, _, text in first] == ["hello ", "big ", "world"]
+    assert first.text_for_time(2.2, 2.8) == "world"
+
+def test_mapped_converts_times_and_keeps_text():
+    store = SegmentStore.from_segments([(0.0, 1.0, "a"), (1.0, 2.0, "b")])
+    shifted = store.mapped(lambda seconds: seconds + 60.0)
+    assert list(shifted) == [(60.0, 61.0, "a"), (61.0, 62.0, "b")]
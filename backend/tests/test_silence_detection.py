@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.silence_detection import TimeMap, parse_silencedetect_output, plan_segments
+
+SILENCEDETECT_LOG = """
+[silencedetect @ 0x55d5] silence_start: -0.0120
+[silencedetect @ 0x55d5] silence_end: 1.5 | silence_duration: 1.512
+size=N/A time=00:00:30.00 bitrate=N/A speed=400x
+[silencedetect @ 0x55d5] silence_start: 12.25
+[silencedetect @ 0x55d5] silence_end: 18.75 | silence_duration: 6.5
+[silencedetect @ 0x55d5] silence_start: 28.0
+"""
+
+def test_parse_silencedetect_output_closes_trailing_silence():
+    assert parse_silencedetect_output(SILENCEDETECT_LOG, 30.0) == [(0.0, 1.5), (12.25, 18.75), (28.0, 30.0)]
+
+def test_parse_silencedetect_output_without_silences():
+    assert parse_silencedetect_output("size=N/A time=00:01:00.00\n", 60.0) == []
+
+def test_time_map_maps_trimmed_time_back_to_original():
+    time_map = TimeMap([(0.0, 10.0), (20.0, 25.0)])
+    assert time_map.duration == 15.0
+    assert time_map.to_original(4.0) == 4.0
+    assert time_map.to_original(12.0) == 22.0
+    assert (time_map.original_start, time_map.original_end) == (0.0, 25.0)
+
+def test_time_map_slice_spans_a_removed_gap():
+    time_map = TimeMap([(0.0, 10.0), (20.0, 25.0)])
+    assert time_map.slice(8.0, 13.0).ranges == [(8.0, 10.0), (20.0, 23.0)]
+    assert TimeMap.offset(30.0, 5.0).to_original(1.0) == 31.0
+
+def test_plan_segments_without_silence_cuts_at_the_length():
+    segments = plan_segments(100.0, [], segment_length=40.0)
+    assert segments == [[(0.0, 40.0)], [(40.0, 80.0)], [(80.0, 100.0)]]
+
+def test_plan_segments_cuts_inside_short_pauses():
+    # A short pause at 35-35.5s is the last place to cut before 40s
+    segments = plan_segments(100.0, [(35.0, 35.5)], segment_length=40.0)
+    assert segments[0] == [(0.0, 35.25)]
+    assert segments[1][0][0] == 35.25
+
+def test_plan_segments_drops_long_silences_with_padding():
+    segments = plan_segments(60.0, [(20.0, 30.0)], segment_length=100.0, trim_seconds=2.0, padding=0.25)
+    assert segments == [[(0.0, 20.25), (29.75, 60.0)]]
+
+def test_plan_segments_never_exceeds_the_segment_length():
+    silences = [(start, start + 0.5) for start in range(7, 600, 13)]
+    for segment in plan_segments(600.0, silences, segment_length=60.0):
+        assert sum(end - start for start, end in segment) <= 60.0 + 1e-9
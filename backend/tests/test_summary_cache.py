@@ -0,0 +1,74 @@
+import pytest
+
+from app.services import summary_cache as summary_cache_module
+from app.services.summary_cache import MemorySummaryCacheBackend, DiskSummaryCacheBackend, SummaryCache
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(summary_cache_module.time, "time", clock.time)
+    return clock
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUMMARY_CACHE_ENABLED", "true")
+    return SummaryCache([
+        MemorySummaryCacheBackend(max_entries=2, ttl_seconds=60),
+        DiskSummaryCacheBackend(str(tmp_path), max_entries=10, ttl_seconds=60)
+    ])
+
+def test_memory_backend_expires_and_evicts_least_recently_used(clock):
+    backend = MemorySummaryCacheBackend(max_entries=2, ttl_seconds=60)
+    backend.put("a", "A")
+    backend.put("b", "B")
+    backend.get("a")
+    backend.put("c", "C")
+    assert backend.get("b") is None
+    assert backend.get("a") == "A"
+    clock.now += 61
+    assert backend.get("a") is None
+
+def test_disk_backend_round_trip_and_ttl(tmp_path, clock):
+    backend = DiskSummaryCacheBackend(str(tmp_path), max_entries=10, ttl_seconds=60)
+    backend.put("key", "Summary text")
+    assert backend.get("key") == "Summary text"
+    clock.now += 61
+    assert backend.get("key") is None
+    assert not list(tmp_path.glob("*.json"))
+
+def test_disk_hit_is_promoted_to_memory(cache):
+    memory, disk = cache.backends
+    disk.put("key", "Summary")
+    assert cache.get("key") == "Summary"
+    assert memory.get("key") == "Summary"
+    assert cache.get("key") == "Summary"
+    stats = cache.stats()
+    assert stats["hits_by_backend"] == {"memory": 1, "disk": 1}
+    assert stats["misses"] == 0
+
+def test_put_writes_every_tier_and_misses_are_counted(cache):
+    assert cache.get("missing") is None
+    cache.put("key", "Summary")
+    assert all(backend.get("key") == "Summary" for backend in cache.backends)
+    assert cache.stats()["misses"] == 1
+
+def test_disabled_cache_neither_stores_nor_returns(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUMMARY_CACHE_ENABLED", "false")
+    cache = SummaryCache([MemorySummaryCacheBackend(max_entries=2, ttl_seconds=60)])
+    cache.put("key", "Summary")
+    assert cache.get("key") is None
+
+def test_key_depends_on_every_input(cache):
+    key = cache.compute_key("text", "prompt", "gpt-4o", 0.3)
+    assert key == cache.compute_key("text", "prompt", "gpt-4o", 0.3)
+    assert key != cache.compute_key("text", "prompt", "gpt-4o", 0.4)
+    assert key != cache.compute_key("text", "other prompt", "gpt-4o", 0.3)
+    # Parts are delimited, so moving text between them changes the key
+    assert cache.compute_key("ab", "c", "m", 0.3) != cache.compute_key("b", "ac", "m", 0.3)
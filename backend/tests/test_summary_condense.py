@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("tenacity")
+
+from app.services.openai_service import OpenAIService
+
+def _service(chunk_tokens=4000, max_rounds=3):
+    # Skip __init__: no client or caches are needed to exercise the map-reduce loop
+    service = OpenAIService.__new__(OpenAIService)
+    service.logger = logging.getLogger(__name__)
+    service._token_encoding = None
+    service.summary_chunk_tokens = chunk_tokens
+    service.chunk_summary_max_tokens = 700
+    service.summary_max_tokens = 1000
+    service.max_condense_rounds = max_rounds
+    return service
+
+def test_condensing_stops_when_notes_stop_shrinking():
+    service = _service()
+    calls = []
+
+    def summarize_chunks(chunks):
+        calls.append(len(chunks))
+        # Notes as long as their input never fit two to a chunk
+        return ["x" * 4 * service.summary_chunk_tokens for _ in chunks]
+
+    service._summarize_chunks = summarize_chunks
+    service._create_summary_completion = lambda content, max_tokens: "Summary"
+
+    transcript = "\n\n".join("word " * 3000 for _ in range(4))
+    assert service._generate_summary_uncached(transcript, "Summarize") == "Summary"
+    # The map step plus one condense round that didn't reduce the notes
+    assert len(calls) == 2
+
+def test_condensing_is_capped_at_max_rounds():
+    service = _service(max_rounds=2)
+    calls = []
+
+    def summarize_chunks(chunks):
+        calls.append(len(chunks))
+        # Shrinks by one note per round, never below the budget
+        return ["y" * service.summary_chunk_tokens * 2 for _ in range(max(len(chunks) - 1, 2))]
+
+    service._summarize_chunks = summarize_chunks
+    service._create_summary_completion = lambda content, max_tokens: "Summary"
+
+    transcript = "\n\n".join("word " * 3000 for _ in range(10))
+    service._generate_summary_uncached(transcript, "Summarize")
+    assert len(calls) == 1 + 2
+
+def test_chunk_budget_too_small_for_notes_is_rejected(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("SUMMARY_CHUNK_TOKENS", "1400")
+    with pytest.raises(ValueError):
+        OpenAIService()
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from app.services.summary_parser import SummaryParser
+
+RESPONSE = """## Overview
+The team reviewed the Q3 budget and agreed to delay the office move.
+Hiring stays on track for two engineers.
+
+## Key Points
+- Budget is 5% under plan
+* Office move pushed to January
+• Vendor contract renewed
+1. Hiring: two backend engineers
+   with on-call experience
+2) Security review passed
+10. Double-digit numbered item
+
+## Action Items
+- Dana to send the revised budget by Friday
+3- Sam to book interviews
+continuation of Sam's item
+
+## Notable Quotes
+- "We can't afford another slip." - Dana
+  said after the budget review
+"""
+
+def reference_parse(summary_text):
+    """The line-based parser the incremental one replaced"""
+    result = {"summary": "", "key_points": [], "action_items": [], "notable_quotes": []}
+    current_section = None
+    for line in summary_text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        lowered = line.lower()
+        if "overview" in lowered or "summary" in lowered:
+            current_section = "summary"
+            continue
+        elif "key points" in lowered:
+            current_section = "key_points"
+            continue
+        elif "action items" in lowered:
+            current_section = "action_items"
+            continue
+        elif "notable quotes" in lowered:
+            current_section = "notable_quotes"
+            continue
+        if current_section == "summary":
+            result["summary"] = result["summary"] + " " + line if result["summary"] else line
+        elif current_section in ["key_points", "action_items", "notable_quotes"]:
+            if line.startswith("- ") or line.startswith("• ") or line.startswith("* "):
+                result[current_section].append(line.replace("- ", "").replace("• ", "").replace("* ", ""))
+            elif line[0].isdigit() and len(line) > 2 and line[1:3] in [". ", ") ", "- "]:
+                result[current_section].append(line[3:].strip())
+            elif result[current_section]:
+                result[current_section][-1] += " " + line
+    return result
+
+def parse_in_pieces(text, pieces):
+    parser = SummaryParser()
+    for piece in pieces:
+        parser.feed(piece)
+    parser.close()
+    return parser.result
+
+def split_at(text, cuts):
+    bounds = [0] + sorted(cuts) + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+@pytest.mark.parametrize("response", [RESPONSE, RESPONSE.rstrip("\n"), RESPONSE.replace("\n", "\r\n")])
+def test_whole_response_matches_the_line_based_parser(response):
+    assert parse_in_pieces(response, [response]) == reference_parse(response)
+
+def test_one_character_at_a_time_matches_whole():
+    assert parse_in_pieces(RESPONSE, list(RESPONSE)) == parse_in_pieces(RESPONSE, [RESPONSE])
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_splits_match_whole(seed):
+    rng = random.Random(seed)
+    response = RESPONSE.rstrip("\n") if seed % 2 else RESPONSE
+    cuts = rng.sample(range(1, len(response)), rng.randint(1, 40))
+    assert parse_in_pieces(response, split_at(response, cuts)) == parse_in_pieces(response, [response])
+
+def test_updates_track_the_result():
+    parser = SummaryParser()
+    latest = {}
+    for piece in split_at(RESPONSE, list(range(7, len(RESPONSE), 13))):
+        for update in parser.feed(piece):
+            latest[(update["section"], update["index"])] = update["text"]
+    for update in parser.close():
+        latest[(update["section"], update["index"])] = update["text"]
+
+    result = parser.snapshot()
+    assert latest[("summary", None)] == result["summary"]
+    for section in ("key_points", "action_items", "notable_quotes"):
+        assert [latest[(section, index)] for index in range(len(result[section]))] == result[section]
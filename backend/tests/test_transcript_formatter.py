@@ -0,0 +1,25 @@
+import pytest
+
+from app.services.transcript_formatter import format_combined_transcript
+
+@pytest.mark.parametrize("text, expected", [
+    ("hello there. how are you? fine! ok", "Hello there. How are you? Fine! Ok"),
+    ("first segment.second segment,with a comma", "First segment. Second segment, with a comma"),
+    ("doubled.. stop,, and!! end", "Doubled. Stop, and! End"),
+    ("she said \"go.\" then left", "She said \"go.\" Then left"),
+    ("well... maybe not", "Well... maybe not"),
+    ("we met mr. smith and dr. jones. then lunch", "We met mr. smith and dr. jones. Then lunch"),
+    ("made in the U.S. by hand. e.g. this one", "Made in the U.S. by hand. E.g. this one"),
+    ("see https://example.com/docs.then reply", "See https://example.com/docs.then reply"),
+    ("mail bob@mail.example.org or visit www.example.io", "Mail bob@mail.example.org or visit www.example.io"),
+    ("it costs 3.5 dollars at 10:30, about 1,200 total", "It costs 3.5 dollars at 10:30, about 1,200 total"),
+    ("one\n\n\n  two   words \n\tthree", "One\n\nTwo words\n\nThree"),
+    ("", ""),
+])
+def test_format_combined_transcript(text, expected):
+    assert format_combined_transcript(text) == expected
+
+def test_long_glued_token_stays_linear():
+    # Every comma is glued to the next word and there is no whitespace to end the token
+    text = ",".join(["word"] * 20000)
+    assert format_combined_transcript(text) == "Word" + ", word" * 19999
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("tenacity")
+
+from app.services.openai_service import OpenAIService, AsyncOpenAIService
+from app.services.segment_store import SegmentStore
+
+class FakeCache:
+    def __init__(self, enabled, entry=None):
+        self.enabled = enabled
+        self.entry = entry
+        self.hashed = []
+
+    def compute_key(self, file_path, model):
+        self.hashed.append(file_path)
+        return "key"
+
+    def get(self, key):
+        return self.entry
+
+    def put(self, key, result, transcribe_seconds=0.0):
+        pass
+
+class FakeProgress:
+    def __init__(self):
+        self.bounds = None
+        self.completed = []
+
+    def start(self, bounds):
+        self.bounds = bounds
+        return {}
+
+    def segment_completed(self, index, start_seconds, end_seconds, text, segments=None):
+        self.completed.append((index, start_seconds, end_seconds, text))
+
+def _service(cls, cache):
+    # Skip __init__: no client is needed when the transcription comes from the cache
+    service = cls.__new__(cls)
+    service.logger = logging.getLogger(__name__)
+    service.transcription_cache = cache
+    service.transcription_model = "whisper-1"
+    return service
+
+def _cached_entry():
+    return {"text": "Hello there.", "segments": SegmentStore.from_segments([{"start": 0.0, "end": 1.5, "text": "Hello there."}])}
+
+@pytest.mark.parametrize("cls", [OpenAIService, AsyncOpenAIService])
+def test_cache_hit_records_progress_as_complete(cls):
+    service = _service(cls, FakeCache(enabled=True, entry=_cached_entry()))
+    progress = FakeProgress()
+
+    result = service.transcribe_audio("meeting.mp3", progress)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+
+    assert result["text"] == "Hello there."
+    assert progress.bounds == [(0.0, None)]
+    assert progress.completed == [(0, 0.0, None, "Hello there.")]
+
+@pytest.mark.parametrize("cls", [OpenAIService, AsyncOpenAIService])
+def test_disabled_cache_skips_hashing(cls):
+    cache = FakeCache(enabled=False)
+    service = _service(cls, cache)
+
+    # An unsupported format fails straight after the cache lookup
+    with pytest.raises(ValueError):
+        result = service.transcribe_audio("notes.txt")
+        if asyncio.iscoroutine(result):
+            asyncio.run(result)
+
+    assert cache.hashed == []
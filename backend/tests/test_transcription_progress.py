@@ -0,0 +1,77 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.user import User
+from app.models.summary import Summary
+from app.models.transcript_chunk import TranscriptChunk
+from app.services import transcription_progress as progress_module
+from app.services.transcription_progress import TranscriptionProgress, get_progress
+
+BOUNDS = [(0.0, 600.0), (600.0, 1200.0), (1200.0, 1800.0), (1800.0, None)]
+
+@pytest.fixture
+def summary(postgres_db, monkeypatch):
+    # The recorder opens its own sessions; point them at the scratch database
+    monkeypatch.setattr(progress_module, "WorkerSessionLocal", sessionmaker(bind=postgres_db.get_bind()))
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    postgres_db.add(user)
+    postgres_db.flush()
+    summary = Summary(user_id=user.id, source_type="file_upload", status="processing")
+    postgres_db.add(summary)
+    postgres_db.commit()
+    return summary
+
+def _shift(db, summary_id, delta):
+    """Move the attempt's start and the stored segments back in time"""
+    db.query(Summary).filter(Summary.id == summary_id).update(
+        {Summary.processing_started_at: Summary.processing_started_at - delta}, synchronize_session=False
+    )
+    db.query(TranscriptChunk).filter(TranscriptChunk.summary_id == summary_id).update(
+        {TranscriptChunk.created_at: TranscriptChunk.created_at - delta}, synchronize_session=False
+    )
+    db.commit()
+
+def test_eta_counts_only_the_current_attempt(postgres_db, summary):
+    db = postgres_db
+    progress = TranscriptionProgress(summary.id)
+
+    # First attempt finished two segments an hour ago, then failed
+    progress.start(BOUNDS)
+    progress.segment_completed(0, 0.0, 600.0, "first part.")
+    progress.segment_completed(1, 600.0, 1200.0, "second part.")
+    _shift(db, summary.id, timedelta(hours=1))
+
+    # The retry resumes from those checkpoints and finishes one more segment in ten seconds
+    assert set(progress.start(BOUNDS)) == {0, 1}
+    progress.segment_completed(2, 1200.0, 1800.0, "third part.")
+    _shift(db, summary.id, timedelta(seconds=10))
+
+    db.expire_all()
+    result = get_progress(db, db.get(Summary, summary.id))
+    assert result["segments_completed"] == 3
+    assert result["percent_complete"] == 75.0
+    # One segment left at ten seconds per segment, not an hour's worth
+    assert 5 < result["eta_seconds"] < 30
+    assert "First part" in result["partial_transcript"]
+    assert "Third part" in result["partial_transcript"]
+
+def test_no_partial_transcript_once_completed(postgres_db, summary):
+    db = postgres_db
+    progress = TranscriptionProgress(summary.id)
+    progress.start(BOUNDS[:1])
+    progress.segment_completed(0, 0.0, None, "all of it.")
+    db.query(Summary).filter(Summary.id == summary.id).update({"status": "completed"})
+    db.commit()
+
+    db.expire_all()
+    result = get_progress(db, db.get(Summary, summary.id))
+    assert result["percent_complete"] == 100.0
+    assert result["partial_transcript"] == ""
+    assert result["partial_summary"] is None
+    assert result["eta_seconds"] is None
@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.youtube_dedup import canonical_video_id
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RD",
+    "https://youtu.be/dQw4w9WgXcQ?si=abc",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ?start=10",
+    "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/live/dQw4w9WgXcQ",
+    "  HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ  ",
+])
+def test_url_forms_share_one_video_id(url):
+    assert canonical_video_id(url) == "dQw4w9WgXcQ"
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/watch?v=dQw4w9WgXcQ",
+    "https://vimeo.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=tooShort",
+    "https://www.youtube.com/playlist?list=PL123",
+    "https://www.youtube.com/channel/UC1234567890",
+    "https://youtu.be/",
+    "not a url",
+])
+def test_non_video_urls_have_no_id(url):
+    assert canonical_video_id(url) is None
@@ -0,0 +1,42 @@
+"""
+Standalone job worker.
+
+Claims processing jobs (uploads and YouTube videos) from the database queue
+and runs them, so media processing scales across nodes independently of the
+API replicas. The API doesn't run jobs itself unless
+JOB_QUEUE_EMBEDDED_WORKER=true, so at least one worker must be running.
+
+Usage (from the backend directory):
+    python worker.py [--concurrency 4]
+"""
+import asyncio
+import signal
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables before the services read them
+load_dotenv()
+
+from app.services.job_worker import JobWorker
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run_worker(concurrency: int = None):
+    worker = JobWorker(concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, lambda: asyncio.ensure_future(worker.stop()))
+        except NotImplementedError:
+            # Signal handlers aren't supported by the Windows event loop
+            pass
+    await worker.run()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a ScribeIt job worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs to run at once (default: JOB_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency))